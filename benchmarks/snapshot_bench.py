@@ -0,0 +1,181 @@
+# BlenderVibeBridge: Dual-License & Maintenance Agreement (v1.2)
+# Copyright (C) 2026 B-A-M-N (The "Author")
+#
+# This software is distributed under a Dual-Licensing Model:
+# 1. THE OPEN-SOURCE PATH: GNU AGPLv3 (see LICENSE for details)
+# 2. THE COMMERCIAL PATH: "WORK-OR-PAY" MODEL
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+
+"""
+Snapshot representation benchmark (runs outside Blender).
+
+Compares the legacy dict-per-object listing with the columnar ObjectColumns /
+ObjectListing used by the addon, on a fake `bpy` stand-in:
+
+  * listing memory:   what the object listing keeps alive between ticks
+  * tick allocations: peak transient memory of one tick where one object moved
+                      (legacy: full re-scan and re-listing; columnar: incremental)
+
+Timings are taken under tracemalloc, so compare them with each other only.
+
+Usage: python benchmarks/snapshot_bench.py [--sizes 10000,100000,1000000]
+"""
+
+import gc
+import sys
+import time
+import types
+import random
+import hashlib
+import argparse
+import tracemalloc
+import os
+
+# --- FAKE BPY STAND-IN (only what the snapshot path touches) ---
+
+class FakeVector(tuple):
+    def __str__(self):
+        return "<Vector (%.4f, %.4f, %.4f)>" % self
+
+class FakeCollection:
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+class FakeObject:
+    __slots__ = ("name", "type", "location", "users_collection", "props", "_pointer")
+
+    def __init__(self, i, collections):
+        self.name = f"Object.{i:07d}"
+        self.type = random.choice(("MESH", "MESH", "MESH", "EMPTY", "LIGHT", "CAMERA", "ARMATURE"))
+        self.location = FakeVector((random.random(), random.random(), random.random()))
+        self.users_collection = [random.choice(collections)]
+        self.props = {"uuid": f"{i:08x}-vibe"}
+        self._pointer = 0x10000 + i * 64
+
+    def get(self, key, default=None):
+        return self.props.get(key, default)
+
+    def as_pointer(self):
+        return self._pointer
+
+class FakeObjects(list):
+    """bpy.data.objects: iterable, sized, and looked up by name."""
+
+    def __init__(self, objects):
+        super().__init__(objects)
+        self._by_name = {obj.name: obj for obj in objects}
+
+    def get(self, name, default=None):
+        return self._by_name.get(name, default)
+
+def install_fake_bpy():
+    bpy = types.ModuleType("bpy")
+    handlers = types.ModuleType("bpy.app.handlers")
+    handlers.persistent = lambda f: f
+    for name in ("depsgraph_update_post", "load_post", "undo_post", "redo_post"):
+        setattr(handlers, name, [])
+    bpy.app = types.SimpleNamespace(handlers=handlers, timers=None)
+    bpy.types = types.SimpleNamespace(Object=FakeObject, Collection=FakeCollection, Scene=object)
+    bpy.data = types.SimpleNamespace(objects=FakeObjects([]))
+    sys.modules["bpy"] = bpy
+    sys.modules["bpy.app"] = bpy.app
+    sys.modules["bpy.app.handlers"] = handlers
+    return bpy
+
+def make_scene(bpy, count):
+    random.seed(count)
+    collections = [FakeCollection(f"Collection.{i:02d}") for i in range(16)]
+    bpy.data.objects = FakeObjects(FakeObject(i, collections) for i in range(count))
+
+# --- MEASUREMENT ---
+
+def measure(fn):
+    """Returns (result, retained bytes, peak bytes, seconds) for one call of fn."""
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current - base, peak - base, elapsed
+
+def legacy_tick(objects):
+    """The pre-columnar update_snapshot: full sort, one dict per object, full hash."""
+    sorted_objs = sorted(objects, key=lambda o: o.name)
+    state_hash = hashlib.sha256()
+    listing = []
+    for obj in sorted_objs:
+        uuid = obj.get("uuid", "NO_UUID")
+        state_hash.update(f"{obj.name}:{uuid}:{obj.location}".encode())
+        listing.append({"name": obj.name, "type": obj.type, "uuid": uuid})
+    return state_hash.hexdigest(), listing
+
+def run(size):
+    from vibe_bridge.ipc.snapshot import SceneIndex, DIRTY, mark_object_dirty
+    from vibe_bridge.ipc.listing import ObjectListing
+
+    bpy = sys.modules["bpy"]
+    make_scene(bpy, size)
+    objects = bpy.data.objects
+
+    # Legacy: the listing is a fresh list of dicts, rebuilt on every tick
+    (_, legacy_listing), legacy_retained, legacy_peak, legacy_secs = measure(lambda: legacy_tick(objects))
+    del legacy_listing
+
+    # Columnar: first build, then the listing that stays alive between ticks
+    index = SceneIndex()
+    DIRTY["full"] = True
+    _, _, _, build_secs = measure(lambda: index.refresh(bpy))
+
+    def build_listing():
+        index._listing_dirty = True
+        index._rehash()
+        return ObjectListing(index.columns, 1)
+    listing, columnar_retained, _, listing_secs = measure(build_listing)
+
+    # Columnar tick: one object moves; listing and indexes are reused as-is
+    moved = objects[size // 2]
+    moved.location = FakeVector((9.0, 9.0, 9.0))
+    mark_object_dirty(moved.as_pointer(), moved.name)
+    _, _, columnar_peak, tick_secs = measure(lambda: index.refresh(bpy))
+    assert index.columns is listing.columns
+
+    return {
+        "objects": size,
+        "legacy_listing_mb": legacy_retained / 1e6,
+        "columnar_listing_mb": columnar_retained / 1e6,
+        "legacy_tick_alloc_mb": legacy_peak / 1e6,
+        "columnar_tick_alloc_kb": columnar_peak / 1e3,
+        "legacy_tick_ms": legacy_secs * 1e3,
+        "columnar_tick_ms": tick_secs * 1e3,
+        "columnar_build_ms": build_secs * 1e3,
+        "columnar_listing_ms": listing_secs * 1e3
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    args = parser.parse_args()
+
+    install_fake_bpy()
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "blender_addon")))
+    import vibe_bridge.logging.logger as logger
+    logger.LOG_PATH = os.devnull
+
+    columns = ("objects", "legacy_listing_mb", "columnar_listing_mb", "legacy_tick_alloc_mb",
+               "columnar_tick_alloc_kb", "legacy_tick_ms", "columnar_tick_ms", "columnar_build_ms", "columnar_listing_ms")
+    print(" | ".join(columns))
+    for size in (int(s) for s in args.sizes.split(",")):
+        row = run(size)
+        print(" | ".join(f"{row[c]:.2f}" if isinstance(row[c], float) else str(row[c]) for c in columns), flush=True)
+
+if __name__ == "__main__":
+    main()
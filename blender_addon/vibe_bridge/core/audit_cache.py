@@ -0,0 +1,75 @@
+import threading
+from collections import OrderedDict
+
+# Bound on cached audit results. Most are per-object, and clean objects share
+# one empty result, so entries are small.
+MAX_ENTRIES = 100000
+
+class AuditCache:
+    """LRU cache of audit results, keyed by (audit, target, version).
+
+    `version` is an object revision (SceneIndex bumps it whenever the depsgraph
+    reports the object) or, for whole-scene results, the scene revision. A
+    changed object therefore never hits its old entries; those age out here.
+    Filled on the MAIN THREAD; HTTP threads may peek for whole-scene hits.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._scene_version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def peek(self, key):
+        """Lookup without LRU or hit/miss bookkeeping (HTTP fast path)."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def set_scene_version(self, version):
+        """Drops whole-scene results of other scene revisions (targets are None)."""
+        with self._lock:
+            if version == self._scene_version:
+                return
+            self._scene_version = version
+            stale = [key for key in self._entries if key[1] is None and key[2] != version]
+            for key in stale:
+                del self._entries[key]
+            self.evictions += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+AUDIT_CACHE = AuditCache()
@@ -0,0 +1,360 @@
+import os
+import time
+import queue
+import itertools
+import threading
+from collections import OrderedDict
+import numpy as np
+from ..logging.logger import vibe_log
+from ..ipc.snapshot import SCENE_INDEX
+from .audit_cache import AUDIT_CACHE
+from .scheduler import signal_work
+from .workers import DaemonWorkers
+
+# Two-phase audits. Phase one (MAIN THREAD) copies what an audit needs out of
+# bpy with bulk foreach_get into NumPy buffers; phase two analyzes the buffers
+# on AUDIT_POOL, so Blender only stalls for the copy.
+
+# Main-thread budget per tick for phase one of queued audits (one job always runs)
+AUDIT_BUDGET_MS = 20.0
+# How long an HTTP reader waits for its audit before answering PENDING with a
+# job id to collect from /blender/audit
+AUDIT_WAIT = 2.0
+# Longest a /blender/audit?wait= poll may park for the job to finish
+AUDIT_MAX_WAIT = 30.0
+# Finished jobs kept for collection
+AUDIT_HISTORY = 64
+# Phase two is split into at most AUDIT_WORKERS chunks of roughly equal size;
+# NumPy releases the GIL on large arrays, so chunks really run in parallel
+AUDIT_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+EPSILON = 1e-6
+# Shared result of every clean object
+CLEAN = ()
+
+AUDIT_STATS = {
+    "queued": 0,
+    "run": 0,
+    "objects_extracted": 0,
+    "objects_cached": 0,
+    "extract_ms": 0.0,
+    "analyze_ms": 0.0
+}
+# Phase two and _finish run on AUDIT_POOL workers, so every update goes through _count
+_STATS_LOCK = threading.Lock()
+
+def _count(**deltas):
+    with _STATS_LOCK:
+        for name, delta in deltas.items():
+            AUDIT_STATS[name] += delta
+
+def audit_stats():
+    """Consistent copy of AUDIT_STATS. Any thread."""
+    with _STATS_LOCK:
+        return dict(AUDIT_STATS)
+
+AUDIT_POOL = DaemonWorkers(AUDIT_WORKERS, "vibe-audit")
+
+# --- PHASE ONE HELPERS (MAIN THREAD) ---
+
+def _floats(collection, attr, width):
+    values = np.empty(len(collection) * width, dtype=np.float32)
+    collection.foreach_get(attr, values)
+    return values
+
+def _ints(collection, attr, width):
+    values = np.empty(len(collection) * width, dtype=np.int32)
+    collection.foreach_get(attr, values)
+    return values
+
+def _matrix(matrix):
+    return np.array(matrix, dtype=np.float32).ravel()
+
+def _is_rigged(obj):
+    return any(mod.type == 'ARMATURE' for mod in obj.modifiers) or (obj.parent is not None and obj.parent.type == 'ARMATURE')
+
+def _payload_size(payload):
+    """Buffered values in a payload, for balancing phase-two chunks."""
+    size = 1
+    for item in payload:
+        if isinstance(item, np.ndarray):
+            size += item.size
+        elif isinstance(item, list):
+            size += sum(_payload_size(entry) for entry in item if isinstance(entry, tuple))
+    return size
+
+# --- AUDITS ---
+# extract(obj) runs on the main thread and returns a payload tuple, or None if
+# the object cannot have issues. analyze(payload) runs on a worker, must not
+# touch bpy, and returns a tuple of issue strings (empty: clean).
+
+def extract_nan(obj):
+    co = _floats(obj.data.vertices, "co", 3) if obj.type == 'MESH' and obj.data is not None else None
+    return (_matrix(obj.matrix_world), co)
+
+def analyze_nan(payload):
+    matrix, co = payload
+    issues = []
+    if not np.isfinite(matrix).all():
+        issues.append("Non-finite transform")
+    if co is not None and not np.isfinite(co).all():
+        issues.append("Non-finite vertex coordinates")
+    return tuple(issues)
+
+def extract_export(obj):
+    mesh = obj.data if obj.type == 'MESH' else None
+    if mesh is None:
+        return (tuple(obj.scale), tuple(obj.rotation_euler), 0, None, None)
+    return (tuple(obj.scale), tuple(obj.rotation_euler), len(mesh.vertices),
+            _ints(mesh.polygons, "loop_total", 1), _ints(mesh.edges, "vertices", 2))
+
+def analyze_export(payload):
+    scale, rotation, vertex_count, loop_totals, edge_vertices = payload
+    issues = []
+    if any(abs(v - 1.0) > EPSILON for v in scale):
+        issues.append("Unapplied scale")
+    if any(abs(v) > EPSILON for v in rotation):
+        issues.append("Non-zero rotation")
+    if loop_totals is not None:
+        ngons = int(np.count_nonzero(loop_totals > 4))
+        if ngons:
+            issues.append(f"N-gons: {ngons}")
+        used = np.zeros(vertex_count, dtype=bool)
+        used[edge_vertices] = True
+        loose = vertex_count - int(np.count_nonzero(used))
+        if loose:
+            issues.append(f"Loose vertices: {loose}")
+    return tuple(issues)
+
+def extract_rig(obj):
+    if obj.type != 'ARMATURE' or obj.data is None:
+        return None
+    bones = obj.data.bones
+    invalid = []
+    if obj.pose is not None:
+        for pose_bone in obj.pose.bones:
+            invalid.extend(f"Bone '{pose_bone.name}': invalid constraint '{con.name}'"
+                           for con in pose_bone.constraints if not con.is_valid)
+    return ([bone.name for bone in bones], _floats(bones, "matrix_local", 16), _floats(bones, "length", 1), invalid)
+
+def analyze_rig(payload):
+    names, matrices, lengths, invalid = payload
+    finite = np.isfinite(matrices.reshape(-1, 16)).all(axis=1)
+    issues = [f"Bone '{names[i]}': non-finite head, tail or roll" for i in np.flatnonzero(~finite)]
+    issues.extend(f"Bone '{names[i]}': zero length" for i in np.flatnonzero(finite & (lengths < EPSILON)))
+    issues.extend(invalid)
+    return tuple(issues)
+
+def extract_shape_keys(obj):
+    mesh = obj.data if obj.type == 'MESH' else None
+    if mesh is None or mesh.shape_keys is None:
+        return None
+    count = len(mesh.vertices)
+    blocks = [(block.name, len(block.data), block.relative_key is None,
+               _floats(block.data, "co", 3) if len(block.data) == count else None)
+              for block in mesh.shape_keys.key_blocks]
+    return (count, blocks)
+
+def analyze_shape_keys(payload):
+    count, blocks = payload
+    issues = []
+    for name, points, missing_basis, co in blocks:
+        if co is None:
+            issues.append(f"Shape key '{name}': {points} points for {count} vertices")
+        elif not np.isfinite(co).all():
+            issues.append(f"Shape key '{name}': non-finite coordinates")
+        if missing_basis:
+            issues.append(f"Shape key '{name}': missing basis")
+    return tuple(issues)
+
+def extract_weights(obj):
+    if obj.type != 'MESH' or obj.data is None or not _is_rigged(obj):
+        return None
+    vertices = obj.data.vertices
+    if not obj.vertex_groups:
+        return (None,)
+    # Group membership has no foreach_get path: one len() per vertex, nothing more
+    return (np.fromiter(map(len, (v.groups for v in vertices)), dtype=np.int32, count=len(vertices)),)
+
+def analyze_weights(payload):
+    group_counts, = payload
+    if group_counts is None:
+        return ("Rigged mesh has no vertex groups",)
+    unweighted = int(np.count_nonzero(group_counts == 0))
+    return (f"Unweighted vertices: {unweighted}",) if unweighted else CLEAN
+
+# /query action -> (phase one, phase two)
+AUDITS = {
+    "scan_nan": (extract_nan, analyze_nan),
+    "validate_export": (extract_export, analyze_export),
+    "audit_rig": (extract_rig, analyze_rig),
+    "audit_shape_keys": (extract_shape_keys, analyze_shape_keys),
+    "audit_weights": (extract_weights, analyze_weights)
+}
+
+# --- JOBS ---
+
+class AuditJob:
+    __slots__ = ("id", "audit", "target", "result", "done", "findings", "checked", "extracted",
+                 "scene_key", "pending", "failed", "lock")
+
+    def __init__(self, job_id, audit, target):
+        self.id = job_id
+        self.audit = audit
+        self.target = target
+        self.result = None
+        self.done = threading.Event()
+        self.findings = {}
+        self.checked = self.extracted = 0
+        self.scene_key = None
+        self.pending = 0
+        self.failed = False
+        self.lock = threading.Lock()
+
+AUDIT_JOBS = queue.SimpleQueue()
+_JOB_IDS = itertools.count(1)
+_RECENT_JOBS = OrderedDict()
+_RECENT_LOCK = threading.Lock()
+
+def cached_audit(audit):
+    """Whole-scene result still valid for the current scene revision, or None. Any thread."""
+    return AUDIT_CACHE.peek((audit, None, SCENE_INDEX.revision))
+
+def request_audit(audit, target=None):
+    """Queues an audit for the main thread. Any thread. Returns the AuditJob."""
+    job = AuditJob(next(_JOB_IDS), audit, target)
+    with _RECENT_LOCK:
+        _RECENT_JOBS[job.id] = job
+        while len(_RECENT_JOBS) > AUDIT_HISTORY:
+            _RECENT_JOBS.popitem(last=False)
+    AUDIT_JOBS.put(job)
+    _count(queued=1)
+    signal_work()
+    return job
+
+def get_audit_job(job_id):
+    with _RECENT_LOCK:
+        return _RECENT_JOBS.get(job_id)
+
+def start_audit(bpy, job):
+    """Phase one on the MAIN THREAD: cache lookups and buffer extraction.
+    Unchanged objects (same revision) reuse their cached issues."""
+    extract, analyze = AUDITS[job.audit]
+    AUDIT_CACHE.set_scene_version(SCENE_INDEX.revision)
+    if job.target is None:
+        job.scene_key = (job.audit, None, SCENE_INDEX.revision)
+        result = AUDIT_CACHE.get(job.scene_key)
+        if result is not None:
+            _complete(job, result)
+            return
+        objects = bpy.data.objects
+    else:
+        obj = bpy.data.objects.get(job.target)
+        if obj is None:
+            _complete(job, {"status": "ERROR", "message": f"Object '{job.target}' not found"})
+            return
+        objects = (obj,)
+
+    start = time.perf_counter()
+    records = SCENE_INDEX.records
+    work = []
+    for obj in objects:
+        job.checked += 1
+        rec = records.get(obj.as_pointer())
+        key = (job.audit, rec.pointer, rec.revision) if rec is not None else None
+        issues = AUDIT_CACHE.get(key) if key is not None else None
+        if issues is None:
+            job.extracted += 1
+            payload = extract(obj)
+            if payload is not None:
+                work.append((key, obj.name, payload))
+                continue
+            issues = CLEAN
+            if key is not None:
+                AUDIT_CACHE.put(key, issues)
+        if issues:
+            job.findings[obj.name] = list(issues)
+    _count(extract_ms=(time.perf_counter() - start) * 1000.0,
+           objects_extracted=job.extracted,
+           objects_cached=job.checked - job.extracted)
+
+    if not work:
+        _finish(job)
+        return
+    # Greedy size balancing: biggest payloads first, each to the lightest chunk
+    chunks = [[] for _ in range(min(AUDIT_WORKERS, len(work)))]
+    loads = [0] * len(chunks)
+    for size, item in sorted(((_payload_size(item[2]), item) for item in work), key=lambda pair: pair[0], reverse=True):
+        lightest = loads.index(min(loads))
+        chunks[lightest].append(item)
+        loads[lightest] += size
+    job.pending = len(chunks)
+    for chunk in chunks:
+        AUDIT_POOL.submit(_analyze_chunk, job, analyze, chunk)
+
+def _analyze_chunk(job, analyze, chunk):
+    """Phase two on an AUDIT_POOL worker."""
+    start = time.perf_counter()
+    findings = {}
+    failed = False
+    for key, name, payload in chunk:
+        try:
+            issues = analyze(payload) or CLEAN
+        except Exception as e:
+            vibe_log(f'AUDIT ERROR: {job.audit} on {name}: {e}')
+            findings[name] = [f"Audit failed: {e}"] # Not cached: retried next run
+            failed = True
+            continue
+        if key is not None:
+            AUDIT_CACHE.put(key, issues)
+        if issues:
+            findings[name] = list(issues)
+    _count(analyze_ms=(time.perf_counter() - start) * 1000.0)
+    with job.lock:
+        job.findings.update(findings)
+        job.failed |= failed
+        job.pending -= 1
+        last = job.pending == 0
+    if last:
+        _finish(job)
+
+def _finish(job):
+    result = {
+        "status": "SUCCESS",
+        "audit": job.audit,
+        "passed": not job.findings,
+        "checked": job.checked,
+        "rescanned": job.extracted,
+        "findings": job.findings,
+        "scene_revision": job.scene_key[2] if job.scene_key else SCENE_INDEX.revision
+    }
+    # A failed chunk must be retried, so its scene-wide result is not cached
+    if job.scene_key is not None and not job.failed:
+        AUDIT_CACHE.put(job.scene_key, result)
+    _count(run=1)
+    _complete(job, result)
+
+def _complete(job, result):
+    job.result = result
+    job.done.set()
+
+def run_audit_jobs(bpy):
+    """Runs phase one of queued audits within AUDIT_BUDGET_MS. MAIN THREAD.
+    Returns True if some are left for the next tick."""
+    start = time.perf_counter()
+    ran = False
+    while not ran or (time.perf_counter() - start) * 1000.0 < AUDIT_BUDGET_MS:
+        try:
+            job = AUDIT_JOBS.get_nowait()
+        except queue.Empty:
+            return False
+        try:
+            start_audit(bpy, job)
+        except Exception as e:
+            vibe_log(f'AUDIT ERROR: {job.audit}: {e}')
+            _complete(job, {"status": "ERROR", "message": str(e)})
+        ran = True
+    return not AUDIT_JOBS.empty()
+
+def shutdown_audits():
+    AUDIT_POOL.shutdown()
@@ -0,0 +1,86 @@
+import types
+import hashlib
+from collections import OrderedDict
+
+# Bounds for the compiled-script cache (whichever is hit first triggers eviction)
+MAX_ENTRIES = 256
+MAX_SOURCE_BYTES = 4 * 1024 * 1024
+
+# Names that let a script add, remove, rename or relink objects: data-block
+# constructors/removers, the name attribute, collection (un)linking, operators
+# (which can do anything) and reflection that could reach any of these
+STRUCTURE_NAMES = frozenset({
+    "name", "new", "remove", "copy", "link", "unlink", "ops",
+    "getattr", "setattr", "exec", "eval", "globals", "vars", "__import__", "import_module"
+})
+
+def may_restructure(code):
+    """Conservative check of a compiled script and its nested functions/classes:
+    False only if none of STRUCTURE_NAMES is referenced, so a matching script
+    may still be harmless (e.g. it only reads obj.name)."""
+    pending = [code]
+    while pending:
+        code = pending.pop()
+        for name in code.co_names:
+            if name in STRUCTURE_NAMES or ("." in name and not STRUCTURE_NAMES.isdisjoint(name.split("."))):
+                return True
+        pending.extend(const for const in code.co_consts if isinstance(const, types.CodeType))
+    return False
+
+def content_hash(source):
+    """Same SHA-256 scheme as SecurityGate._get_content_hash on the MCP side, so the
+    key of a cached script matches its trusted-signature hash."""
+    return hashlib.sha256(source.strip().encode('utf-8')).hexdigest()
+
+class CodeCache:
+    """LRU cache of compiled code objects for exec_script payloads.
+    Saves re-parsing and re-compiling repeated scripts on Blender's main thread."""
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_source_bytes=MAX_SOURCE_BYTES):
+        self.max_entries = max_entries
+        self.max_source_bytes = max_source_bytes
+        self._entries = OrderedDict()
+        self._source_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compile(self, source):
+        """Returns the compiled code object for `source`, compiling on a miss.
+        Compile errors propagate and are never cached."""
+        key = content_hash(source)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        code = compile(source, f"<vibe_script:{key[:12]}>", "exec")
+        size = len(source)
+        if size > self.max_source_bytes:
+            return code # Too big to keep; still usable for this call
+        self._entries[key] = (code, size)
+        self._source_bytes += size
+        while len(self._entries) > self.max_entries or self._source_bytes > self.max_source_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._source_bytes -= evicted_size
+            self.evictions += 1
+        return code
+
+    def clear(self):
+        self._entries.clear()
+        self._source_bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "source_bytes": self._source_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+CODE_CACHE = CodeCache()
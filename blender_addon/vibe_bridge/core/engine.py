@@ -3,27 +3,66 @@ import os
 import json
 import time
 from ..logging.logger import vibe_log
-from ..ipc.airlock import poll_airlock
-from ..ipc.server import run_server_thread, update_snapshot
+from ..ipc.airlock import poll_airlock, inbox_has_work, DRAIN_STATS
+from ..ipc.server import run_server_thread, stop_server, update_snapshot, publish_snapshot, SCENE_SNAPSHOT
+from ..ipc.socket_server import start_socket_server, stop_socket_server, drain_socket_queue, SOCKET_STATS
+from .scheduler import AdaptiveCadence, CADENCE_STATS
+from .code_cache import CODE_CACHE
+from .audits import run_audit_jobs, shutdown_audits, audit_stats
+from .audit_cache import AUDIT_CACHE
+from ..handlers.depsgraph import register_handlers, unregister_handlers
+
+CADENCE = AdaptiveCadence()
 
 def poll_wrapper():
     """Timer callback that wraps airlock polling and snapshot updates."""
+    # 0. Adaptive cadence: idle ticks only probe for work
+    now = time.monotonic()
+    if not CADENCE.should_run(now) and not inbox_has_work():
+        return CADENCE.light_tick(now)
+    
     # 1. Update shared memory snapshot for HTTP server (Read-Only Path)
     update_snapshot(bpy)
     
-    # 2. Process Mutations (Airlock Path)
+    # 1b. Queued read-only audits, against the state just snapshotted
+    audit_backlog = run_audit_jobs(bpy)
+    
+    # 2. Process Mutations (Socket Path, then Airlock Path; budgeted batch drains)
+    socket_backlog = drain_socket_queue()
     next_call = poll_airlock()
-    return next_call
+    
+    # 3. Pick the next cadence and export the decision
+    pending = bool(socket_backlog) or audit_backlog or next_call == 0.0
+    did_work = bool(DRAIN_STATS["drained"] or SOCKET_STATS["last_drained"])
+    delay = CADENCE.schedule(time.monotonic(), pending, did_work)
+    SCENE_SNAPSHOT["airlock"] = dict(DRAIN_STATS, socket=dict(SOCKET_STATS))
+    SCENE_SNAPSHOT["scheduler"] = dict(CADENCE_STATS)
+    SCENE_SNAPSHOT["code_cache"] = CODE_CACHE.stats()
+    SCENE_SNAPSHOT["audits"] = dict(audit_stats(), cache=AUDIT_CACHE.stats())
+    
+    # 4. Atomically publish this tick's immutable snapshot + encoded routes
+    publish_snapshot()
+    return delay
 
 def register_core():
     # Start thread-safe HTTP Query Server
     run_server_thread()
     
+    # Start Unix-socket mutation transport (file airlock remains the fallback)
+    start_socket_server()
+    
+    # Depsgraph/undo/load handlers drive the incremental snapshot
+    register_handlers()
+    
     if not bpy.app.timers.is_registered(poll_wrapper):
         bpy.app.timers.register(poll_wrapper, first_interval=1.0)
-    vibe_log('KERNEL v1.5.0 CORE ACTIVE (Airlock + HTTP)')
+    vibe_log('KERNEL v1.5.0 CORE ACTIVE (Airlock + Socket + HTTP)')
 
 def unregister_core():
     if bpy.app.timers.is_registered(poll_wrapper):
         bpy.app.timers.unregister(poll_wrapper)
+    unregister_handlers()
+    stop_socket_server()
+    stop_server()
+    shutdown_audits()
     vibe_log('KERNEL v1.5.0 CORE SHUTDOWN')
@@ -0,0 +1,80 @@
+import threading
+
+# Full-work cadence bounds. Right after work the loop runs every ACTIVE_INTERVAL,
+# then backs off geometrically to IDLE_MAX_INTERVAL. With work pending it
+# reschedules at 0 s.
+ACTIVE_INTERVAL = 0.05
+IDLE_MAX_INTERVAL = 1.0
+BACKOFF = 2.0
+
+# Ticks between full-work ticks only probe for work (WAKE_EVENT, one stat of
+# the inbox directory). They run this many times per full-work interval, so they
+# back off with it: every 12.5 ms right after work, 4 per second when idle.
+WAKE_PROBES_PER_INTERVAL = 4
+
+# Set from ANY thread (transports, handlers) to request a full tick ASAP
+WAKE_EVENT = threading.Event()
+
+CADENCE_STATS = {
+    "state": "WARM",
+    "interval": ACTIVE_INTERVAL,
+    "timer_delay": ACTIVE_INTERVAL,
+    "full_ticks": 0,
+    "light_ticks": 0,
+    "wakes": 0,
+    "busy_ticks": 0
+}
+
+def signal_work():
+    """Thread-safe: tells the main-thread loop that new work is waiting."""
+    WAKE_EVENT.set()
+
+class AdaptiveCadence:
+    """Decides when poll_wrapper does full work and how long the timer sleeps."""
+
+    def __init__(self, active_interval=ACTIVE_INTERVAL, idle_max_interval=IDLE_MAX_INTERVAL,
+                 backoff=BACKOFF, wake_probes=WAKE_PROBES_PER_INTERVAL):
+        self.active_interval = active_interval
+        self.idle_max_interval = idle_max_interval
+        self.backoff = backoff
+        self.wake_probes = wake_probes
+        self.interval = active_interval
+        self.next_due = 0.0
+
+    def should_run(self, now):
+        """True if this tick must do full work: it is due, or work was signalled."""
+        if WAKE_EVENT.is_set():
+            WAKE_EVENT.clear()
+            CADENCE_STATS["wakes"] += 1
+            return True
+        return now >= self.next_due
+
+    def light_tick(self, now):
+        """Bookkeeping for a tick that skipped full work. Returns the timer delay."""
+        CADENCE_STATS["light_ticks"] += 1
+        delay = max(0.0, min(self.next_due - now, self.interval / self.wake_probes))
+        CADENCE_STATS["timer_delay"] = delay
+        return delay
+
+    def schedule(self, now, pending, did_work):
+        """Picks the next cadence after a full-work tick. Returns the timer delay."""
+        CADENCE_STATS["full_ticks"] += 1
+        if pending:
+            self.interval = self.active_interval
+            interval = 0.0
+            state = "BUSY"
+            CADENCE_STATS["busy_ticks"] += 1
+        elif did_work:
+            self.interval = interval = self.active_interval
+            state = "WARM"
+        else:
+            self.interval = interval = min(self.interval * self.backoff, self.idle_max_interval)
+            state = "IDLE" if interval >= self.idle_max_interval else "COOLING"
+        self.next_due = now + interval
+        delay = interval / self.wake_probes
+        CADENCE_STATS.update({
+            "state": state,
+            "interval": round(interval, 4),
+            "timer_delay": round(delay, 4)
+        })
+        return delay
@@ -0,0 +1,54 @@
+import queue
+import threading
+
+class DaemonWorkers:
+    """
+    Lazily grown pool of at most `max_workers` daemon threads. Each submitted job
+    claims an idle worker or starts a new one; past max_workers, jobs queue and
+    are picked up by the next worker to finish. Daemon threads never block
+    Blender's exit.
+    """
+
+    def __init__(self, max_workers, name):
+        self.max_workers = max_workers
+        self.name = name
+        self._jobs = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._idle = 0
+        self._backlog = 0
+        self._threads = 0
+
+    def submit(self, fn, *args):
+        with self._lock:
+            if self._idle:
+                self._idle -= 1
+            elif self._threads < self.max_workers:
+                self._threads += 1
+                threading.Thread(target=self._run, name=f"{self.name}-{self._threads}", daemon=True).start()
+            else:
+                self._backlog += 1
+        self._jobs.put((fn, args))
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                with self._lock:
+                    self._threads -= 1
+                return
+            fn, args = job
+            try:
+                fn(*args)
+            finally:
+                with self._lock:
+                    # A queued job is this worker's next one; otherwise it goes idle
+                    if self._backlog:
+                        self._backlog -= 1
+                    else:
+                        self._idle += 1
+
+    def shutdown(self):
+        with self._lock:
+            count = self._threads
+        for _ in range(count):
+            self._jobs.put(None)
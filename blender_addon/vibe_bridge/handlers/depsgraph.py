@@ -0,0 +1,44 @@
+import bpy
+from bpy.app.handlers import persistent
+from ..ipc.snapshot import mark_object_dirty, mark_structure_dirty, mark_full_rebuild
+from ..core.scheduler import signal_work
+
+@persistent
+def on_depsgraph_update(scene, depsgraph=None):
+    """Feeds the incremental snapshot. Records WHAT changed; the work happens on the next tick."""
+    if depsgraph is None:
+        mark_structure_dirty()
+        return
+    for update in depsgraph.updates:
+        id_data = getattr(update.id, "original", update.id)
+        if isinstance(id_data, bpy.types.Object):
+            mark_object_dirty(id_data.as_pointer(), id_data.name)
+        elif isinstance(id_data, (bpy.types.Collection, bpy.types.Scene)):
+            # Objects linked, unlinked, added or removed
+            mark_structure_dirty()
+    signal_work()
+
+@persistent
+def on_reload(*args):
+    """File load / undo / redo replace datablocks; cached pointers are invalid."""
+    mark_full_rebuild()
+    signal_work()
+
+_HANDLERS = (
+    ("depsgraph_update_post", on_depsgraph_update),
+    ("load_post", on_reload),
+    ("undo_post", on_reload),
+    ("redo_post", on_reload)
+)
+
+def register_handlers():
+    for name, fn in _HANDLERS:
+        handlers = getattr(bpy.app.handlers, name)
+        if fn not in handlers: # Guard against duplicate registration
+            handlers.append(fn)
+
+def unregister_handlers():
+    for name, fn in _HANDLERS:
+        handlers = getattr(bpy.app.handlers, name)
+        while fn in handlers:
+            handlers.remove(fn)
@@ -2,54 +2,312 @@ import bpy
 import os
 import json
 import time
+from collections import deque
 from ..logging.logger import vibe_log
+from ..core.code_cache import CODE_CACHE, may_restructure
+from .snapshot import mark_structure_dirty
 
 BASE_PATH = '/home/bamn/BlenderVibeBridge'
 INBOX_PATH = os.path.join(BASE_PATH, 'vibe_queue', 'inbox')
 OUTBOX_PATH = os.path.join(BASE_PATH, 'vibe_queue', 'outbox')
 
-def poll_airlock():
-    """Non-blocking polling of the filesystem airlock."""
+# Per-tick main-thread budget for draining the inbox. Keeps the UI responsive
+# while letting cheap commands batch up instead of paying one tick each.
+DRAIN_BUDGET_MS = 8.0
+IDLE_INTERVAL = 0.1
+
+# fsync outbox results before publishing them (rename alone prevents torn reads)
+AIRLOCK_FSYNC = False
+
+# Sequenced inbox: the MCP server names commands '<seq>.json' (zero-padded,
+# monotonic). The cursor predicts the next name, so steady-state dequeue is one
+# stat. The directory is only listed when the expected file is missing and the
+# inbox changed (rate-limited to DISCOVERY_INTERVAL), to resolve gaps, MCP
+# restarts and legacy names, plus a RESCAN_INTERVAL safety net.
+SEQ_WIDTH = 20
+GAP_TIMEOUT = 1.0
+DISCOVERY_INTERVAL = 0.5
+RESCAN_INTERVAL = 5.0
+
+INBOX_CURSOR = {
+    "next_seq": None,
+    "pending": deque(),
+    "dir_mtime": None,
+    "probe_mtime": None,
+    "gap_since": None,
+    "last_scan": 0.0,
+    "scans": 0
+}
+
+# Last drain report (read by the invariance server via the snapshot)
+DRAIN_STATS = {
+    "drained": 0,
+    "backlog": 0,
+    "budget_ms": DRAIN_BUDGET_MS,
+    "used_ms": 0.0,
+    "total_drained": 0,
+    "expired": 0
+}
+
+def atomic_write_json(path, data, fsync=None):
+    """Writes to a hidden temp file, then os.replace()s it into place.
+    Readers (and the MCP inotify watcher) only ever see complete files."""
+    fsync = AIRLOCK_FSYNC if fsync is None else fsync
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, f'.{name}.tmp')
     try:
-        if not os.path.exists(INBOX_PATH):
-            os.makedirs(INBOX_PATH, exist_ok=True)
-            
-        files = [f for f in os.listdir(INBOX_PATH) if f.endswith('.json')]
-        if not files:
-            return 0.1 # High-frequency polling when idle
-            
-        files.sort()
-        f = files[0]
-        path = os.path.join(INBOX_PATH, f)
-        
-        # LOG CONSULTATION GATE would happen here in a full implementation
-        # For now, we follow the basic airlock protocol
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def execute_batch(data, source="airlock"):
+    """Executes an ordered batch envelope in ONE tick under ONE undo step.
+
+    Returns per-command results in submission order. With `stop_on_error`
+    (default) the commands after a failure are reported as SKIPPED.
+    """
+    commands = data.get('commands') or []
+    stop_on_error = data.get('stop_on_error', True)
+    results = []
+    failed = 0
+    for index, cmd in enumerate(commands):
+        if failed and stop_on_error:
+            results.append({'index': index, 'status': 'SKIPPED'})
+            continue
+        if not isinstance(cmd, dict) or cmd.get('type') == 'batch':
+            result = {'status': 'ERROR', 'message': 'Batch entries must be single command objects.'}
+        else:
+            result = execute_command(cmd, source=f"{source}:batch")
+        result['index'] = index
+        if result['status'] != 'SUCCESS':
+            failed += 1
+        results.append(result)
+
+    # Single undo step for the whole batch
+    try:
+        bpy.ops.ed.undo_push(message=f"VibeBridge Batch ({len(commands)} ops)")
+    except Exception as e:
+        vibe_log(f'BATCH UNDO PUSH SKIPPED: {e}')
+
+    status = 'SUCCESS' if not failed else ('ERROR' if failed == len(commands) else 'PARTIAL')
+    vibe_log(f"BATCH COMPLETE: {len(commands)} cmds, {failed} failed (ID: {data.get('id')})")
+    return {'status': status, 'intent': data.get('intent', 'GENERAL'), 'count': len(commands), 'failed': failed, 'results': results}
+
+def execute_command(data, source="airlock"):
+    """Executes one decoded command on the MAIN THREAD and returns its result dict.
+
+    Shared by every mutation transport (file airlock, Unix socket).
+    """
+    deadline = data.get('deadline')
+    if deadline is not None and time.time() > deadline:
+        # The caller already gave up; running it now would only waste main-thread time
+        DRAIN_STATS["expired"] += 1
+        vibe_log(f"EXPIRED: skipped {data.get('type')} (Source: {source}, ID: {data.get('id')}, late by {time.time() - deadline:.1f}s)")
+        return {'status': 'EXPIRED', 'message': 'Deadline passed before execution.'}
+    if data.get('type') == 'batch':
+        return execute_batch(data, source)
+    try:
+        # Intent Verification
+        intent = data.get('intent', 'GENERAL')
+        vibe_log(f"PROCESSING INTENT: {intent} (Source: {source}, ID: {data.get('id')})")
         
-        try:
-            with open(path, 'r') as file:
-                data = json.load(file)
+        if data.get('type') == 'exec_script':
+            code = CODE_CACHE.get_or_compile(data.get('script'))
+            if may_restructure(code):
+                # Renames and relinks are not always reported by the depsgraph;
+                # marked up front so a script failing halfway is still covered
+                mark_structure_dirty()
+            # TRANSACTION BEGIN
+            exec(code, {'bpy': bpy, 'vibe_log': vibe_log})
+            # TRANSACTION COMMIT
             
-            # Intent Verification
-            intent = data.get('intent', 'GENERAL')
-            vibe_log(f"PROCESSING INTENT: {intent} (File: {f})")
+        return {'status': 'SUCCESS', 'intent': intent}
+    except Exception as e:
+        vibe_log(f'ERROR: {e}')
+        return {'status': 'ERROR', 'message': str(e)}
+
+def seq_name(seq):
+    return f"{seq:0{SEQ_WIDTH}d}.json"
+
+def _parse_seq(name):
+    stem = name[:-5]
+    return int(stem) if len(stem) == SEQ_WIDTH and stem.isdigit() else None
+
+def _rescan_inbox():
+    """Resynchronises the cursor from a directory listing."""
+    cur = INBOX_CURSOR
+    cur["dir_mtime"] = os.stat(INBOX_PATH).st_mtime_ns
+    cur["last_scan"] = time.monotonic()
+    cur["scans"] += 1
+    
+    seqs, legacy = [], []
+    for f in os.listdir(INBOX_PATH):
+        if not f.endswith('.json'):
+            continue
+        seq = _parse_seq(f)
+        if seq is None:
+            legacy.append(f)
+        else:
+            seqs.append(seq)
+    seqs.sort()
+    legacy.sort()
+    
+    queued = set(cur["pending"])
+    late = [s for s in seqs if cur["next_seq"] is not None and s < cur["next_seq"]]
+    ahead = [s for s in seqs if cur["next_seq"] is None or s >= cur["next_seq"]]
+    
+    if ahead and cur["next_seq"] is None:
+        cur["next_seq"] = ahead[0]
+    if ahead and ahead[0] > cur["next_seq"]:
+        # Gap: a lower sequence number may still be in flight. Wait, then skip it.
+        now = time.monotonic()
+        if cur["gap_since"] is None:
+            cur["gap_since"] = now
+        elif now - cur["gap_since"] >= GAP_TIMEOUT:
+            vibe_log(f"AIRLOCK GAP: seq {cur['next_seq']}..{ahead[0] - 1} never arrived, skipping")
+            cur["next_seq"] = ahead[0]
+    
+    for seq in late:
+        vibe_log(f"AIRLOCK LATE ARRIVAL: seq {seq}")
+    names = [seq_name(s) for s in late]
+    for seq in ahead:
+        if seq != cur["next_seq"]:
+            break
+        cur["gap_since"] = None
+        names.append(seq_name(seq))
+        cur["next_seq"] += 1
+    names.extend(legacy)
+    cur["pending"].extend(n for n in names if n not in queued)
+
+def next_inbox_file():
+    """O(1) dequeue of the next command file name in submission order, or None."""
+    cur = INBOX_CURSOR
+    if cur["pending"]:
+        return cur["pending"].popleft()
+    if cur["next_seq"] is not None:
+        name = seq_name(cur["next_seq"])
+        if os.path.exists(os.path.join(INBOX_PATH, name)):
+            cur["next_seq"] += 1
+            cur["gap_since"] = None
+            return name
+    # Discovery only when something changed in the directory
+    now = time.monotonic()
+    since_scan = now - cur["last_scan"]
+    changed = os.stat(INBOX_PATH).st_mtime_ns != cur["dir_mtime"]
+    due = (
+        since_scan >= RESCAN_INTERVAL
+        or (changed and (cur["next_seq"] is None or since_scan >= DISCOVERY_INTERVAL))
+        or (cur["gap_since"] is not None and now - cur["gap_since"] >= GAP_TIMEOUT)
+    )
+    if not due:
+        return None
+    _rescan_inbox()
+    return cur["pending"].popleft() if cur["pending"] else None
+
+def inbox_has_work():
+    """Cheap idle probe (one stat, no listdir): is a command queued or did the
+    inbox change? A new '<seq>.json' is renamed into the inbox, which always
+    moves the directory mtime, so the next file needs no separate check."""
+    cur = INBOX_CURSOR
+    if cur["pending"]:
+        return True
+    try:
+        mtime = os.stat(INBOX_PATH).st_mtime_ns
+    except OSError:
+        return False
+    # Report each directory change once, including our own removals
+    changed = mtime != cur["probe_mtime"]
+    cur["probe_mtime"] = mtime
+    return changed
+
+def inbox_backlog():
+    """Known queued commands (lower bound; never lists the directory)."""
+    cur = INBOX_CURSOR
+    backlog = len(cur["pending"])
+    if not backlog and cur["next_seq"] is not None:
+        if os.path.exists(os.path.join(INBOX_PATH, seq_name(cur["next_seq"]))):
+            backlog = 1
+    return backlog
+
+def process_command_file(f):
+    """Claims, executes and answers a single inbox command.
+    Returns False if the file vanished (e.g. cancelled) before it could be claimed."""
+    path = os.path.join(INBOX_PATH, f)
+    claimed = os.path.join(INBOX_PATH, f'.{f}.claimed')
+    
+    # LOG CONSULTATION GATE would happen here in a full implementation
+    # For now, we follow the basic airlock protocol
+    
+    # Claim by rename: a concurrent cancel (os.remove) and this claim cannot both win
+    try:
+        os.replace(path, claimed)
+    except FileNotFoundError:
+        return False
+    
+    cmd_id = f[:-5]
+    try:
+        with open(claimed, 'r') as file:
+            data = json.load(file)
+        cmd_id = data.get('id', cmd_id)
+        result = execute_command(data)
+    except Exception as e:
+        vibe_log(f'ERROR: {e}')
+        result = {'status': 'ERROR', 'message': str(e)}
+    finally:
+        if os.path.exists(claimed):
+            os.remove(claimed)
+    
+    # Results are keyed by command id so the caller can wait on a known name.
+    # EXPIRED is written too: a caller may still be waiting (clock skew, a late
+    # deadline check), and the MCP OutboxSweeper reaps it if nobody is.
+    atomic_write_json(os.path.join(OUTBOX_PATH, f'res_{cmd_id}.json'), result)
+    return True
+
+def poll_airlock(budget_ms=None):
+    """Non-blocking polling of the filesystem airlock.
+
+    Drains as many queued commands as fit in `budget_ms` (default
+    DRAIN_BUDGET_MS) before yielding. Returns 0.0 while a backlog remains so
+    the timer reschedules immediately, IDLE_INTERVAL otherwise.
+    """
+    budget_ms = DRAIN_BUDGET_MS if budget_ms is None else budget_ms
+    drained = 0
+    backlog = 0
+    start = time.perf_counter()
+    try:
+        if not os.path.exists(INBOX_PATH):
+            os.makedirs(INBOX_PATH, exist_ok=True)
             
-            if data.get('type') == 'exec_script':
-                # TRANSACTION BEGIN
-                exec(data.get('script'), {'bpy': bpy, 'vibe_log': vibe_log})
-                # TRANSACTION COMMIT
-                
-            with open(os.path.join(OUTBOX_PATH, 'res_' + f), 'w') as out_f:
-                json.dump({'status': 'SUCCESS', 'intent': intent}, out_f)
-                
-        except Exception as e:
-            vibe_log(f'ERROR: {e}')
-            with open(os.path.join(OUTBOX_PATH, 'res_' + f), 'w') as out_f:
-                json.dump({'status': 'ERROR', 'message': str(e)}, out_f)
-        finally:
-            if os.path.exists(path):
-                os.remove(path)
+        while True:
+            f = next_inbox_file()
+            if f is None:
+                break
+            if process_command_file(f):
+                drained += 1
+            # Always make progress, then stop once the tick budget is spent
+            if (time.perf_counter() - start) * 1000.0 >= budget_ms:
+                break
+        backlog = inbox_backlog()
                 
     except Exception as e:
         vibe_log(f"CRITICAL AIRLOCK FAILURE: {e}")
+    
+    used_ms = (time.perf_counter() - start) * 1000.0
+    DRAIN_STATS.update({
+        "drained": drained,
+        "backlog": backlog,
+        "budget_ms": budget_ms,
+        "used_ms": round(used_ms, 3),
+        "total_drained": DRAIN_STATS["total_drained"] + drained
+    })
+    if drained > 1 or backlog:
+        vibe_log(f"AIRLOCK DRAIN: {drained} cmds in {used_ms:.2f}/{budget_ms:.2f} ms (backlog {backlog})")
         
-    return 0.1 # Keep polling cadence
+    return 0.0 if backlog else IDLE_INTERVAL
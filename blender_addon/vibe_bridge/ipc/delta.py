@@ -0,0 +1,72 @@
+import threading
+from collections import deque
+
+# Ticks with changes kept for /blender/scene_delta (ticks without changes cost nothing)
+DELTA_RING_SIZE = 1024
+
+ADDED = "added"
+REMOVED = "removed"
+MODIFIED = "modified"
+
+# (earlier kind, later kind) -> net kind; None means the changes cancel out
+_MERGE = {
+    (ADDED, MODIFIED): ADDED,
+    (ADDED, REMOVED): None,
+    (ADDED, ADDED): ADDED,
+    (MODIFIED, REMOVED): REMOVED,
+    (REMOVED, ADDED): MODIFIED,
+    (REMOVED, MODIFIED): MODIFIED,
+    (REMOVED, REMOVED): REMOVED,
+}
+
+def merge_change(delta, key, kind, info):
+    """Folds one change into `delta` ({object id: (kind, info)}) keeping the net effect."""
+    earlier = delta.get(key)
+    if earlier is not None:
+        kind = _MERGE.get((earlier[0], kind), kind)
+        if kind is None:
+            del delta[key]
+            return
+    delta[key] = (kind, info)
+
+class DeltaRing:
+    """
+    Bounded history of per-tick object deltas keyed by session object id.
+    Written by the MAIN THREAD (record), read by HTTP threads (since).
+    """
+
+    def __init__(self, size=DELTA_RING_SIZE):
+        self._entries = deque(maxlen=size)
+        self._lock = threading.Lock()
+        # Deltas are complete for every tick after this one
+        self.floor = None
+
+    def reset(self, tick):
+        """Starts a new baseline (first snapshot); nothing before `tick` is known."""
+        with self._lock:
+            self._entries.clear()
+            self.floor = tick
+
+    def record(self, tick, delta):
+        with self._lock:
+            if len(self._entries) == self._entries.maxlen:
+                self.floor = self._entries[0][0]
+            self._entries.append((tick, delta))
+
+    def since(self, tick, until):
+        """Net delta for ticks in (tick, until], or None if the ring no longer covers it.
+        `until` is the tick of the snapshot being served, which may lag the ring."""
+        with self._lock:
+            if self.floor is None or tick < self.floor:
+                return None
+            entries = [entry for entry in self._entries if tick < entry[0] <= until]
+        merged = {}
+        for _, delta in entries:
+            for key, (kind, info) in delta.items():
+                merge_change(merged, key, kind, info)
+        result = {ADDED: [], REMOVED: [], MODIFIED: []}
+        for kind, info in merged.values():
+            result[kind].append(info if kind != REMOVED else {"id": info["id"], "name": info["name"], "uuid": info["uuid"]})
+        return result
+
+DELTAS = DeltaRing()
@@ -0,0 +1,133 @@
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, defaultdict
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Listings kept so that paging started at one tick finishes on the same data
+LISTING_HISTORY = 8
+
+# Object type strings <-> 1-byte codes (Blender has a couple dozen object types)
+TYPE_NAMES = []
+TYPE_CODES = {}
+
+def type_code(obj_type):
+    code = TYPE_CODES.get(obj_type)
+    if code is None:
+        code = TYPE_CODES[obj_type] = len(TYPE_NAMES)
+        TYPE_NAMES.append(obj_type)
+    return code
+
+class ObjectColumns:
+    """
+    Columnar, name-sorted view of the scene's objects: parallel name/uuid columns
+    (references to the records' interned strings) and a 1-byte type-code array.
+    Replaces one dict per object; entries are materialized only when served.
+    """
+    __slots__ = ("names", "types", "uuids")
+
+    def __init__(self, names, types, uuids):
+        self.names = names
+        self.types = types
+        self.uuids = uuids
+
+    def __len__(self):
+        return len(self.names)
+
+    def entry(self, i):
+        return {"name": self.names[i], "type": TYPE_NAMES[self.types[i]], "uuid": self.uuids[i]}
+
+    def entries(self, positions):
+        return [self.entry(i) for i in positions]
+
+EMPTY_COLUMNS = ObjectColumns([], array("B"), [])
+
+class ObjectListing:
+    """
+    Immutable object listing plus its lookup indexes, built on the MAIN THREAD
+    whenever the columns change and shared by every later snapshot. Indexes are
+    compact position arrays searched with bisect.
+    """
+    __slots__ = ("tick", "columns", "names", "by_type", "by_uuid")
+
+    def __init__(self, columns, tick):
+        self.tick = tick
+        self.columns = columns
+        self.names = columns.names
+        by_type = defaultdict(lambda: array("I"))
+        for i, code in enumerate(columns.types):
+            by_type[code].append(i) # Ascending, so bisectable
+        self.by_type = {TYPE_NAMES[code]: positions for code, positions in by_type.items()}
+        # Positions ordered by uuid; duplicated objects share a uuid, so lookups return a range
+        uuids = columns.uuids
+        self.by_uuid = array("I", sorted(range(len(uuids)), key=uuids.__getitem__))
+
+    def head(self, count):
+        return self.columns.entries(range(min(count, len(self.columns))))
+
+    def name_range(self, prefix=None, after=None):
+        """[lo, hi) positions of names starting with `prefix` and sorting after `after`."""
+        names = self.names
+        lo, hi = 0, len(names)
+        if prefix:
+            lo = bisect_left(names, prefix)
+            hi = bisect_left(names, prefix + "\U0010ffff", lo)
+        if after is not None:
+            lo = max(lo, bisect_right(names, after))
+        return lo, hi
+
+    def page(self, obj_type=None, prefix=None, after=None, limit=DEFAULT_PAGE_SIZE):
+        """Returns (objects, total_matching, last_name or None if exhausted)."""
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        lo, hi = self.name_range(prefix)
+        start, _ = self.name_range(prefix, after)
+        if obj_type:
+            positions = self.by_type.get(obj_type, ())
+            first = bisect_left(positions, lo)
+            last = bisect_left(positions, hi)
+            begin = bisect_left(positions, start)
+            picked = positions[begin:min(begin + limit, last)]
+            total = last - first
+            more = begin + limit < last
+        else:
+            picked = range(start, min(start + limit, hi))
+            total = hi - lo
+            more = start + limit < hi
+        objects = self.columns.entries(picked)
+        return objects, total, (objects[-1]["name"] if more and objects else None)
+
+    def lookup_uuid(self, uuid):
+        uuids = self.columns.uuids
+        lo = bisect_left(self.by_uuid, uuid, key=uuids.__getitem__)
+        hi = bisect_right(self.by_uuid, uuid, lo, key=uuids.__getitem__)
+        return self.columns.entries(sorted(self.by_uuid[lo:hi]))
+
+class ListingHistory:
+    """Recent listings by tick. Written by the MAIN THREAD, read by HTTP threads."""
+
+    def __init__(self, size=LISTING_HISTORY):
+        self.size = size
+        self._listings = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, listing):
+        with self._lock:
+            self._listings[listing.tick] = listing
+            while len(self._listings) > self.size:
+                self._listings.popitem(last=False)
+
+    def get(self, tick):
+        with self._lock:
+            return self._listings.get(tick)
+
+LISTINGS = ListingHistory()
+
+def encode_cursor(listing, last_name):
+    return f"{listing.tick}:{last_name}"
+
+def decode_cursor(cursor):
+    """Returns (listing tick, last name) or raises ValueError."""
+    tick, _, name = cursor.partition(":")
+    return int(tick), name
@@ -0,0 +1,164 @@
+import zlib
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Objects of a collection are spread over a fixed number of buckets so a single
+# change rehashes one bucket instead of the whole collection.
+MERKLE_FANOUT = 64
+
+# Committed roots kept for diffing (oldest evicted first)
+MERKLE_HISTORY = 64
+
+# Pseudo-collection for objects not linked into any collection
+UNLINKED = "<unlinked>"
+
+def leaf_hash(line):
+    return hashlib.sha256(line).hexdigest()
+
+def bucket_of(name):
+    # crc32 rather than hash(): must be stable across sessions
+    return zlib.crc32(name.encode()) % MERKLE_FANOUT
+
+class Bucket:
+    """Immutable once committed: {object name: leaf hash} and its hash."""
+    __slots__ = ("hash", "members")
+
+    def __init__(self, members):
+        self.members = members
+        self.hash = hashlib.sha256(
+            "".join(f"{name}\0{leaf}\n" for name, leaf in sorted(members.items())).encode()
+        ).hexdigest()
+
+EMPTY_BUCKET = Bucket({})
+
+class CollectionNode:
+    """Immutable once committed: MERKLE_FANOUT buckets rolled up into one hash."""
+    __slots__ = ("hash", "buckets")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.hash = hashlib.sha256("".join(b.hash for b in buckets).encode()).hexdigest()
+
+class MerkleScene:
+    """
+    Persistent Merkle tree of the scene: object leaves -> buckets -> collections -> root.
+    Edits are staged with put()/remove() and applied by commit(), which only
+    rehashes the touched buckets and collections. Removals are applied before
+    puts, so a rename chain or swap staged in any order ends with every current
+    name present. Committed versions share
+    unchanged nodes, so old roots stay diffable at little memory cost.
+    """
+
+    def __init__(self):
+        self.root = None
+        self.collections = {}
+        self._staged = {}
+        self._removed = set()
+        self._history = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"commits": 0, "buckets_rehashed": 0}
+
+    # --- STAGING (MAIN THREAD) ---
+
+    def put(self, name, collections, leaf):
+        for coll in collections or (UNLINKED,):
+            self._staged[(coll, bucket_of(name), name)] = leaf
+
+    def remove(self, name, collections):
+        # Kept apart from puts: a later remove of a name another object has
+        # just taken (A->B, B->A) must not cancel that object's put
+        for coll in collections or (UNLINKED,):
+            self._removed.add((coll, bucket_of(name), name))
+
+    def commit(self):
+        """Applies staged edits (removals, then puts) and returns the new root hash."""
+        if not self._staged and not self._removed and self.root is not None:
+            return self.root
+
+        touched = {}
+        for coll, index, name in self._removed:
+            touched.setdefault(coll, {}).setdefault(index, {})[name] = None
+        for (coll, index, name), leaf in self._staged.items():
+            touched.setdefault(coll, {}).setdefault(index, {})[name] = leaf
+        self._staged = {}
+        self._removed = set()
+
+        collections = dict(self.collections)
+        for coll, bucket_edits in touched.items():
+            node = collections.get(coll)
+            buckets = list(node.buckets) if node else [EMPTY_BUCKET] * MERKLE_FANOUT
+            for index, edits in bucket_edits.items():
+                members = dict(buckets[index].members)
+                for name, leaf in edits.items():
+                    if leaf is None:
+                        members.pop(name, None)
+                    else:
+                        members[name] = leaf
+                buckets[index] = Bucket(members) if members else EMPTY_BUCKET
+                self.stats["buckets_rehashed"] += 1
+            if any(b is not EMPTY_BUCKET for b in buckets):
+                collections[coll] = CollectionNode(buckets)
+            else:
+                collections.pop(coll, None)
+
+        root = hashlib.sha256(
+            "".join(f"{coll}\0{node.hash}\n" for coll, node in sorted(collections.items())).encode()
+        ).hexdigest()
+        self.collections = collections
+        self.root = root
+        self.stats["commits"] += 1
+        with self._lock:
+            self._history[root] = collections
+            self._history.move_to_end(root)
+            while len(self._history) > MERKLE_HISTORY:
+                self._history.popitem(last=False)
+        return root
+
+    # --- QUERIES (ANY THREAD) ---
+
+    def version(self, root):
+        with self._lock:
+            return self._history.get(root)
+
+    def subtree_hashes(self, root=None):
+        """Top-level view of a committed tree: {collection: hash}."""
+        collections = self.version(root or self.root)
+        if collections is None:
+            return None
+        return {coll: node.hash for coll, node in collections.items()}
+
+    def diff(self, old_root, new_root=None):
+        """
+        Differing subtrees between two committed roots, descending only into
+        nodes whose hashes differ. Returns None if either root is unknown.
+        """
+        new_root = new_root or self.root
+        old = self.version(old_root)
+        new = self.version(new_root)
+        if old is None or new is None:
+            return None
+
+        changes = {}
+        for coll in set(old) | set(new):
+            old_node = old.get(coll)
+            new_node = new.get(coll)
+            if old_node is new_node or (old_node and new_node and old_node.hash == new_node.hash):
+                continue
+            old_buckets = old_node.buckets if old_node else [EMPTY_BUCKET] * MERKLE_FANOUT
+            new_buckets = new_node.buckets if new_node else [EMPTY_BUCKET] * MERKLE_FANOUT
+            added, removed, changed = [], [], []
+            for old_bucket, new_bucket in zip(old_buckets, new_buckets):
+                if old_bucket is new_bucket or old_bucket.hash == new_bucket.hash:
+                    continue
+                before, after = old_bucket.members, new_bucket.members
+                added.extend(name for name in after if name not in before)
+                removed.extend(name for name in before if name not in after)
+                changed.extend(name for name in after if name in before and before[name] != after[name])
+            changes[coll] = {
+                "hash": new_node.hash if new_node else None,
+                "added": sorted(added),
+                "removed": sorted(removed),
+                "changed": sorted(changed)
+            }
+        return {"from": old_root, "to": new_root, "collections": changes}
@@ -3,17 +3,52 @@ import socketserver
 import json
 import threading
 import time
+import math
 import os
+import gzip
+import zlib
 import hashlib
+from types import MappingProxyType
+from urllib.parse import urlsplit, parse_qs
 from ..logging.logger import vibe_log
+from .snapshot import SCENE_INDEX
+from ..core.audits import AUDITS, AUDIT_WAIT, AUDIT_MAX_WAIT, cached_audit, request_audit, get_audit_job
+from ..core.workers import DaemonWorkers
+from .delta import DELTAS
+from .listing import ObjectListing, EMPTY_COLUMNS, LISTINGS, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor, decode_cursor
 
 PORT = 22000
 SESSION_ID = str(int(time.time()))
 
-# Global state for thread-safe reading (Updated by main thread poll_wrapper)
+# --- HTTP SERVER LIMITS ---
+# Every admitted connection gets its own worker at once (cap == pool size), so
+# readers and the heartbeat never queue behind each other; extra connections
+# are refused with 503 instead of waiting.
+MAX_WORKERS = 32
+MAX_CONNECTIONS = MAX_WORKERS
+# Parked /blender/watch and /blender/audit?wait= requests may hold at most this many workers
+MAX_PARKED_WATCHERS = 16
+# Per socket read/write; also how long an idle keep-alive connection is kept
+SOCKET_TIMEOUT = 5.0
+
+HTTP_STATS = {
+    "open_connections": 0,
+    "accepted": 0,
+    "rejected": 0,
+    "requests": 0,
+    "parked_watchers": 0
+}
+
+WATCH_SLOTS = threading.BoundedSemaphore(MAX_PARKED_WATCHERS)
+# Set by stop_server(): parked watchers return instead of outliving the server
+SERVER_STOPPING = threading.Event()
+BUSY_RESPONSE = b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+
+# Back buffer, written by the main thread (poll_wrapper). The HTTP thread reads
+# PUBLISHED instead, an immutable copy swapped in by publish_snapshot().
 SCENE_SNAPSHOT = {
     "hash": "INIT",
-    "objects": [],
+    "listing": ObjectListing(EMPTY_COLUMNS, 0),
     "object_count": 0,
     "meshes": 0,
     "armatures": 0,
@@ -26,151 +61,740 @@ SCENE_SNAPSHOT = {
     "mode": "UNKNOWN",
     "active_object": None,
     "errors": [],
-    "modal_active": False
+    "modal_active": False,
+    "airlock": {},
+    "scheduler": {},
+    "code_cache": {},
+    "audits": {},
+    "snapshot_stats": {}
+}
+
+SCHEMA_VERSION = "vibe.blender.v1.5.0"
+
+def encode_json(data):
+    """Serializes a response with the schema version injected (never mutates `data`)."""
+    return json.dumps(dict(data, schema_version=SCHEMA_VERSION)).encode()
+
+# --- RESPONSE ENCODING (content negotiation) ---
+
+JSON_TYPE = "application/json"
+# Smaller bodies are not worth a compression pass
+COMPRESS_MIN_BYTES = 1024
+# Level 1 gets ~the ratio of level 6 on this JSON at about half the CPU
+COMPRESS_LEVEL = 1
+
+ENCODING_STATS = {
+    "json": 0,
+    "gzip": 0,
+    "deflate": 0,
+    "raw_bytes": 0,
+    "wire_bytes": 0,
+    "encode_ms": 0.0,
+    "compress_ms": 0.0
 }
 
+def parse_accept(header):
+    """{content-coding: q} from an Accept-Encoding header."""
+    prefs = {}
+    for part in (header or "").split(","):
+        token, _, params = part.partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        prefs[token] = q
+    return prefs
+
+def choose_coding(accept_encoding):
+    prefs = parse_accept(accept_encoding)
+    for coding in ("gzip", "deflate"):
+        if prefs.get(coding, 0.0) > 0.0:
+            return coding
+    return None
+
+def compress_body(body, coding):
+    start = time.perf_counter()
+    if coding == "gzip":
+        body = gzip.compress(body, compresslevel=COMPRESS_LEVEL, mtime=0)
+    else:
+        body = zlib.compress(body, COMPRESS_LEVEL)
+    ENCODING_STATS["compress_ms"] += (time.perf_counter() - start) * 1000.0
+    return body
+
+# --- CONDITIONAL READS (ETag / If-None-Match) ---
+# ETags are digests of the encoded (uncompressed) body. Every body embeds the
+# scene hash or monotonic_tick it was built from, so the tag changes with them,
+# and also when a route changes without either (datablock counts, errors, file
+# state). Weak tags: gzip and identity copies of one body are interchangeable.
+# /status carries live counters, so it is tagged by tick instead (tick_etag).
+
+CONDITIONAL_STATS = {
+    "tagged": 0,
+    "not_modified": 0
+}
+
+def body_etag(body):
+    return 'W/"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+
+def tick_etag(state):
+    return 'W/"%s-%d"' % (SESSION_ID, state["monotonic_tick"])
+
+def etag_matches(if_none_match, etag):
+    """Weak comparison (RFC 9110 13.1.2) of `etag` against an If-None-Match header."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+# --- INVARIANT ROUTES (pre-encoded once per tick from an immutable state) ---
+
+def build_heartbeat(state):
+    return {
+        "blender_pid": os.getpid(),
+        "responsive": True,
+        "modal_operator_active": state["modal_active"],
+        "session_hash": SESSION_ID,
+        "engine_time_ms": state["engine_time_ms"],
+        "monotonic_tick": state["monotonic_tick"],
+        "timestamp": state["timestamp"] # Time of the last main-thread publish
+    }
+
+def build_file_state(state):
+    return {
+        "filepath": state["filepath"],
+        "is_dirty": state["is_dirty"],
+        "is_saved": bool(state["filepath"]),
+        "autosave_active": True
+    }
+
+def build_scene_state(state):
+    return {
+        "scene_hash": state["hash"],
+        "object_count": state["object_count"],
+        "objects": state["listing"].head(10) # Full listing: /blender/objects
+    }
+
+def build_context_state(state):
+    return {
+        "active_object": state["active_object"],
+        "object_mode": state["mode"]
+    }
+
+def build_datablock_state(state):
+    return {
+        "meshes": state["meshes"],
+        "armatures": state["armatures"],
+        "materials": state["materials"],
+        "datablock_hash": state["hash"]
+    }
+
+def build_error_state(state):
+    return {
+        "errors": state["errors"],
+        "error_hash": state["error_hash"]
+    }
+
+ROUTE_BUILDERS = {
+    "/blender/heartbeat": build_heartbeat,
+    "/blender/file_state": build_file_state,
+    "/blender/scene_state": build_scene_state,
+    "/blender/context_state": build_context_state,
+    "/blender/datablock_state": build_datablock_state,
+    "/blender/error_state": build_error_state
+}
+
+class PublishedSnapshot:
+    """
+    Immutable per-tick view of SCENE_SNAPSHOT plus the encoded body and ETag of
+    every static route. Built on the MAIN THREAD and never mutated afterwards, so
+    the HTTP thread can serve it without locks or serialization.
+    """
+    __slots__ = ("state", "routes", "etags", "compressed")
+
+    def __init__(self, state, routes):
+        self.state = state
+        self.routes = routes
+        self.etags = {path: body_etag(body) for path, body in routes.items()}
+        # (route, content-coding) -> body, filled lazily by HTTP threads
+        self.compressed = {}
+
+def build_published(state):
+    state = dict(state)
+    state["error_hash"] = hashlib.md5(str(state["errors"]).encode()).hexdigest()
+    state = MappingProxyType(state)
+    return PublishedSnapshot(state, {path: encode_json(build(state)) for path, build in ROUTE_BUILDERS.items()})
+
+# Front buffer: replaced by a single reference swap in publish_snapshot()
+PUBLISHED = build_published(SCENE_SNAPSHOT)
+
+# Notified on every publish so /blender/watch waiters wake on the next tick
+PUBLISH_CONDITION = threading.Condition()
+
+def publish_snapshot():
+    """Freezes SCENE_SNAPSHOT (the back buffer) and swaps it in. Called from MAIN THREAD.
+
+    Nested values must be replaced, never mutated in place, once published.
+    """
+    global PUBLISHED
+    published = build_published(SCENE_SNAPSHOT)
+    with PUBLISH_CONDITION:
+        PUBLISHED = published
+        PUBLISH_CONDITION.notify_all()
+
+# --- WATCH (long-poll / SSE) ---
+
+WATCH_DEFAULT_TIMEOUT = 25.0
+WATCH_MAX_TIMEOUT = 60.0
+SSE_KEEPALIVE = 15.0
+
+# Watchable event -> (query parameter carrying the client's last value, state key)
+WATCH_FIELDS = {
+    "tick": ("tick", "monotonic_tick"),
+    "scene": ("hash", "hash"),
+    "errors": ("error_hash", "error_hash")
+}
+
+def parse_timeout(value, limit):
+    """Client-supplied wait in seconds, clamped to [0, limit]. float() accepts
+    "nan" and "inf", which would make a deadline that never passes."""
+    timeout = float(value)
+    if not math.isfinite(timeout):
+        raise ValueError("timeout must be finite")
+    return min(max(timeout, 0.0), limit)
+
+def watch_baseline(query, state):
+    """Values to compare against: the client's last-seen ones, or the current
+    state for events it did not pin. Tick events are opt-in (they fire every tick)."""
+    events = query.get("on")
+    if events:
+        events = [e for e in events.split(",") if e in WATCH_FIELDS]
+    else:
+        events = [e for e, (param, _) in WATCH_FIELDS.items() if param in query] or ["scene", "errors"]
+    baseline = {}
+    for event in events:
+        param, key = WATCH_FIELDS[event]
+        value = query.get(param, state[key])
+        baseline[event] = int(value) if key == "monotonic_tick" else value
+    return baseline
+
+def watch_changes(state, baseline):
+    return [event for event, value in baseline.items() if state[WATCH_FIELDS[event][1]] != value]
+
+def wait_for_change(baseline, timeout):
+    """Blocks until a watched value differs from `baseline` or `timeout` elapses.
+    Returns (snapshot, changed events)."""
+    deadline = time.monotonic() + timeout
+    with PUBLISH_CONDITION:
+        while True:
+            snap = PUBLISHED
+            changed = watch_changes(snap.state, baseline)
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0 or SERVER_STOPPING.is_set():
+                return snap, changed
+            PUBLISH_CONDITION.wait(remaining)
+
+def watch_event(state, changed):
+    return {
+        "changed": changed,
+        "session_hash": SESSION_ID,
+        "monotonic_tick": state["monotonic_tick"],
+        "scene_hash": state["hash"],
+        "error_hash": state["error_hash"]
+    }
+
 class VibeHandler(http.server.BaseHTTPRequestHandler):
+    # Keep-alive: every response carries Content-Length (SSE closes explicitly)
+    protocol_version = "HTTP/1.1"
+    timeout = SOCKET_TIMEOUT
+    # Headers and body are separate writes; without this Nagle stalls keep-alive replies ~40 ms
+    disable_nagle_algorithm = True
+
     def log_message(self, format, *args):
         # Silence standard HTTP logging to keep console clean
         pass
 
     def do_GET(self):
+        HTTP_STATS["requests"] += 1
+        # One reference read: every field below comes from the same tick
+        self.snap = PUBLISHED
+        url = urlsplit(self.path)
+        self.route = url.path
+        body = self.snap.routes.get(url.path)
+        if body is not None:
+            # Static routes are small and always JSON
+            etag = self.snap.etags[url.path]
+            if not self.send_not_modified(etag):
+                self.send_body(body, cache=self.snap.compressed, etag=etag)
+            return
+
         routes = {
-            "/blender/heartbeat": self.get_heartbeat,
-            "/blender/file_state": self.get_file_state,
-            "/blender/scene_state": self.get_scene_state,
-            "/blender/context_state": self.get_context_state,
-            "/blender/datablock_state": self.get_datablock_state,
-            "/blender/error_state": self.get_error_state,
+            "/blender/objects": self.get_objects,
+            "/blender/scene_delta": self.get_scene_delta,
+            "/blender/watch": self.get_watch,
+            "/blender/scene_merkle": self.get_scene_merkle,
+            "/blender/scene_diff": self.get_scene_diff,
+            "/blender/audit": self.get_audit,
             "/status": self.get_status # Legacy support
         }
-        
-        handler = routes.get(self.path)
+        self.query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        handler = routes.get(url.path)
         if handler:
-            self.send_json_response(handler())
+            response = handler()
+            if response is not None: # None: the handler already streamed its reply
+                self.send_json_response(response)
         else:
             self.send_error(404)
 
-    def send_json_response(self, data):
-        # Inject schema version into every response
-        data["schema_version"] = "vibe.blender.v1.5.0"
+    def send_not_modified(self, etag):
+        """Answers 304 (headers only) if the client's If-None-Match already holds `etag`."""
+        if not etag_matches(self.headers.get("If-None-Match"), etag):
+            return False
+        CONDITIONAL_STATS["not_modified"] += 1
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+        return True
+
+    def send_body(self, body, content_type=JSON_TYPE, cache=None, etag=None):
+        """Writes `body`, compressed if the client accepts it and it is large enough.
+        `cache` memoizes compressed bodies of pre-encoded routes per snapshot."""
+        ENCODING_STATS["raw_bytes"] += len(body)
+        coding = choose_coding(self.headers.get("Accept-Encoding")) if len(body) >= COMPRESS_MIN_BYTES else None
+        if coding:
+            ENCODING_STATS[coding] += 1
+            key = (self.route, coding)
+            compressed = cache.get(key) if cache is not None else None
+            if compressed is None:
+                compressed = compress_body(body, coding)
+                if cache is not None:
+                    cache[key] = compressed
+            body = compressed
+        ENCODING_STATS["wire_bytes"] += len(body)
         self.send_response(200)
-        self.send_header("Content-type", "application/json")
+        self.send_header("Content-type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Vary", "Accept-Encoding")
+        if coding:
+            self.send_header("Content-Encoding", coding)
+        if etag:
+            CONDITIONAL_STATS["tagged"] += 1
+            # Clients may keep the body but must revalidate it on every read
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        self.wfile.write(body)
 
-    # --- INVARIANT HANDLERS ---
+    def send_json_response(self, data, etag=None):
+        """Encodes `data` as JSON. GET bodies are tagged with `etag`, or a digest
+        of the body by default."""
+        start = time.perf_counter()
+        body = encode_json(data)
+        ENCODING_STATS["json"] += 1
+        ENCODING_STATS["encode_ms"] += (time.perf_counter() - start) * 1000.0
+        if self.command == "GET":
+            etag = etag or body_etag(body)
+            if not self.send_not_modified(etag):
+                self.send_body(body, etag=etag)
+        else:
+            self.send_body(body)
 
-    def get_heartbeat(self):
-        return {
-            "blender_pid": os.getpid(),
-            "responsive": True,
-            "modal_operator_active": SCENE_SNAPSHOT["modal_active"],
-            "session_hash": SESSION_ID,
-            "engine_time_ms": SCENE_SNAPSHOT["engine_time_ms"],
-            "monotonic_tick": SCENE_SNAPSHOT["monotonic_tick"],
-            "timestamp": time.time()
-        }
+    # --- OBJECT LISTING ---
 
-    def get_file_state(self):
-        return {
-            "filepath": SCENE_SNAPSHOT["filepath"],
-            "is_dirty": SCENE_SNAPSHOT["is_dirty"],
-            "is_saved": bool(SCENE_SNAPSHOT["filepath"]),
-            "autosave_active": True
-        }
+    def get_objects(self):
+        """
+        Paged, name-ordered object listing: ?type= &prefix= &uuid= &limit= &cursor=
+        A cursor pins the listing it was issued from, so every page of one walk
+        reflects the same monotonic_tick while that listing is still retained.
+        """
+        query = self.query
+        listing = self.snap.state["listing"]
+        after = None
+        consistent = True
+        if query.get("cursor"):
+            try:
+                tick, after = decode_cursor(query["cursor"])
+            except ValueError:
+                return {"status": "ERROR", "message": "Malformed cursor"}
+            pinned = LISTINGS.get(tick)
+            if pinned is not None:
+                listing = pinned
+            else:
+                # Listing aged out: continue by name on the current one
+                consistent = False
 
-    def get_scene_state(self):
-        return {
-            "scene_hash": SCENE_SNAPSHOT["hash"],
-            "object_count": SCENE_SNAPSHOT["object_count"],
-            "objects": SCENE_SNAPSHOT["objects"][:10] # Limit for performance
-        }
+        if query.get("uuid"):
+            objects = listing.lookup_uuid(query["uuid"])
+            total, last_name = len(objects), None
+        else:
+            try:
+                limit = int(query.get("limit", DEFAULT_PAGE_SIZE))
+            except ValueError:
+                return {"status": "ERROR", "message": "Malformed limit"}
+            objects, total, last_name = listing.page(query.get("type"), query.get("prefix"), after, limit)
 
-    def get_context_state(self):
         return {
-            "active_object": SCENE_SNAPSHOT["active_object"],
-            "object_mode": SCENE_SNAPSHOT["mode"]
+            "status": "SUCCESS",
+            "monotonic_tick": listing.tick,
+            "consistent": consistent,
+            "total": total,
+            "objects": objects,
+            "next_cursor": encode_cursor(listing, last_name) if last_name is not None else None
         }
 
-    def get_datablock_state(self):
-        return {
-            "meshes": SCENE_SNAPSHOT["meshes"],
-            "armatures": SCENE_SNAPSHOT["armatures"],
-            "materials": SCENE_SNAPSHOT["materials"],
-            "datablock_hash": SCENE_SNAPSHOT["hash"]
-        }
+    # --- WATCH ---
+
+    def get_watch(self):
+        """
+        Parks the request until scene_hash, the error state or (opt-in) the tick
+        changes: ?hash= &error_hash= &tick= &on=scene,errors,tick &timeout=
+        With ?stream=1 or Accept: text/event-stream, streams SSE events instead.
+        """
+        try:
+            baseline = watch_baseline(self.query, self.snap.state)
+            timeout = parse_timeout(self.query.get("timeout", WATCH_DEFAULT_TIMEOUT), WATCH_MAX_TIMEOUT)
+        except ValueError:
+            return {"status": "ERROR", "message": "Malformed watch parameters"}
+        if not WATCH_SLOTS.acquire(blocking=False):
+            self.send_error(503, "Too many parked watchers")
+            return None
+        HTTP_STATS["parked_watchers"] += 1
+        try:
+            if self.query.get("stream") or "text/event-stream" in self.headers.get("Accept", ""):
+                self.stream_watch(baseline)
+                return None
+            snap, changed = wait_for_change(baseline, timeout)
+        finally:
+            HTTP_STATS["parked_watchers"] -= 1
+            WATCH_SLOTS.release()
+        response = watch_event(snap.state, changed)
+        response["status"] = "CHANGED" if changed else "TIMEOUT"
+        return response
+
+    def stream_watch(self, baseline):
+        """SSE: one event per change, comment keep-alives while idle, until the client leaves."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        # Events are pushed as they come, not bound by the per-read socket timeout
+        self.connection.settimeout(None)
+        try:
+            while not SERVER_STOPPING.is_set():
+                snap, changed = wait_for_change(baseline, SSE_KEEPALIVE)
+                if not changed:
+                    self.wfile.write(b": keepalive\n\n")
+                else:
+                    state = snap.state
+                    for event in changed:
+                        baseline[event] = state[WATCH_FIELDS[event][1]]
+                    payload = json.dumps(dict(watch_event(state, changed), schema_version=SCHEMA_VERSION))
+                    self.wfile.write(f"id: {state['monotonic_tick']}\nevent: {changed[0]}\ndata: {payload}\n\n".encode())
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    # --- DELTA FEED ---
+
+    def get_scene_delta(self):
+        """Net object changes (by object id) after ?since_tick=N, up to this snapshot's tick."""
+        state = self.snap.state
+        try:
+            since = int(self.query["since_tick"])
+        except (KeyError, ValueError):
+            return {"status": "ERROR", "message": "Missing or malformed 'since_tick'"}
+        session = self.query.get("session")
+        current = state["monotonic_tick"]
+        # Ticks restart with the addon: a tick from another session means nothing here
+        delta = None
+        if since <= current and session in (None, SESSION_ID):
+            delta = DELTAS.since(since, current)
+        if delta is None:
+            return {
+                "status": "RESYNC_REQUIRED",
+                "session_hash": SESSION_ID,
+                "monotonic_tick": current,
+                "scene_hash": state["hash"]
+            }
+        delta.update({
+            "status": "SUCCESS",
+            "session_hash": SESSION_ID,
+            "since_tick": since,
+            "monotonic_tick": current,
+            "scene_hash": state["hash"]
+        })
+        return delta
 
-    def get_error_state(self):
+    # --- MERKLE HANDLERS ---
+
+    def get_scene_merkle(self):
+        current_root = self.snap.state["hash"]
+        root = self.query.get("root") or current_root
+        subtrees = SCENE_INDEX.merkle.subtree_hashes(root)
+        if subtrees is None:
+            return {"status": "UNKNOWN_ROOT", "root": root, "current_root": current_root}
+        return {"status": "SUCCESS", "root": root, "collections": subtrees}
+
+    def get_scene_diff(self):
+        """Differing subtrees between ?from=<root> and ?to=<root> (default: current)."""
+        old_root = self.query.get("from")
+        new_root = self.query.get("to") or self.snap.state["hash"]
+        if not old_root:
+            return {"status": "ERROR", "message": "Missing 'from' root"}
+        return self._diff_response(old_root, new_root)
+
+    def _diff_response(self, old_root, new_root):
+        if old_root == new_root:
+            return {"status": "IN_SYNC", "root": new_root, "collections": {}}
+        diff = SCENE_INDEX.merkle.diff(old_root, new_root)
+        if diff is None:
+            # Root aged out of history (or never existed): caller must re-read everything
+            return {"status": "RESYNC_REQUIRED", "current_root": self.snap.state["hash"]}
+        diff["status"] = "DIVERGED"
+        return diff
+
+    # --- TRAIT QUERIES ---
+
+    def find_by_traits(self, data):
+        """
+        Objects matching every given trait (v_count, mat_name, object_type),
+        answered from SCENE_INDEX's inverted indexes without touching bpy.
+        """
+        state = self.snap.state
+        criteria = []
+        try:
+            if data.get("v_count") is not None:
+                criteria.append(("vertex_count", int(data["v_count"])))
+            limit = max(1, min(int(data.get("limit", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE))
+        except (TypeError, ValueError):
+            return {"status": "ERROR", "message": "Malformed 'v_count' or 'limit'"}
+        if data.get("mat_name"):
+            criteria.append(("material", str(data["mat_name"])))
+        if data.get("object_type"):
+            criteria.append(("type", str(data["object_type"]).upper()))
+        if not criteria:
+            return {"status": "ERROR", "message": "No traits given"}
+        matches, total = SCENE_INDEX.trait_index.find(criteria, limit)
         return {
-            "errors": SCENE_SNAPSHOT["errors"],
-            "error_hash": hashlib.md5(str(SCENE_SNAPSHOT["errors"]).encode()).hexdigest()
+            "status": "SUCCESS",
+            "matches": matches,
+            "total": total,
+            "scene_hash": state["hash"],
+            "monotonic_tick": state["monotonic_tick"]
         }
 
+    # --- AUDITS ---
+
+    def run_audit(self, data):
+        """Starts an audit (extraction on the main thread, analysis on workers).
+        An unchanged scene is answered from AUDIT_CACHE right here; otherwise waits
+        up to AUDIT_WAIT, then hands back a job id for /blender/audit."""
+        audit = data["action"]
+        target = data.get("target") or None
+        result = cached_audit(audit) if target is None else None
+        if result is not None:
+            return result
+        job = request_audit(audit, target)
+        if data.get("wait", True) and job.done.wait(AUDIT_WAIT):
+            return job.result
+        return {"status": "PENDING", "audit": audit, "job_id": job.id}
+
+    def get_audit(self):
+        """Result of an audit job: ?job=<job_id> &wait=<seconds>
+        With `wait`, long-polls until the job is done so clients need not spin.
+        Waits share the watchers' slots; without a free one only AUDIT_WAIT applies."""
+        try:
+            job = get_audit_job(int(self.query["job"]))
+            wait = parse_timeout(self.query.get("wait", 0), AUDIT_MAX_WAIT)
+        except (KeyError, ValueError):
+            return {"status": "ERROR", "message": "Missing or malformed 'job' or 'wait'"}
+        if job is None:
+            return {"status": "UNKNOWN_JOB", "message": "Job expired or never existed; start the audit again"}
+        if wait and not job.done.is_set():
+            if WATCH_SLOTS.acquire(blocking=False):
+                HTTP_STATS["parked_watchers"] += 1
+                try:
+                    job.done.wait(wait)
+                finally:
+                    HTTP_STATS["parked_watchers"] -= 1
+                    WATCH_SLOTS.release()
+            else:
+                job.done.wait(min(wait, AUDIT_WAIT))
+        if not job.done.is_set():
+            return {"status": "PENDING", "audit": job.audit, "job_id": job.id}
+        return job.result
+
     def do_POST(self):
-        content_length = int(self.headers['Content-Length'])
+        HTTP_STATS["requests"] += 1
+        content_length = int(self.headers.get('Content-Length', 0))
         post_data = self.rfile.read(content_length)
-        data = json.loads(post_data)
-        
-        # All responses include schema version for Version Drift Invariance
-        schema_info = {"schema_version": "vibe.blender.v1.5.0"}
+        try:
+            data = json.loads(post_data or b"{}")
+        except ValueError:
+            self.send_error(400, "Malformed JSON body")
+            return
+        self.snap = PUBLISHED
+        self.route = self.path
+        state = self.snap.state
         
         if self.path == "/query":
-            # For now, return the latest cached hash
-            response = {
-                "hash": SCENE_SNAPSHOT["hash"],
+            if data.get("type") == "audit_op" and data.get("action") == "find_by_traits":
+                self.send_json_response(self.find_by_traits(data))
+                return
+            if data.get("action") in AUDITS:
+                self.send_json_response(self.run_audit(data))
+                return
+            # Other queries: the latest cached hash
+            self.send_json_response({
+                "hash": state["hash"],
                 "status": "SUCCESS",
-                "monotonic_tick": SCENE_SNAPSHOT["monotonic_tick"]
-            }
-            response.update(schema_info)
+                "monotonic_tick": state["monotonic_tick"]
+            })
+        elif self.path == "/reconcile":
+            # Agent assumptions carry the scene_hash they were formed against
+            believed = data.get("scene_hash")
+            if not believed:
+                self.send_json_response({"status": "ERROR", "message": "Missing 'scene_hash' in assumptions"})
+                return
+            response = self._diff_response(believed, state["hash"])
+            response["monotonic_tick"] = state["monotonic_tick"]
             self.send_json_response(response)
         else:
             self.send_error(404)
 
     def get_status(self):
-        return {
+        """Per-tick status. A body digest would change on every request (the HTTP
+        counters do), so the tag is the session and tick: revalidating within a
+        tick answers 304 and skips building the body. Counters in a cached copy
+        are as of its first read; a stalled main thread shows as an unchanging
+        snapshot_timestamp."""
+        state = self.snap.state
+        etag = tick_etag(state)
+        if self.send_not_modified(etag):
+            return None
+        self.send_json_response({
             "session": SESSION_ID,
-            "objects": SCENE_SNAPSHOT["object_count"],
-            "snapshot_age": time.time() - SCENE_SNAPSHOT["timestamp"],
-            "schema_version": "vibe.blender.v1.5.0"
-        }    socketserver.TCPServer.allow_reuse_address = True
+            "objects": state["object_count"],
+            "snapshot_timestamp": state["timestamp"],
+            "airlock": state["airlock"],
+            "scheduler": state["scheduler"],
+            "code_cache": state["code_cache"],
+            "audits": state["audits"],
+            "snapshot": state["snapshot_stats"],
+            "http": dict(HTTP_STATS, encoding=dict(ENCODING_STATS), conditional=dict(CONDITIONAL_STATS))
+        }, etag=etag)
+        return None
+
+class InvarianceServer(socketserver.TCPServer):
+    """
+    Bounded threaded HTTP/1.1 server: one pooled worker per admitted connection,
+    a hard connection cap, and immediate 503s beyond it.
+    """
+    allow_reuse_address = True
+    request_queue_size = 64
+
+    def __init__(self, address, handler, max_workers=MAX_WORKERS, max_connections=MAX_CONNECTIONS):
+        super().__init__(address, handler)
+        self.pool = DaemonWorkers(max_workers, "vibe-http")
+        self.slots = threading.BoundedSemaphore(min(max_connections, max_workers))
+
+    def process_request(self, request, client_address):
+        if not self.slots.acquire(blocking=False):
+            HTTP_STATS["rejected"] += 1
+            try:
+                request.sendall(BUSY_RESPONSE)
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        HTTP_STATS["accepted"] += 1
+        HTTP_STATS["open_connections"] += 1
+        self.pool.submit(self._serve_connection, request, client_address)
+
+    def _serve_connection(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception as e:
+            vibe_log(f"HTTP CONNECTION ERROR: {e}")
+        finally:
+            self.shutdown_request(request)
+            HTTP_STATS["open_connections"] -= 1
+            self.slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown()
+
+_http_server = None
+
+def start_server():
+    global _http_server
     try:
-        with socketserver.TCPServer(("127.0.0.1", PORT), VibeHandler) as server:
-            vibe_log(f"INVARIANCE SERVER STARTED ON PORT {PORT}")
+        with InvarianceServer(("127.0.0.1", PORT), VibeHandler) as server:
+            SERVER_STOPPING.clear()
+            _http_server = server
+            vibe_log(f"INVARIANCE SERVER STARTED ON PORT {PORT} (HTTP/1.1, {MAX_WORKERS} workers)")
             server.serve_forever()
     except Exception as e:
         vibe_log(f"SERVER CRITICAL FAILURE: {e}")
+    finally:
+        _http_server = None
 
 def run_server_thread():
     thread = threading.Thread(target=start_server, daemon=True)
     thread.start()
     return thread
 
+def stop_server():
+    """Stops accepting and releases the port (addon reload). Open workers finish on their own."""
+    server = _http_server
+    if server is not None:
+        SERVER_STOPPING.set()
+        with PUBLISH_CONDITION:
+            PUBLISH_CONDITION.notify_all()
+        server.shutdown()
+
 def update_snapshot(bpy):
-    """Refreshes the deterministic snapshot. Called from MAIN THREAD."""
+    """Refreshes the deterministic snapshot. Called from MAIN THREAD.
+
+    Object state comes from SCENE_INDEX, which only re-reads objects the
+    depsgraph reported dirty; unchanged ticks skip hashing entirely.
+    """
     global SCENE_SNAPSHOT
     
-    h = hashlib.sha256()
-    obj_list = []
-    
     # Monotonic progression
     current_tick = SCENE_SNAPSHOT.get("monotonic_tick", 0) + 1
     engine_time = int(time.perf_counter() * 1000)
     
-    # Deterministic sort
-    objs = sorted(bpy.data.objects, key=lambda o: o.name)
-    for obj in objs:
-        uuid = obj.get("uuid", "NO_UUID")
-        obj_info = {"name": obj.name, "type": obj.type, "uuid": uuid}
-        obj_list.append(obj_info)
-        
-        # State Hashing
-        h.update(f"{obj.name}:{uuid}:{obj.location}".encode())
+    # Deterministic sort + State Hashing (incremental)
+    first = SCENE_SNAPSHOT["hash"] == "INIT"
+    if SCENE_INDEX.refresh(bpy) or first:
+        SCENE_SNAPSHOT["hash"] = SCENE_INDEX.hash
+        if SCENE_INDEX.columns is not SCENE_SNAPSHOT["listing"].columns:
+            # Indexes are rebuilt only when the listing itself changed
+            listing = ObjectListing(SCENE_INDEX.columns, current_tick)
+            LISTINGS.add(listing)
+            SCENE_SNAPSHOT["listing"] = listing
+    delta = SCENE_INDEX.take_delta()
+    if first:
+        DELTAS.reset(current_tick)
+    elif delta:
+        DELTAS.record(current_tick, delta)
 
     SCENE_SNAPSHOT.update({
-        "hash": h.hexdigest(),
-        "objects": obj_list,
-        "object_count": len(bpy.data.objects),
+        "object_count": len(SCENE_INDEX.records),
         "meshes": len(bpy.data.meshes),
         "armatures": len(bpy.data.armatures),
         "materials": len(bpy.data.materials),
@@ -180,5 +804,7 @@ def update_snapshot(bpy):
         "active_object": bpy.context.active_object.name if bpy.context and bpy.context.active_object else None,
         "timestamp": time.time(),
         "engine_time_ms": engine_time,
-        "monotonic_tick": current_tick
+        "monotonic_tick": current_tick,
+        "snapshot_stats": dict(SCENE_INDEX.stats, merkle=dict(SCENE_INDEX.merkle.stats),
+                               traits=dict(SCENE_INDEX.trait_index.stats))
     })
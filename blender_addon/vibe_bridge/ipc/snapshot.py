@@ -0,0 +1,345 @@
+import sys
+import time
+import itertools
+from array import array
+from bisect import bisect_left, insort
+from .merkle import MerkleScene, leaf_hash
+from .delta import ADDED, REMOVED, MODIFIED, merge_change
+from .listing import ObjectColumns, EMPTY_COLUMNS, type_code
+from .traits import TraitIndex, traits_of
+
+# Dirty state fed by the depsgraph/undo/load handlers (MAIN THREAD only).
+#   objects:   {pointer: name} of objects whose data changed
+#   structure: objects may have been added, removed or renamed
+#   full:      pointers are no longer trustworthy (file load, undo, redo)
+DIRTY = {
+    "objects": {},
+    "structure": False,
+    "full": True
+}
+
+# Safety net against missed notifications. On huge scenes the interval grows so
+# periodic rebuilds never take more than FULL_RESYNC_MAX_DUTY of wall time.
+FULL_RESYNC_INTERVAL = 30.0
+FULL_RESYNC_MAX_DUTY = 0.02
+
+def mark_object_dirty(pointer, name):
+    DIRTY["objects"][pointer] = name
+
+def mark_structure_dirty():
+    DIRTY["structure"] = True
+
+def mark_full_rebuild():
+    DIRTY["full"] = True
+
+# Revisions stamp every (re)read of an object and every structural change.
+# Unlike Merkle leaves they also move on edits the hash ignores (geometry,
+# weights, shape keys), so caches keyed on them never serve a stale result.
+REVISIONS = itertools.count(1)
+
+# Session ids: the identity deltas are keyed by. The uuid property can't be:
+# most objects have none and duplicates copy it from their source.
+OBJECT_IDS = itertools.count(1)
+
+def collections_of(obj):
+    collections = getattr(obj, "users_collection", ())
+    if len(collections) == 1:
+        return (collections[0].name,) # The common case: no set or sort
+    return tuple(sorted({c.name for c in collections}))
+
+# ObjectRecord.refresh() outcomes
+UNCHANGED = 0
+HASH_CHANGED = 1
+LISTING_CHANGED = 2
+TRAITS_CHANGED = 3 # Only indexed traits differ; the scene hash is unaffected
+
+class ObjectRecord:
+    """Cached per-object snapshot state; only rebuilt when the object is dirty.
+    Names and types are interned so every column and index shares one copy."""
+    __slots__ = ("id", "pointer", "name", "type", "uuid", "line", "leaf", "collections", "traits", "revision")
+
+    def __init__(self, obj):
+        self.id = next(OBJECT_IDS)
+        self.pointer = obj.as_pointer()
+        self.revision = next(REVISIONS)
+        self.name = self.type = self.uuid = self.line = self.leaf = None
+        self.collections = ()
+        self.traits = ()
+        self.refresh(obj)
+
+    def describe(self):
+        return {"id": self.id, "name": self.name, "type": self.type, "uuid": self.uuid}
+
+    def refresh(self, obj):
+        """Re-reads the object. Returns UNCHANGED, TRAITS_CHANGED (e.g. mesh edited),
+        HASH_CHANGED (e.g. moved) or LISTING_CHANGED (name, type or uuid differ)."""
+        name = sys.intern(obj.name)
+        obj_type = sys.intern(obj.type)
+        uuid = str(obj.get("uuid", "NO_UUID"))
+        line = f"{name}:{uuid}:{obj.location}".encode()
+        collections = collections_of(obj)
+        traits = traits_of(obj, obj_type)
+        if self.line == line and self.type == obj_type and self.collections == collections:
+            if self.traits == traits:
+                return UNCHANGED
+            self.traits = traits
+            return TRAITS_CHANGED
+        self.traits = traits
+        if self.line != line:
+            self.line = line
+            self.leaf = leaf_hash(line)
+        self.collections = collections
+        if self.name == name and self.type == obj_type and self.uuid == uuid:
+            return HASH_CHANGED
+        self.name = name
+        self.type = obj_type
+        self.uuid = uuid
+        return LISTING_CHANGED
+
+class SceneIndex:
+    """
+    Incrementally maintained object index behind SCENE_SNAPSHOT.
+    Keeps records in deterministic (name) order and only touches objects reported
+    dirty by the depsgraph, so ticks where nothing changed are near-free.
+    The scene hash is the root of a MerkleScene, so rehashing costs time
+    proportional to what changed.
+    """
+
+    def __init__(self):
+        self.records = {}
+        self.order = []
+        self.merkle = MerkleScene()
+        self.trait_index = TraitIndex()
+        self.hash = "INIT"
+        # Latest revision handed out; changes whenever any object may have
+        self.revision = 0
+        self.columns = EMPTY_COLUMNS
+        self.last_full = 0.0
+        self.resync_interval = FULL_RESYNC_INTERVAL
+        self._listing_dirty = True
+        # Net object changes (by id) of the current refresh, taken by take_delta()
+        self.delta = {}
+        self.stats = {"full_rebuilds": 0, "resyncs": 0, "structure_syncs": 0, "incremental": 0, "unchanged": 0, "refreshed_objects": 0}
+        self.stats["merkle"] = self.merkle.stats
+        self.stats["traits"] = self.trait_index.stats
+
+    # --- ORDER MAINTENANCE ---
+
+    def _insert(self, rec):
+        insort(self.order, (rec.name, rec.pointer))
+        self._listing_dirty = True
+
+    def _remove(self, name, pointer):
+        key = (name, pointer)
+        i = bisect_left(self.order, key)
+        if i < len(self.order) and self.order[i] == key:
+            del self.order[i]
+            self._listing_dirty = True
+
+    def _note(self, rec, kind):
+        merge_change(self.delta, rec.id, kind, rec.describe())
+
+    def take_delta(self):
+        delta, self.delta = self.delta, {}
+        return delta
+
+    def _refresh(self, rec, obj, reported=True):
+        if reported:
+            # Reported dirty: whatever refresh() can see, its data may have changed
+            rec.revision = self.revision = next(REVISIONS)
+        old_name = rec.name
+        old_collections = rec.collections
+        old_traits = rec.traits
+        outcome = rec.refresh(obj)
+        if outcome == UNCHANGED:
+            return False
+        if not reported:
+            rec.revision = self.revision = next(REVISIONS)
+        if rec.traits != old_traits or outcome == LISTING_CHANGED:
+            self.trait_index.put(rec, old_traits)
+        if outcome == TRAITS_CHANGED:
+            self.stats["refreshed_objects"] += 1
+            return False
+        self._note(rec, MODIFIED)
+        if rec.name != old_name or rec.collections != old_collections:
+            self.merkle.remove(old_name, old_collections)
+        self.merkle.put(rec.name, rec.collections, rec.leaf)
+        if outcome == LISTING_CHANGED:
+            self._listing_dirty = True
+            if rec.name != old_name:
+                self._remove(old_name, rec.pointer)
+                self._insert(rec)
+        self.stats["refreshed_objects"] += 1
+        return True
+
+    # --- REFRESH STRATEGIES ---
+
+    def rebuild(self, objects):
+        """Full rebuild (startup, file load, undo): pointers are meaningless, so
+        records are matched to the previous ones by name (unique at any one time)
+        and re-read in place. They keep their ids and Merkle leaves; only objects
+        that differ are restaged. Every object gets a new revision."""
+        previous = {rec.name: rec for rec in self.records.values()}
+        self.records = {}
+        for obj in objects:
+            rec = previous.pop(obj.name, None)
+            if rec is None:
+                rec = ObjectRecord(obj)
+                self.merkle.put(rec.name, rec.collections, rec.leaf)
+                self._note(rec, ADDED)
+            else:
+                rec.pointer = obj.as_pointer()
+                rec.revision = next(REVISIONS)
+                old_collections = rec.collections
+                if rec.refresh(obj) in (HASH_CHANGED, LISTING_CHANGED):
+                    if rec.collections != old_collections:
+                        self.merkle.remove(rec.name, old_collections)
+                    self.merkle.put(rec.name, rec.collections, rec.leaf)
+                    self._note(rec, MODIFIED)
+            self.records[rec.pointer] = rec
+        for rec in previous.values():
+            self.merkle.remove(rec.name, rec.collections)
+            self._note(rec, REMOVED)
+        self.trait_index.rebuild(self.records.values())
+        self.revision = next(REVISIONS)
+        self.order = sorted((rec.name, rec.pointer) for rec in self.records.values())
+        self._listing_dirty = True
+        self.stats["full_rebuilds"] += 1
+        self.stats["refreshed_objects"] += len(self.records)
+        return True
+
+    def _add(self, obj):
+        rec = ObjectRecord(obj)
+        self.records[rec.pointer] = rec
+        self._insert(rec)
+        self.merkle.put(rec.name, rec.collections, rec.leaf)
+        self.trait_index.put(rec)
+        self.revision = rec.revision
+        self._note(rec, ADDED)
+        self.stats["refreshed_objects"] += 1
+
+    def _drop_missing(self, seen):
+        """Removes records whose pointer is not in `seen`. Returns True if any were."""
+        missing = [p for p in self.records if p not in seen]
+        for ptr in missing:
+            rec = self.records.pop(ptr)
+            self._remove(rec.name, ptr)
+            self.merkle.remove(rec.name, rec.collections)
+            self.trait_index.discard(rec)
+            self.revision = next(REVISIONS)
+            self._note(rec, REMOVED)
+        return bool(missing)
+
+    def resync(self, objects):
+        """Periodic safety net against missed notifications: re-reads every object
+        against its record (pointers are still valid) but applies only what
+        differs, so an unchanged scene rehashes nothing and keeps its revisions."""
+        changed = False
+        seen = set()
+        for obj in objects:
+            ptr = obj.as_pointer()
+            seen.add(ptr)
+            rec = self.records.get(ptr)
+            if rec is None:
+                self._add(obj)
+                changed = True
+            else:
+                changed = self._refresh(rec, obj, reported=False) or changed
+        changed = self._drop_missing(seen) or changed
+        self.stats["resyncs"] += 1
+        return changed
+
+    def sync_structure(self, objects):
+        """Pointer/name/membership diff: picks up additions, removals, renames
+        and collection (un)links without re-reading unchanged objects."""
+        changed = False
+        seen = set()
+        for obj in objects:
+            ptr = obj.as_pointer()
+            seen.add(ptr)
+            rec = self.records.get(ptr)
+            if rec is None:
+                self._add(obj)
+                changed = True
+            elif rec.name != obj.name or rec.collections != collections_of(obj):
+                changed = self._refresh(rec, obj) or changed
+        changed = self._drop_missing(seen) or changed
+        self.stats["structure_syncs"] += 1
+        return changed
+
+    def refresh_dirty(self, objects, dirty):
+        """Re-reads only the objects reported dirty ({pointer: name at notify time})."""
+        changed = False
+        missed = set()
+        for ptr, name in dirty.items():
+            obj = objects.get(name)
+            rec = self.records.get(ptr)
+            if obj is None or obj.as_pointer() != ptr:
+                missed.add(ptr) # Renamed since the notification
+            elif rec is not None:
+                changed = self._refresh(rec, obj) or changed
+        if missed:
+            for obj in objects:
+                ptr = obj.as_pointer()
+                if ptr in missed:
+                    missed.discard(ptr)
+                    rec = self.records.get(ptr)
+                    if rec is not None:
+                        changed = self._refresh(rec, obj) or changed
+                    if not missed:
+                        break
+        self.stats["incremental"] += 1
+        return changed
+
+    def refresh(self, bpy):
+        """Applies pending dirty state. Returns True if the scene hash changed."""
+        objects = bpy.data.objects
+        now = time.monotonic()
+        dirty_objects = DIRTY["objects"]
+
+        if DIRTY["full"] or now - self.last_full >= self.resync_interval:
+            DIRTY["structure"] = False
+            dirty = dict(dirty_objects)
+            dirty_objects.clear()
+            if DIRTY["full"]:
+                DIRTY["full"] = False
+                changed = self.rebuild(objects)
+            else:
+                changed = self.resync(objects)
+                if dirty:
+                    changed = self.refresh_dirty(objects, dirty) or changed
+            self.last_full = time.monotonic()
+            self.resync_interval = max(FULL_RESYNC_INTERVAL, (self.last_full - now) / FULL_RESYNC_MAX_DUTY)
+        elif DIRTY["structure"] or len(objects) != len(self.records):
+            DIRTY["structure"] = False
+            dirty = dict(dirty_objects)
+            dirty_objects.clear()
+            changed = self.sync_structure(objects)
+            if dirty:
+                changed = self.refresh_dirty(objects, dirty) or changed
+        elif dirty_objects:
+            dirty = dict(dirty_objects)
+            dirty_objects.clear()
+            changed = self.refresh_dirty(objects, dirty)
+        else:
+            self.stats["unchanged"] += 1
+            return False
+
+        if changed:
+            self._rehash()
+        return changed
+
+    def _rehash(self):
+        self.hash = self.merkle.commit()
+        if self._listing_dirty:
+            # Moves/edits keep the listing; only membership, order or identity rebuild it
+            records = self.records
+            ordered = [records[ptr] for _, ptr in self.order]
+            self.columns = ObjectColumns(
+                [rec.name for rec in ordered],
+                array("B", [type_code(rec.type) for rec in ordered]),
+                [rec.uuid for rec in ordered]
+            )
+            self._listing_dirty = False
+
+SCENE_INDEX = SceneIndex()
@@ -0,0 +1,159 @@
+import os
+import json
+import time
+import queue
+import socket
+import threading
+from ..logging.logger import vibe_log
+from .airlock import BASE_PATH, DRAIN_BUDGET_MS, execute_command
+from ..core.scheduler import signal_work
+
+SOCKET_PATH = os.path.join(BASE_PATH, 'vibe_queue', 'vibe_bridge.sock')
+MAX_LINE_BYTES = 4 * 1024 * 1024
+
+# Commands handed from connection threads to the main thread: (data, reply_queue)
+COMMAND_QUEUE = queue.Queue()
+
+# Socket command ids withdrawn by a cancel frame before they were drained: {id: time}
+CANCELLED = {}
+CANCEL_TTL = 300.0
+
+SOCKET_STATS = {
+    "connections": 0,
+    "received": 0,
+    "drained": 0,
+    "last_drained": 0,
+    "cancelled": 0,
+    "used_ms": 0.0
+}
+
+_listener = None
+
+def _reply_writer(conn, replies):
+    """Streams results back on the connection in completion order."""
+    while True:
+        result = replies.get()
+        if result is None:
+            return
+        try:
+            conn.sendall((json.dumps(result) + "\n").encode())
+        except OSError:
+            return
+
+def _handle_connection(conn):
+    """Reads newline-delimited JSON commands and queues them for the main thread."""
+    replies = queue.Queue()
+    writer = threading.Thread(target=_reply_writer, args=(conn, replies), daemon=True)
+    writer.start()
+    SOCKET_STATS["connections"] += 1
+    buf = b""
+    try:
+        while True:
+            chunk = conn.recv(65536)
+            if not chunk:
+                break
+            buf += chunk
+            if len(buf) > MAX_LINE_BYTES and b"\n" not in buf:
+                vibe_log("SOCKET TRANSPORT: oversized frame, dropping connection")
+                break
+            while b"\n" in buf:
+                line, buf = buf.split(b"\n", 1)
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                except ValueError as e:
+                    replies.put({"status": "ERROR", "message": f"Malformed frame: {e}"})
+                    continue
+                if data.get("type") == "cancel":
+                    # Control frame: handled here, never queued behind real work
+                    CANCELLED[data.get("target")] = time.time()
+                    replies.put({"id": data.get("id"), "status": "CANCEL_REQUESTED", "target": data.get("target")})
+                    continue
+                SOCKET_STATS["received"] += 1
+                COMMAND_QUEUE.put((data, replies))
+                signal_work()
+    except OSError as e:
+        vibe_log(f"SOCKET TRANSPORT: connection error: {e}")
+    finally:
+        SOCKET_STATS["connections"] -= 1
+        replies.put(None)
+        writer.join(timeout=1.0)
+        conn.close()
+
+def _accept_loop(server):
+    while True:
+        try:
+            conn, _ = server.accept()
+        except OSError:
+            # Listener closed by stop_socket_server()
+            return
+        threading.Thread(target=_handle_connection, args=(conn,), daemon=True).start()
+
+def start_socket_server():
+    """Binds the Unix-domain mutation socket and starts accepting. Returns the listener."""
+    global _listener
+    if _listener is not None or not hasattr(socket, "AF_UNIX"):
+        return _listener
+    try:
+        os.makedirs(os.path.dirname(SOCKET_PATH), exist_ok=True)
+        if os.path.exists(SOCKET_PATH):
+            os.remove(SOCKET_PATH) # Stale socket from a crashed session
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(SOCKET_PATH)
+        os.chmod(SOCKET_PATH, 0o600)
+        server.listen(16)
+    except OSError as e:
+        vibe_log(f"SOCKET TRANSPORT UNAVAILABLE (file airlock only): {e}")
+        return None
+    _listener = server
+    threading.Thread(target=_accept_loop, args=(server,), daemon=True).start()
+    vibe_log(f"SOCKET TRANSPORT LISTENING ON {SOCKET_PATH}")
+    return server
+
+def stop_socket_server():
+    global _listener
+    if _listener is None:
+        return
+    try:
+        _listener.close()
+    finally:
+        _listener = None
+        if os.path.exists(SOCKET_PATH):
+            os.remove(SOCKET_PATH)
+
+def drain_socket_queue(budget_ms=None):
+    """Executes queued socket commands on the MAIN THREAD within the tick budget.
+
+    Returns the number of commands still waiting.
+    """
+    budget_ms = DRAIN_BUDGET_MS if budget_ms is None else budget_ms
+    start = time.perf_counter()
+    drained = 0
+    while True:
+        try:
+            data, replies = COMMAND_QUEUE.get_nowait()
+        except queue.Empty:
+            break
+        if CANCELLED.pop(data.get("id"), None) is not None:
+            SOCKET_STATS["cancelled"] += 1
+            vibe_log(f"CANCELLED: skipped socket command {data.get('id')}")
+            result = {"status": "CANCELLED"}
+        else:
+            result = execute_command(data, source="socket")
+        if "id" in data:
+            result["id"] = data["id"]
+        replies.put(result)
+        drained += 1
+        if (time.perf_counter() - start) * 1000.0 >= budget_ms:
+            break
+    if CANCELLED:
+        # Cancels that arrived after their command already ran
+        cutoff = time.time() - CANCEL_TTL
+        for cmd_id, cancelled_at in list(CANCELLED.items()):
+            if cancelled_at < cutoff:
+                CANCELLED.pop(cmd_id, None)
+    SOCKET_STATS["drained"] += drained
+    SOCKET_STATS["last_drained"] = drained
+    SOCKET_STATS["used_ms"] = round((time.perf_counter() - start) * 1000.0, 3)
+    return COMMAND_QUEUE.qsize()
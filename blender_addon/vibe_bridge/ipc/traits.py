@@ -0,0 +1,102 @@
+import sys
+import threading
+
+# Physical traits indexed per object, as (trait, value) pairs:
+#   type:         object type ("MESH", "LIGHT", ...)
+#   vertex_count: mesh vertex count (meshes only)
+#   material:     one pair per distinct material in the object's slots
+TRAIT_NAMES = ("type", "vertex_count", "material")
+
+def traits_of(obj, obj_type=None):
+    """The indexable traits of `obj`. Cheap: no per-vertex access.
+    Callers that already read (and interned) obj.type pass it in."""
+    obj_type = obj_type or sys.intern(obj.type)
+    traits = [("type", obj_type)]
+    if obj_type == "MESH":
+        vertices = getattr(getattr(obj, "data", None), "vertices", None)
+        if vertices is not None:
+            traits.append(("vertex_count", len(vertices)))
+    slots = getattr(obj, "material_slots", None)
+    if slots:
+        materials = {slot.material.name for slot in slots if slot.material}
+        traits.extend(("material", sys.intern(name)) for name in sorted(materials))
+    return tuple(traits)
+
+class TraitIndex:
+    """
+    Inverted indexes (trait, value) -> object pointers, kept in step with
+    SceneIndex records on the MAIN THREAD and queried from HTTP threads.
+    A lookup intersects posting sets smallest-first, so it costs
+    O(objects carrying the rarest requested trait) instead of a scene scan.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        # pointer -> (name, type, uuid): current identity, so matches survive renames
+        self.members = {}
+        self.stats = {"postings": 0, "queries": 0, "updates": 0}
+        self._lock = threading.Lock()
+
+    def rebuild(self, records):
+        """Replaces every index from `records` (full rebuild); built off-lock, swapped in."""
+        postings = {}
+        members = {}
+        for rec in records:
+            members[rec.pointer] = (rec.name, rec.type, rec.uuid)
+            for trait in rec.traits:
+                pointers = postings.get(trait)
+                if pointers is None:
+                    pointers = postings[trait] = set()
+                pointers.add(rec.pointer)
+        with self._lock:
+            self.postings = postings
+            self.members = members
+            self.stats["postings"] = len(postings)
+
+    def put(self, rec, old_traits=()):
+        """Adds `rec`, or moves it from `old_traits` to its current traits."""
+        pointer = rec.pointer
+        with self._lock:
+            for trait in old_traits:
+                if trait not in rec.traits:
+                    self._unlink(trait, pointer)
+            for trait in rec.traits:
+                if trait not in old_traits:
+                    pointers = self.postings.get(trait)
+                    if pointers is None:
+                        pointers = self.postings[trait] = set()
+                    pointers.add(pointer)
+            self.members[pointer] = (rec.name, rec.type, rec.uuid)
+            self.stats["postings"] = len(self.postings)
+            self.stats["updates"] += 1
+
+    def discard(self, rec):
+        with self._lock:
+            for trait in rec.traits:
+                self._unlink(trait, rec.pointer)
+            self.members.pop(rec.pointer, None)
+            self.stats["postings"] = len(self.postings)
+
+    def _unlink(self, trait, pointer):
+        pointers = self.postings.get(trait)
+        if pointers is not None:
+            pointers.discard(pointer)
+            if not pointers:
+                del self.postings[trait]
+
+    def find(self, criteria, limit):
+        """Objects carrying every (trait, value) in `criteria`, name-ordered.
+        Returns (first `limit` matches as dicts, total matches)."""
+        with self._lock:
+            self.stats["queries"] += 1
+            sets = []
+            for trait in criteria:
+                pointers = self.postings.get(trait)
+                if not pointers:
+                    return [], 0
+                sets.append(pointers)
+            sets.sort(key=len)
+            first, rest = sets[0], sets[1:]
+            matches = [self.members[p] for p in first if all(p in s for s in rest)]
+        matches.sort()
+        return [{"name": name, "type": obj_type, "uuid": uuid} for name, obj_type, uuid in matches[:limit]], len(matches)
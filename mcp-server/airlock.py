@@ -0,0 +1,167 @@
+# BlenderVibeBridge: Dual-License & Maintenance Agreement (v1.2)
+# Copyright (C) 2026 B-A-M-N (The "Author")
+#
+# This software is distributed under a Dual-Licensing Model:
+# 1. THE OPEN-SOURCE PATH: GNU AGPLv3 (see LICENSE for details)
+# 2. THE COMMERCIAL PATH: "WORK-OR-PAY" MODEL
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+
+# fsync payloads before publishing them. Off by default: the airlock only needs
+# readers to never observe partial files, which the rename alone guarantees.
+AIRLOCK_FSYNC = False
+
+def atomic_write_json(path, data, fsync=None):
+    """Writes JSON to a hidden temp file in the same directory, then os.replace()s it
+    into place so readers only ever see complete files."""
+    fsync = AIRLOCK_FSYNC if fsync is None else fsync
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, f".{name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if fsync:
+        dir_fd = os.open(directory or ".", os.O_RDONLY)
+        try: os.fsync(dir_fd)
+        finally: os.close(dir_fd)
+
+SEQ_WIDTH = 20
+
+class SequencedInbox:
+    """
+    Assigns monotonic sequence numbers to airlock commands and publishes them as
+    '<seq>.json' so the addon can dequeue in submission order without listing
+    the inbox. The last issued number is kept in a state file next to the inbox,
+    so a restarted MCP server continues exactly where the previous one stopped
+    and the addon's cursor never sees a gap it would have to wait out.
+    """
+
+    ISSUED_HISTORY = 4096
+
+    def __init__(self, inbox_path, state_path=None):
+        self.inbox_path = inbox_path
+        self.state_path = state_path or os.path.join(os.path.dirname(inbox_path.rstrip(os.sep)), "inbox.seq")
+        self._lock = threading.Lock()
+        self._next = None
+        self._issued = OrderedDict()
+
+    @staticmethod
+    def file_name(seq):
+        return f"{seq:0{SEQ_WIDTH}d}.json"
+
+    def _load(self):
+        last_issued = 0
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+            # high_water: lease ceiling written by older versions (one gap, then exact)
+            last_issued = int(state.get("last_issued", state.get("high_water", 0)))
+        except (OSError, ValueError, AttributeError, TypeError):
+            pass
+        self._next = last_issued + 1
+
+    def enqueue(self, payload):
+        """Stamps `payload` with the next sequence number and publishes it. Returns the seq.
+
+        Allocation and publication happen under one lock, so files appear in
+        sequence order and the addon never sees a transient gap from this process.
+        """
+        with self._lock:
+            os.makedirs(self.inbox_path, exist_ok=True)
+            if self._next is None:
+                self._load()
+            seq = self._next
+            # Recorded before publishing: a crash in between costs the addon one
+            # gap wait after restart, never a reused number
+            atomic_write_json(self.state_path, {"last_issued": seq})
+            self._next += 1
+            payload["seq"] = seq
+            atomic_write_json(os.path.join(self.inbox_path, self.file_name(seq)), payload)
+            if "id" in payload:
+                self._issued[payload["id"]] = seq
+                while len(self._issued) > self.ISSUED_HISTORY:
+                    self._issued.popitem(last=False)
+            return seq
+
+    def cancel(self, cmd_id):
+        """Withdraws a command Blender has not claimed yet. Returns True if it was removed.
+
+        The addon claims a command by renaming it, so removal and claim cannot both win.
+        """
+        with self._lock:
+            seq = self._issued.pop(cmd_id, None)
+        if seq is None:
+            return False
+        try:
+            os.remove(os.path.join(self.inbox_path, self.file_name(seq)))
+            return True
+        except FileNotFoundError:
+            return False
+
+class OutboxSweeper:
+    """
+    TTL garbage collector for the outbox. Purges `res_*.json` results nobody is
+    waiting for (abandoned after a timeout or cancel) and stale temp files, so
+    directory scans stay small.
+    """
+
+    def __init__(self, outbox_path, waiter, ttl=300.0, interval=60.0):
+        self.outbox_path = outbox_path
+        self.waiter = waiter
+        self.ttl = ttl
+        self.interval = interval
+        self.purged = 0
+        self._thread = None
+
+    def sweep(self, now=None):
+        """Removes orphaned results older than the TTL. Returns how many were purged."""
+        now = time.time() if now is None else now
+        purged = 0
+        try:
+            entries = list(os.scandir(self.outbox_path))
+        except OSError:
+            return 0
+        for entry in entries:
+            name = entry.name
+            is_result = name.startswith("res_") and name.endswith(".json")
+            is_temp = name.startswith(".") and name.endswith(".tmp")
+            if not (is_result or is_temp):
+                continue
+            if is_result and self.waiter.is_pending(name):
+                continue
+            try:
+                if now - entry.stat().st_mtime < self.ttl:
+                    continue
+                os.remove(entry.path)
+                purged += 1
+            except OSError:
+                continue
+        self.purged += purged
+        return purged
+
+    def start(self):
+        if self._thread is not None:
+            return
+        def _loop():
+            while True:
+                self.sweep()
+                time.sleep(self.interval)
+        self._thread = threading.Thread(target=_loop, name="vibe-outbox-sweeper", daemon=True)
+        self._thread.start()
@@ -0,0 +1,186 @@
+# BlenderVibeBridge: Dual-License & Maintenance Agreement (v1.2)
+# Copyright (C) 2026 B-A-M-N (The "Author")
+#
+# This software is distributed under a Dual-Licensing Model:
+# 1. THE OPEN-SOURCE PATH: GNU AGPLv3 (see LICENSE for details)
+# 2. THE COMMERCIAL PATH: "WORK-OR-PAY" MODEL
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+
+import time
+import random
+import threading
+from collections import deque, OrderedDict
+import requests
+from requests.adapters import HTTPAdapter
+
+# Latency samples kept per endpoint for percentiles
+LATENCY_WINDOW = 256
+
+# gzip/deflate are advertised and decoded by requests itself
+ACCEPT = "application/json"
+
+# Replies worth retrying a GET on (503: invariance server at its connection cap)
+RETRY_STATUSES = {502, 503, 504}
+
+# Conditional GETs: bodies kept per path (with query) for replay on 304
+ETAG_CACHE_SIZE = 128
+ETAG_CACHE_MAX_BODY = 1 << 20
+
+class CachedBody:
+    __slots__ = ("etag", "content_type", "content")
+
+    def __init__(self, etag, content_type, content):
+        self.etag = etag
+        self.content_type = content_type
+        self.content = content
+
+class EndpointStats:
+    __slots__ = ("count", "errors", "retries", "not_modified", "total_ms", "max_ms", "wire_bytes", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.not_modified = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.wire_bytes = 0
+        self.samples = deque(maxlen=LATENCY_WINDOW)
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        def pct(p):
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 3) if ordered else 0.0
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "retries": self.retries,
+            "not_modified": self.not_modified,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "max_ms": round(self.max_ms, 3),
+            "wire_bytes": self.wire_bytes
+        }
+
+class BlenderClient:
+    """
+    Keep-alive HTTP client for the invariance server.
+    One requests.Session with a bounded connection pool is shared by every tool,
+    so bursts of reads reuse warm connections. Only GETs (idempotent) are retried,
+    with jittered exponential backoff, and only on connection failures or busy
+    replies; read timeouts are never retried. Latency is recorded per endpoint.
+    GETs are conditional: the last body of each path is kept with its ETag and
+    replayed when the server answers 304 Not Modified.
+    """
+
+    def __init__(self, base_url, headers=None, pool_size=8, retries=2, backoff=0.05, timeout=10):
+        self.base_url = base_url
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({"Accept": ACCEPT})
+        self.session.headers.update(headers or {})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self._stats = {}
+        self._etags = OrderedDict()
+        self._lock = threading.Lock()
+
+    def request(self, method, path, json=None, timeout=None):
+        """Returns the requests.Response; raises requests.RequestException on failure.
+        A 304 reply comes back as the cached 200 it confirmed."""
+        endpoint = path.split("?", 1)[0]
+        is_get = method.upper() == "GET"
+        attempts = 1 + (self.retries if is_get else 0)
+        cached = self._cached(path) if is_get else None
+        headers = {"If-None-Match": cached.etag} if cached else None
+        start = time.perf_counter()
+        retried = 0
+        try:
+            for attempt in range(attempts):
+                last = attempt == attempts - 1
+                try:
+                    resp = self.session.request(method, f"{self.base_url}{path}", json=json, headers=headers,
+                                                timeout=timeout or self.timeout)
+                except (requests.ConnectionError, requests.exceptions.ChunkedEncodingError):
+                    # ReadTimeout is not a ConnectionError here: a hung Blender is not retried
+                    if last:
+                        raise
+                else:
+                    if resp.status_code not in RETRY_STATUSES or last:
+                        not_modified = resp.status_code == 304 and cached is not None
+                        if not_modified:
+                            self._replay(resp, cached)
+                        elif is_get and resp.status_code == 200:
+                            self._remember(path, resp)
+                        self._record(endpoint, start, retried, error=resp.status_code >= 400,
+                                     wire_bytes=int(resp.headers.get("Content-Length") or 0),
+                                     not_modified=not_modified)
+                        return resp
+                    resp.close() # Hand the connection back to the pool before retrying
+                retried += 1
+                time.sleep(random.uniform(0, self.backoff * (2 ** attempt)))
+        except requests.RequestException:
+            self._record(endpoint, start, retried, error=True)
+            raise
+
+    # --- CONDITIONAL GET CACHE ---
+
+    def _cached(self, path):
+        with self._lock:
+            cached = self._etags.get(path)
+            if cached is not None:
+                self._etags.move_to_end(path)
+            return cached
+
+    def _remember(self, path, resp):
+        etag = resp.headers.get("ETag")
+        if not etag or len(resp.content) > ETAG_CACHE_MAX_BODY:
+            with self._lock:
+                self._etags.pop(path, None)
+            return
+        cached = CachedBody(etag, resp.headers.get("Content-Type", ""), resp.content)
+        with self._lock:
+            self._etags[path] = cached
+            self._etags.move_to_end(path)
+            if len(self._etags) > ETAG_CACHE_SIZE:
+                self._etags.popitem(last=False)
+
+    @staticmethod
+    def _replay(resp, cached):
+        """Turns a 304 into the 200 it confirmed, with the cached (decoded) body."""
+        resp.status_code = 200
+        resp.reason = "OK"
+        resp._content = cached.content
+        resp.headers["Content-Type"] = cached.content_type
+        resp.from_cache = True
+
+    def _record(self, endpoint, start, retried, error, wire_bytes=0, not_modified=False):
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = self._stats[endpoint] = EndpointStats()
+            stats.count += 1
+            stats.errors += int(error)
+            stats.retries += retried
+            stats.not_modified += int(not_modified)
+            stats.wire_bytes += wire_bytes
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.samples.append(elapsed_ms)
+
+    def stats(self):
+        with self._lock:
+            return {endpoint: stats.summary() for endpoint, stats in sorted(self._stats.items())}
+
+    def close(self):
+        self.session.close()
+        with self._lock:
+            self._etags.clear()
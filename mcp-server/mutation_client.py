@@ -0,0 +1,217 @@
+# BlenderVibeBridge: Dual-License & Maintenance Agreement (v1.2)
+# Copyright (C) 2026 B-A-M-N (The "Author")
+#
+# This software is distributed under a Dual-Licensing Model:
+# 1. THE OPEN-SOURCE PATH: GNU AGPLv3 (see LICENSE for details)
+# 2. THE COMMERCIAL PATH: "WORK-OR-PAY" MODEL
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+
+import os
+import json
+import time
+import socket
+import asyncio
+
+class AsyncMutationClient:
+    """
+    Pipelined asyncio client for Blender mutations.
+    Many commands can be in flight at once (bounded by `max_in_flight`); each is
+    correlated by its `id` and its future resolves whenever the result arrives,
+    in any order. Uses the Unix socket when Blender is listening, the file
+    airlock otherwise.
+    """
+
+    def __init__(self, socket_path, inbox, outbox_path, waiter, max_in_flight=8):
+        self.socket_path = socket_path
+        self.inbox = inbox
+        self.outbox_path = outbox_path
+        self.waiter = waiter
+        self.max_in_flight = max_in_flight
+        self._pending = {}
+        self._submitted = {}
+        self._on_socket = set()
+        self._slots = None
+        self._conn_lock = None
+        self._reader = None
+        self._writer = None
+        self._read_task = None
+
+    def describe_in_flight(self):
+        """Ids, types, transports and ages of commands still awaiting a result."""
+        now = time.time()
+        return [
+            {
+                "id": cmd_id,
+                "type": kind,
+                "transport": "socket" if cmd_id in self._on_socket else "airlock",
+                "age_seconds": round(now - submitted_at, 3)
+            }
+            for cmd_id, (kind, submitted_at) in self._submitted.items()
+        ]
+
+    def _ensure_primitives(self):
+        # Created lazily so they bind to the running loop, not the import-time one
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+            self._conn_lock = asyncio.Lock()
+
+    # --- SOCKET TRANSPORT ---
+
+    async def _ensure_socket(self):
+        if self._writer is not None and not self._writer.is_closing():
+            return True
+        if not hasattr(socket, "AF_UNIX") or not os.path.exists(self.socket_path):
+            return False
+        async with self._conn_lock:
+            if self._writer is not None and not self._writer.is_closing():
+                return True
+            try:
+                self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+            except OSError:
+                self._reader = self._writer = None
+                return False
+            self._read_task = asyncio.get_running_loop().create_task(self._read_loop(self._reader))
+        return True
+
+    async def _read_loop(self, reader):
+        """Resolves pending futures as results stream back, in completion order."""
+        error = ConnectionError("Blender closed the mutation socket")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    result = json.loads(line)
+                except ValueError:
+                    continue
+                future = self._pending.get(result.get("id"))
+                if future is not None and not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            error = e
+        finally:
+            self._writer = None
+            # Commands that were sent may have executed; fail them rather than replay
+            for cmd_id, future in list(self._pending.items()):
+                if cmd_id in self._on_socket and not future.done():
+                    future.set_exception(error)
+
+    # --- FILE AIRLOCK TRANSPORT ---
+
+    def _read_outbox(self, cmd_id):
+        outbox_file = os.path.join(self.outbox_path, f"res_{cmd_id}.json")
+        with open(outbox_file, "r") as f:
+            result = json.load(f)
+        os.remove(outbox_file)
+        return result
+
+    async def _submit_airlock(self, payload, future):
+        loop = asyncio.get_running_loop()
+        cmd_id = payload["id"]
+
+        def on_ready():
+            loop.call_soon_threadsafe(_resolve_from_outbox)
+
+        def _resolve_from_outbox():
+            if future.done():
+                return
+            try:
+                future.set_result(self._read_outbox(cmd_id))
+            except Exception as e:
+                future.set_exception(e)
+
+        self.waiter.register(cmd_id, callback=on_ready)
+        # enqueue writes and renames two files (sequence state, then the command),
+        # so it runs off the event loop; SequencedInbox's lock keeps seqs ordered
+        try:
+            await asyncio.to_thread(self.inbox.enqueue, payload)
+        except Exception:
+            self.waiter.discard(cmd_id)
+            raise
+
+    # --- PUBLIC API ---
+
+    async def submit(self, payload, timeout=None):
+        """Dispatches one command and returns a future for its result.
+
+        Waits only for an in-flight slot, never for Blender. With `timeout`, the
+        command carries an absolute (wall-clock) deadline stamped once it has a
+        slot, when the caller's wait starts, so Blender skips it exactly when
+        the caller gives up and never while it is still queued here.
+        """
+        self._ensure_primitives()
+        await self._slots.acquire()
+        if timeout is not None:
+            payload["deadline"] = time.time() + timeout
+        loop = asyncio.get_running_loop()
+        cmd_id = payload["id"]
+        future = loop.create_future()
+        self._pending[cmd_id] = future
+        self._submitted[cmd_id] = (payload.get("type"), time.time())
+
+        def _release(_):
+            self._pending.pop(cmd_id, None)
+            self._submitted.pop(cmd_id, None)
+            self._on_socket.discard(cmd_id)
+            self.waiter.discard(cmd_id)
+            self._slots.release()
+        future.add_done_callback(_release)
+
+        try:
+            if await self._ensure_socket():
+                try:
+                    self._on_socket.add(cmd_id)
+                    self._writer.write((json.dumps(payload) + "\n").encode())
+                    await self._writer.drain()
+                    return future
+                except (OSError, AttributeError):
+                    # Frame never left this process; the airlock is safe to use
+                    self._on_socket.discard(cmd_id)
+                    self._writer = None
+            await self._submit_airlock(payload, future)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        return future
+
+    async def cancel(self, cmd_id):
+        """Withdraws a command that has not started executing.
+
+        Airlock commands are removed from the inbox and resolve as CANCELLED here.
+        Socket commands get a cancel frame; Blender answers the original command
+        with CANCELLED if it had not been drained yet. Returns what was done.
+        """
+        future = self._pending.get(cmd_id)
+        if cmd_id in self._on_socket:
+            if self._writer is None:
+                return "NOT_CANCELLABLE"
+            try:
+                frame = {"type": "cancel", "target": cmd_id, "id": f"cancel-{cmd_id}"}
+                self._writer.write((json.dumps(frame) + "\n").encode())
+                await self._writer.drain()
+            except (OSError, AttributeError):
+                return "NOT_CANCELLABLE"
+            return "CANCEL_REQUESTED"
+        if self.inbox.cancel(cmd_id):
+            if future is not None and not future.done():
+                future.set_result({"status": "CANCELLED", "id": cmd_id})
+            return "CANCELLED"
+        return "NOT_FOUND" if future is None else "ALREADY_STARTED"
+
+    async def request(self, payload, timeout):
+        """Submits one command and awaits its result. Raises asyncio.TimeoutError."""
+        future = await self.submit(payload, timeout)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            # Abandoned work must not run late on Blender's main thread
+            await self.cancel(payload["id"])
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
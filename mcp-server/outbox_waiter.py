@@ -0,0 +1,185 @@
+# BlenderVibeBridge: Dual-License & Maintenance Agreement (v1.2)
+# Copyright (C) 2026 B-A-M-N (The "Author")
+#
+# This software is distributed under a Dual-Licensing Model:
+# 1. THE OPEN-SOURCE PATH: GNU AGPLv3 (see LICENSE for details)
+# 2. THE COMMERCIAL PATH: "WORK-OR-PAY" MODEL
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+
+import os
+import sys
+import struct
+import threading
+import ctypes
+import ctypes.util
+
+# --- INOTIFY CONSTANTS (linux/inotify.h) ---
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+def _load_inotify():
+    """Returns libc if it exposes inotify, otherwise None (non-Linux / stripped libc)."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+class _CallbackEvent(threading.Event):
+    """Event that also fires a callback the first time it is set."""
+
+    def __init__(self, callback):
+        super().__init__()
+        self._callback = callback
+
+    def set(self):
+        if not self.is_set():
+            super().set()
+            self._callback()
+
+class OutboxWaiter:
+    """
+    Wakes blocked callers the moment their `res_<id>.json` lands in the outbox.
+    A single watcher thread serves every in-flight command: inotify on Linux,
+    a shared directory scan as the portable fallback.
+    """
+
+    def __init__(self, outbox_path, fallback_interval=0.005):
+        self.outbox_path = outbox_path
+        self.fallback_interval = fallback_interval
+        self.backend = None
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def result_name(cmd_id):
+        return f"res_{cmd_id}.json"
+
+    def start(self):
+        """Starts the watcher thread once. Safe to call repeatedly."""
+        with self._lock:
+            if self._thread is not None:
+                return self.backend
+            os.makedirs(self.outbox_path, exist_ok=True)
+            fd = self._open_inotify()
+            if fd is not None:
+                self.backend = "inotify"
+                target = self._inotify_loop
+                args = (fd,)
+            else:
+                self.backend = "scan"
+                target = self._scan_loop
+                args = ()
+            self._thread = threading.Thread(target=target, args=args, name="vibe-outbox-waiter", daemon=True)
+            self._thread.start()
+            return self.backend
+
+    def register(self, cmd_id, callback=None):
+        """Registers interest in a result. Call BEFORE the command is written to the inbox.
+
+        `callback` (optional) is invoked once from the watcher thread when the result
+        lands, which lets asyncio callers resolve futures without parking a thread.
+        """
+        self.start()
+        event = _CallbackEvent(callback) if callback else threading.Event()
+        with self._lock:
+            self._pending[self.result_name(cmd_id)] = event
+        self._wakeup.set()
+        if callback and os.path.exists(os.path.join(self.outbox_path, self.result_name(cmd_id))):
+            self._notify(self.result_name(cmd_id))
+        return event
+
+    def discard(self, cmd_id):
+        with self._lock:
+            self._pending.pop(self.result_name(cmd_id), None)
+
+    def is_pending(self, name):
+        """True if some caller is still waiting on the result file `name`."""
+        with self._lock:
+            return name in self._pending
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    # --- BACKENDS ---
+
+    def _notify(self, name):
+        with self._lock:
+            event = self._pending.get(name)
+            if isinstance(event, _CallbackEvent):
+                # Callback waiters are one-shot; nobody calls wait() to discard them
+                del self._pending[name]
+        if event is not None:
+            event.set()
+
+    def _notify_existing(self):
+        """Resolves every waiter whose result file is already on disk."""
+        with self._lock:
+            if not self._pending:
+                return
+            names = list(self._pending)
+        try:
+            present = set(os.listdir(self.outbox_path))
+        except OSError:
+            return
+        for name in names:
+            if name in present:
+                self._notify(name)
+
+    def _open_inotify(self):
+        libc = _load_inotify()
+        if libc is None:
+            return None
+        fd = libc.inotify_init1(IN_CLOEXEC)
+        if fd < 0:
+            return None
+        wd = libc.inotify_add_watch(fd, self.outbox_path.encode(), IN_CLOSE_WRITE | IN_MOVED_TO)
+        if wd < 0:
+            os.close(fd)
+            return None
+        return fd
+
+    def _inotify_loop(self, fd):
+        while True:
+            try:
+                buf = os.read(fd, 65536)
+            except InterruptedError:
+                continue
+            except OSError:
+                # Watch is gone (outbox removed); degrade to scanning rather than hang callers
+                self.backend = "scan"
+                self._scan_loop()
+                return
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(buf):
+                _wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buf, offset)
+                offset += _EVENT_HEADER.size
+                name = buf[offset:offset + length].rstrip(b"\0").decode(errors="ignore")
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    self._notify_existing()
+                elif name:
+                    self._notify(name)
+
+    def _scan_loop(self):
+        while True:
+            # Sleep until someone is waiting; then scan at a tight shared cadence
+            if self.pending_count() == 0:
+                self._wakeup.wait()
+            self._wakeup.clear()
+            self._notify_existing()
+            self._wakeup.wait(self.fallback_interval)
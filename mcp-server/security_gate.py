@@ -14,7 +14,7 @@ import ast
 import sys
 import os
 import hashlib
-import json
+from trust_store import TrustedSignatureStore
 
 class SecurityGate:
     """
@@ -22,44 +22,31 @@ class SecurityGate:
     """
     
     TRUSTED_FILE = "trusted_signatures.json"
+    _trust_store = None
 
     @classmethod
     def _get_content_hash(cls, content):
         """Generates a stable SHA-256 hash for code content."""
         return hashlib.sha256(content.strip().encode('utf-8')).hexdigest()
 
+    @classmethod
+    def _store(cls):
+        """The process-resident whitelist (recreated if TRUSTED_FILE is repointed)."""
+        store = cls._trust_store
+        if store is None or store.path != cls.TRUSTED_FILE:
+            store = cls._trust_store = TrustedSignatureStore(cls.TRUSTED_FILE)
+        return store
+
     @classmethod
     def is_trusted(cls, content):
-        """Checks if this exact code block has been previously approved."""
-        if not os.path.exists(cls.TRUSTED_FILE):
-            return False
-        
-        content_hash = cls._get_content_hash(content)
-        try:
-            with open(cls.TRUSTED_FILE, "r") as f:
-                trusted = json.load(f)
-                return content_hash in trusted
-        except:
-            return False
+        """Checks if this exact code block has been previously approved.
+        An in-memory set lookup; the files are only re-read when they change."""
+        return cls._store().contains(cls._get_content_hash(content))
 
     @classmethod
     def trust_content(cls, content, reason="User Approved"):
-        """Adds a content hash to the persistent whitelist."""
-        content_hash = cls._get_content_hash(content)
-        trusted = {}
-        if os.path.exists(cls.TRUSTED_FILE):
-            try:
-                with open(cls.TRUSTED_FILE, "r") as f:
-                    trusted = json.load(f)
-            except: pass
-        
-        trusted[content_hash] = {
-            "timestamp": __import__("datetime").datetime.now().isoformat(),
-            "reason": reason
-        }
-        
-        with open(cls.TRUSTED_FILE, "w") as f:
-            json.dump(trusted, f, indent=2)
+        """Adds a content hash to the persistent whitelist (one journal append)."""
+        cls._store().add(cls._get_content_hash(content), reason)
         return True
 
     PYTHON_FORBIDDEN_MODULES = {
@@ -11,16 +11,22 @@
 # GNU Affero General Public License for more details.
 
 import sys
-import requests
 import base64
 import os
 import time
 import datetime
 import json
 import logging
+import socket
+import asyncio
+from urllib.parse import urlencode
 from mcp.server.fastmcp import FastMCP
 from mcp.types import ImageContent
 from security_gate import SecurityGate
+from outbox_waiter import OutboxWaiter
+from airlock import SequencedInbox, OutboxSweeper
+from mutation_client import AsyncMutationClient
+from blender_client import BlenderClient
 
 # --- LOGGING ---
 logging.basicConfig(
@@ -37,6 +43,8 @@ logger = logging.getLogger("MCPServer")
 mcp = FastMCP("BlenderVibeBridge")
 BLENDER_API_URL = "http://127.0.0.1:22000"
 VIBE_TOKEN = "VIBE_777_SECURE"
+# Shared keep-alive pool for every read against the invariance server
+BLENDER_CLIENT = BlenderClient(BLENDER_API_URL, headers={"X-Vibe-Token": VIBE_TOKEN, "Content-Type": "application/json"})
 SESSION_ID = None
 AUDIT_LOG_PATH = "/home/bamn/BlenderVibeBridge/logs/vibe_audit.jsonl"
 ENTROPY_BUDGET = 100
@@ -112,10 +120,15 @@ limiter = RateLimiter()
 
 INBOX_PATH = "/home/bamn/BlenderVibeBridge/vibe_queue/inbox"
 OUTBOX_PATH = "/home/bamn/BlenderVibeBridge/vibe_queue/outbox"
-
-def blender_request(method, path, data=None, is_mutation=False):
-    global SESSION_ID
-    
+SOCKET_PATH = "/home/bamn/BlenderVibeBridge/vibe_queue/vibe_bridge.sock"
+MUTATION_TIMEOUT = 60
+OUTBOX_WAITER = OutboxWaiter(OUTBOX_PATH)
+INBOX = SequencedInbox(INBOX_PATH)
+OUTBOX_SWEEPER = OutboxSweeper(OUTBOX_PATH, OUTBOX_WAITER, ttl=5 * MUTATION_TIMEOUT)
+MUTATION_CLIENT = AsyncMutationClient(SOCKET_PATH, INBOX, OUTBOX_PATH, OUTBOX_WAITER, max_in_flight=8)
+
+def _admit_request(method, path, data, is_mutation):
+    """Rate limit, panic mode and script audit. Returns an error dict, or None if admitted."""
     if not limiter.check():
         return {"error": "Rate limit exceeded. Max 5 req/s."}
 
@@ -130,66 +143,45 @@ def blender_request(method, path, data=None, is_mutation=False):
         logger.warning(f"BLOCKED: {reason}")
         return {"error": reason}
 
-    # Security Audit for Scripts
-    if data and data.get("type") == "exec_script":
-        script = data.get("script")
-        if script:
-            violations = SecurityGate.check_python(script)
-            if violations:
-                logger.warning(f"SECURITY_VIOLATION blocked script: {violations}")
-                monitor.report_violation(f"Script Violation: {violations[0]}")
-                return {"error": f"Security Violation: {violations[0]}"}
-
-    # --- HYBRID DISPATCH ---
-    if is_mutation:
-        import uuid
-        cmd_id = str(uuid.uuid4())
-        payload = data or {}
-        payload["id"] = cmd_id
-        if SESSION_ID: payload["vibe_session_id"] = SESSION_ID
-        
-        # 1. Write to Inbox
-        os.makedirs(INBOX_PATH, exist_ok=True)
-        inbox_file = os.path.join(INBOX_PATH, f"{cmd_id}.json")
-        with open(inbox_file, "w") as f:
-            json.dump(payload, f)
-            
-        # 2. Poll Outbox
-        os.makedirs(OUTBOX_PATH, exist_ok=True)
-        outbox_file = os.path.join(OUTBOX_PATH, f"res_{cmd_id}.json")
-        timeout = 60
-        start_time = time.time()
-        retries = 0
-        
-        while time.time() - start_time < timeout:
-            if os.path.exists(outbox_file):
-                try:
-                    with open(outbox_file, "r") as f:
-                        resp_json = json.load(f)
-                    os.remove(outbox_file)
-                    AuditLogger.log_mutation(method, path, data, resp_json)
-                    return resp_json
-                except Exception as e:
-                    retries += 1
-                    if retries > 5:
-                        return {"error": f"Airlock Corruption: {str(e)}"}
-                    time.sleep(0.2)
-                    continue
-            time.sleep(0.1)
-            
-        return {"error": f"Airlock Timeout: Blender did not process mutation {cmd_id} within {timeout}s"}
+    # Security Audit for Scripts (every entry of a batch envelope is audited)
+    commands = data.get("commands", []) if data and data.get("type") == "batch" else [data]
+    for cmd in commands:
+        if cmd and cmd.get("type") == "exec_script":
+            script = cmd.get("script")
+            if script:
+                violations = SecurityGate.check_python(script)
+                if violations:
+                    logger.warning(f"SECURITY_VIOLATION blocked script: {violations}")
+                    monitor.report_violation(f"Script Violation: {violations[0]}")
+                    return {"error": f"Security Violation: {violations[0]}"}
+    return None
+
+def _build_mutation_payload(data):
+    import uuid
+    payload = data or {}
+    payload["id"] = str(uuid.uuid4())
+    # The absolute deadline is stamped by MUTATION_CLIENT once a transport takes it
+    if SESSION_ID: payload["vibe_session_id"] = SESSION_ID
+    return payload
+
+def blender_request(method, path, data=None, timeout=10):
+    """Synchronous HTTP read path. Mutations only go through MUTATION_CLIENT
+    (see blender_request_async)."""
+    global SESSION_ID
+    
+    rejection = _admit_request(method, path, data, False)
+    if rejection:
+        return rejection
 
-    # --- HTTP READ PATH (is_mutation=False) ---
-    headers = {"X-Vibe-Token": VIBE_TOKEN, "Content-Type": "application/json"}
     try:
-        resp = requests.request(method, f"{BLENDER_API_URL}{path}", json=data, headers=headers, timeout=10)
+        resp = BLENDER_CLIENT.request(method, path, json=data, timeout=timeout)
         
         # Session tracking
         new_sid = resp.headers.get("X-Vibe-Session")
         try:
             body = resp.json()
             if "session" in body: new_sid = body["session"]
-        except: pass
+        except: body = None
 
         if new_sid and SESSION_ID and new_sid != SESSION_ID:
             SESSION_ID = new_sid
@@ -198,39 +190,117 @@ def blender_request(method, path, data=None, is_mutation=False):
         
         if resp.status_code == 403: monitor.report_violation("Unauthorized access attempt.")
         if resp.status_code in {200, 202}:
-            try: return resp.json()
-            except: return {"result": resp.text}
+            return body if body is not None else {"result": resp.text}
         return {"error": f"Error {resp.status_code}: {resp.text}"}
     except Exception as e: return {"error": f"Failed: {str(e)}"}
 
+# Addon audits analyze off Blender's main thread; long ones hand back a job id.
+# Collection long-polls (the addon parks the request until the job is done), so
+# a slow audit costs a request per AUDIT_LONG_POLL, well inside the rate limit.
+AUDIT_LONG_POLL = 20.0
+AUDIT_DEADLINE = 120.0
+
+async def run_audit(data):
+    """Starts an addon audit and long-polls /blender/audit until it completes (or AUDIT_DEADLINE)."""
+    result = await blender_request_async("POST", "/query", data=data, is_mutation=False)
+    deadline = time.monotonic() + AUDIT_DEADLINE
+    while isinstance(result, dict) and result.get("status") == "PENDING":
+        wait = round(min(AUDIT_LONG_POLL, deadline - time.monotonic()), 1)
+        if wait <= 0:
+            break
+        query = urlencode({"job": result["job_id"], "wait": wait})
+        result = await blender_request_async("GET", f"/blender/audit?{query}", timeout=wait + 5)
+    return result
+
+def as_text(result):
+    """Tool output: compact JSON for structured replies instead of a Python repr."""
+    if isinstance(result, str):
+        return result
+    return json.dumps(result, separators=(",", ":"), default=str)
+
+async def blender_request_async(method, path, data=None, is_mutation=False, timeout=10):
+    """Non-blocking twin of blender_request used by the MCP tools.
+    Mutations are pipelined through MUTATION_CLIENT so concurrent tool calls overlap
+    their IPC wait; reads run the synchronous HTTP path on a worker thread."""
+    if not is_mutation:
+        return await asyncio.to_thread(blender_request, method, path, data, timeout)
+
+    rejection = _admit_request(method, path, data, is_mutation)
+    if rejection:
+        return rejection
+
+    payload = _build_mutation_payload(data)
+    try:
+        resp_json = await MUTATION_CLIENT.request(payload, MUTATION_TIMEOUT)
+    except asyncio.TimeoutError:
+        return {"error": f"Airlock Timeout: Blender did not process mutation {payload['id']} within {MUTATION_TIMEOUT}s"}
+    except Exception as e:
+        return {"error": f"Mutation Transport Failure: {str(e)}"}
+    AuditLogger.log_mutation(method, path, data, resp_json)
+    return resp_json
+
 # --- TOOL GROUPS ---
 
+MAX_BATCH_COMMANDS = 500
+
 @mcp.tool()
-def validate_humanoid_rig(armature_name: str) -> str:
+async def submit_batch(commands: str, intent: str = "GENERAL", stop_on_error: bool = True) -> str:
+    """THE CONVOY: Executes an ordered list of mutations in ONE airlock round trip and ONE Undo step.
+    commands: JSON list of command objects, e.g. [{"type": "transform", "name": "Cube", "op": "translate", "value": "(0, 0, 1)", "intent": "SCENE_SETUP"}].
+    Returns per-command results in order. With stop_on_error, commands after a failure are SKIPPED."""
+    try:
+        cmds = json.loads(commands)
+    except: return "Error: Invalid JSON."
+    if not isinstance(cmds, list) or not cmds or not all(isinstance(c, dict) for c in cmds):
+        return "Error: commands must be a non-empty JSON list of command objects."
+    if len(cmds) > MAX_BATCH_COMMANDS:
+        return f"Error: Batch too large. Max {MAX_BATCH_COMMANDS} commands."
+    if any(c.get("type") == "batch" for c in cmds):
+        return "Error: Nested batches are not allowed."
+    payload = {"type": "batch", "commands": cmds, "intent": intent.upper(), "stop_on_error": stop_on_error}
+    return as_text(await blender_request_async("POST", "/command", data=payload, is_mutation=True))
+
+@mcp.tool()
+async def list_inflight_mutations() -> str:
+    """THE DISPATCHER: Lists mutations still awaiting a result from Blender (id, type, transport, age).
+    Use the ids with cancel_mutation."""
+    return json.dumps(MUTATION_CLIENT.describe_in_flight(), indent=2)
+
+@mcp.tool()
+async def cancel_mutation(command_id: str = None) -> str:
+    """THE DISPATCHER: Cancels a mutation that Blender has not started yet.
+    Omit command_id to cancel every in-flight mutation. Work that already started is NOT reverted."""
+    targets = [command_id] if command_id else [m["id"] for m in MUTATION_CLIENT.describe_in_flight()]
+    outcome = {cmd_id: await MUTATION_CLIENT.cancel(cmd_id) for cmd_id in targets}
+    logger.info(f"CANCEL_REQUEST: {outcome}")
+    return json.dumps(outcome, indent=2)
+
+@mcp.tool()
+async def validate_humanoid_rig(armature_name: str) -> str:
     """THE DOCTOR: Validates if a rig follows the standard Humanoid bone structure.
     Essential for ensuring animations work correctly in production environments."""
-    return str(blender_request("POST", "/command", data={"type": "unity_op", "action": "validate_humanoid", "target": armature_name, "intent": "RIG"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "unity_op", "action": "validate_humanoid", "target": armature_name, "intent": "RIG"}, is_mutation=True))
 
 @mcp.tool()
-def optimize_avatar_mesh(obj_name: str, ratio: float = 0.5) -> str:
+async def optimize_avatar_mesh(obj_name: str, ratio: float = 0.5) -> str:
     """THE POLISHER: Reduces the polycount of a mesh by a specific ratio (0.0 to 1.0).
     Use this to create optimized versions of high-poly assets."""
-    return str(blender_request("POST", "/command", data={"type": "unity_op", "action": "optimize_avatar", "target": obj_name, "ratio": ratio, "intent": "OPTIMIZE"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "unity_op", "action": "optimize_avatar", "target": obj_name, "ratio": ratio, "intent": "OPTIMIZE"}, is_mutation=True))
 
 @mcp.tool()
-def generate_viseme_key(mesh_name: str, viseme: str) -> str:
+async def generate_viseme_key(mesh_name: str, viseme: str) -> str:
     """THE VOX: Creates a viseme shape key slot (e.g., 'vrc.v_aa', 'vrc.v_ih') for lip-sync.
     Use this when preparing character meshes for VRChat."""
-    return str(blender_request("POST", "/command", data={"type": "viseme_op", "name": mesh_name, "viseme": viseme, "intent": "ANIMATE"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "viseme_op", "name": mesh_name, "viseme": viseme, "intent": "ANIMATE"}, is_mutation=True))
 
 @mcp.tool()
-def begin_transaction() -> str:
+async def begin_transaction() -> str:
     """THE ARCHIVIST: Starts a multi-command transaction. 
     All subsequent mutations will be grouped into a single Undo step."""
-    return str(blender_request("POST", "/command", data={"type": "system_op", "action": "begin_transaction", "intent": "GENERAL"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "system_op", "action": "begin_transaction", "intent": "GENERAL"}, is_mutation=True))
 
 @mcp.tool()
-def commit_transaction(rationale_check: str) -> str:
+async def commit_transaction(rationale_check: str) -> str:
     """THE ARCHIVIST: Finalizes the current multi-command transaction.
     HARD GATE: Requires a JSON rationale_check containing the current 'scene_hash' 
     to prove the AI has processed the force-fed context."""
@@ -240,118 +310,118 @@ def commit_transaction(rationale_check: str) -> str:
             return "Error: Hard Gate Violation. 'scene_hash' missing from rationale_check."
         
         # Verify the hash matches the current state
-        current_state = blender_request("GET", "/blender/scene_state")
+        current_state = await blender_request_async("GET", "/blender/scene_state")
         if current_state.get("scene_hash") != check["scene_hash"]:
             return f"Error: Hash Mismatch. Action blocked. Expected {current_state.get('scene_hash')}, got {check['scene_hash']}."
             
-        return str(blender_request("POST", "/command", data={"type": "system_op", "action": "commit_transaction", "intent": "GENERAL", "rationale": check}, is_mutation=True))
+        return as_text(await blender_request_async("POST", "/command", data={"type": "system_op", "action": "commit_transaction", "intent": "GENERAL", "rationale": check}, is_mutation=True))
     except Exception as e:
         return f"Error processing Hard Gate: {str(e)}"
 
 @mcp.tool()
-def rollback_transaction() -> str:
+async def rollback_transaction() -> str:
     """THE ARCHIVIST: Aborts the current transaction and reverts all changes since 'begin_transaction'."""
-    return str(blender_request("POST", "/command", data={"type": "system_op", "action": "rollback_transaction", "intent": "GENERAL"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "system_op", "action": "rollback_transaction", "intent": "GENERAL"}, is_mutation=True))
 
 @mcp.tool()
-def hot_reload_blender_bridge() -> str:
+async def hot_reload_blender_bridge() -> str:
     """Triggers a self-reload within Blender to pick up latest code changes."""
-    return str(blender_request("POST", "/command", data={"type": "system_op", "action": "reload", "intent": "GENERAL"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "system_op", "action": "reload", "intent": "GENERAL"}, is_mutation=True))
 
 @mcp.tool()
-def reconcile_state(assumptions: str) -> str:
-    """Verifies agent beliefs against Blender state. assumptions: JSON string."""
-    try: return str(blender_request("POST", "/reconcile", data=json.loads(assumptions)))
+async def reconcile_state(assumptions: str) -> str:
+    """Verifies agent beliefs against Blender state. assumptions: JSON string with the 'scene_hash' they were formed against; returns what changed since."""
+    try: return as_text(await blender_request_async("POST", "/reconcile", data=json.loads(assumptions)))
     except: return "Error: Invalid JSON."
 
 @mcp.tool()
-def validate_scene_integrity() -> str:
+async def validate_scene_integrity() -> str:
     """Checks for architectural invariants like scale sanity and missing cameras."""
-    return str(blender_request("GET", "/validate"))
+    return as_text(await blender_request_async("GET", "/validate"))
 
 @mcp.tool()
-def get_scene_telemetry() -> str:
+async def get_scene_telemetry() -> str:
     """Returns structured scene data: poly counts, materials, and hardware stats."""
-    return str(blender_request("GET", "/status"))
+    return as_text(await blender_request_async("GET", "/status"))
 
 @mcp.tool()
-def inspect_object_forensics(name: str) -> str:
+async def inspect_object_forensics(name: str) -> str:
     """Recursive node tree dump for deep material/shader analysis."""
-    return str(blender_request("GET", f"/forensic?name={name}"))
+    return as_text(await blender_request_async("GET", f"/forensic?name={name}"))
 
 @mcp.tool()
-def execute_strategic_intent(intent: str) -> str:
+async def execute_strategic_intent(intent: str) -> str:
     """THE DIRECTOR: Runs high-level atomic artistic recipes like 'RESTORE_AVATAR_COLORS_RED'."""
-    return str(blender_request("POST", "/command", data={"type": "macro_op", "intent": intent.upper()}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "macro_op", "intent": intent.upper()}, is_mutation=True))
 
 @mcp.tool()
-def manage_modifier(name: str, action: str, modifier_name: str, modifier_type: str = None, properties: str = None) -> str:
+async def manage_modifier(name: str, action: str, modifier_name: str, modifier_type: str = None, properties: str = None) -> str:
     """Manages object modifiers (add, remove, set) with safety rails."""
     payload = {"type": "modifier_op", "name": name, "action": action, "mod_name": modifier_name, "mod_type": modifier_type, "intent": "OPTIMIZE"}
     if properties:
         try:
             props = json.loads(properties)
             payload.update({"action": "set", "props": props})
-            return str(blender_request("POST", "/command", data=payload, is_mutation=True))
+            return as_text(await blender_request_async("POST", "/command", data=payload, is_mutation=True))
         except: return "Error: Invalid JSON."
-    return str(blender_request("POST", "/command", data=payload, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data=payload, is_mutation=True))
 
 @mcp.tool()
-def transform_object(name: str, operation: str, x: float, y: float, z: float) -> str:
+async def transform_object(name: str, operation: str, x: float, y: float, z: float) -> str:
     """Moves, rotates, or scales an object. operation: 'translate', 'rotate', 'scale'."""
-    return str(blender_request("POST", "/command", data={"type": "transform", "name": name, "op": operation, "value": str((x,y,z)), "intent": "SCENE_SETUP"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "transform", "name": name, "op": operation, "value": str((x,y,z)), "intent": "SCENE_SETUP"}, is_mutation=True))
 
 @mcp.tool()
-def add_primitive(type: str) -> str:
+async def add_primitive(type: str) -> str:
     """Adds a new primitive (cube, sphere, monkey)."""
     m = {"cube": "mesh.primitive_cube_add", "sphere": "mesh.primitive_uv_sphere_add", "monkey": "mesh.primitive_monkey_add"}
     if type.lower() not in m: return "Unsupported type."
-    return str(blender_request("POST", "/command", data={"type": "run_op", "op": m[type.lower()], "intent": "SCENE_SETUP"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "run_op", "op": m[type.lower()], "intent": "SCENE_SETUP"}, is_mutation=True))
 
 @mcp.tool()
-def manage_nodes(name: str, action: str, node_type: str = None, target_type: str = "SHADER", link_data: str = None) -> str:
+async def manage_nodes(name: str, action: str, node_type: str = None, target_type: str = "SHADER", link_data: str = None) -> str:
     """Manages Node Trees (add, link). link_data: JSON string of socket names."""
     payload = {"type": "node_op", "action": action, "name": name, "target_type": target_type.upper(), "node_type": node_type, "intent": "LIGHT"}
     if link_data:
         try: payload.update(json.loads(link_data))
         except: return "Error: Invalid JSON."
-    return str(blender_request("POST", "/command", data=payload, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data=payload, is_mutation=True))
 
 @mcp.tool()
-def apply_physics(name: str, type: str) -> str:
+async def apply_physics(name: str, type: str) -> str:
     """THE SIMULATOR: Applies RIGID_BODY or CLOTH physics to an object.
     Use this to instantly make an object respond to gravity or behave like fabric."""
-    return str(blender_request("POST", "/command", data={"type": "physics_op", "name": name, "phys_type": type.upper(), "intent": "SCENE_SETUP"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "physics_op", "name": name, "phys_type": type.upper(), "intent": "SCENE_SETUP"}, is_mutation=True))
 
 @mcp.tool()
-def material_preview_sandbox() -> str:
+async def material_preview_sandbox() -> str:
     """THE SHOWROOM: Spawns a temporary preview sphere to test material changes safely.
     Use this to see how a material looks without modifying your main meshes."""
-    return str(blender_request("POST", "/command", data={"type": "cleanup_op", "action": "material_preview_sandbox", "intent": "OPTIMIZE"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "cleanup_op", "action": "material_preview_sandbox", "intent": "OPTIMIZE"}, is_mutation=True))
 
 @mcp.tool()
-def setup_lighting(name: str, type: str = "POINT", energy: float = 10.0, color: str = "(1, 1, 1)") -> str:
+async def setup_lighting(name: str, type: str = "POINT", energy: float = 10.0, color: str = "(1, 1, 1)") -> str:
     """Configures a light source with safety energy caps."""
-    return str(blender_request("POST", "/command", data={"type": "lighting_op", "name": name, "type_light": type.upper(), "energy": energy, "color": color, "intent": "LIGHT"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "lighting_op", "name": name, "type_light": type.upper(), "energy": energy, "color": color, "intent": "LIGHT"}, is_mutation=True))
 
 @mcp.tool()
-def manage_constraints(owner_name: str, action: str, type: str, target_name: str = None, constraint_name: str = None, properties: str = None) -> str:
+async def manage_constraints(owner_name: str, action: str, type: str, target_name: str = None, constraint_name: str = None, properties: str = None) -> str:
     """Rigging tools: TRACK_TO, FOLLOW_PATH, COPY_LOCATION. properties: JSON string."""
     payload = {"type": "constraint_op", "action": action, "name": owner_name, "target": target_name, "c_type": type.upper(), "c_name": constraint_name, "intent": "RIG"}
     if properties:
         try: payload["props"] = json.loads(properties)
         except: return "Error: Invalid JSON."
-    return str(blender_request("POST", "/command", data=payload, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data=payload, is_mutation=True))
 
 @mcp.tool()
-def set_viewport_shading(mode: str = "SOLID") -> str:
+async def set_viewport_shading(mode: str = "SOLID") -> str:
     """Changes UI shading: WIREFRAME, SOLID, MATERIAL, RENDERED."""
-    return str(blender_request("POST", "/command", data={"type": "viewport_op", "mode": mode.upper(), "intent": "LIGHT"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "viewport_op", "mode": mode.upper(), "intent": "LIGHT"}, is_mutation=True))
 
 @mcp.tool()
-def take_viewport_screenshot() -> ImageContent:
+async def take_viewport_screenshot() -> ImageContent:
     """Captures an OpenGL screenshot for visual feedback."""
-    res = blender_request("POST", "/command", data={"type": "render_op", "intent": "GENERAL"}, is_mutation=True)
+    res = await blender_request_async("POST", "/command", data={"type": "render_op", "intent": "GENERAL"}, is_mutation=True)
     if isinstance(res, dict) and "result" in res:
         path = res["result"]
         if os.path.exists(path):
@@ -371,12 +441,12 @@ def scan_external_asset(path: str) -> str:
     return f"✅ Asset {path} passed security scan."
 
 @mcp.tool()
-def link_external_library(filepath: str, name: str, directory: str = "Object") -> str:
+async def link_external_library(filepath: str, name: str, directory: str = "Object") -> str:
     """Links assets from external .blend files safely. Performs an automatic security scan."""
     violations = SecurityGate.check_asset(filepath)
     if violations:
         return f"❌ LINK BLOCKED: {violations[0]}"
-    return str(blender_request("POST", "/command", data={"type": "link_op", "filepath": filepath, "name": name, "directory": directory, "intent": "SCENE_SETUP"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "link_op", "filepath": filepath, "name": name, "directory": directory, "intent": "SCENE_SETUP"}, is_mutation=True))
 
 @mcp.tool()
 def secure_write_file(path: str, content: str) -> str:
@@ -407,184 +477,185 @@ def secure_write_file(path: str, content: str) -> str:
     except Exception as e: return f"Failed: {str(e)}"
 
 @mcp.tool()
-def protect_object(name: str, protected: bool = True) -> str:
+async def protect_object(name: str, protected: bool = True) -> str:
     """THE GUARDIAN: Locks or unlocks an object from deletion.
     locked objects cannot be deleted by the AI until unprotected.
     Set protected=False to unlock."""
     script = f"bpy.data.objects['{name}']['vibe_protected'] = {1 if protected else 0}"
-    return str(blender_request("POST", "/command", data={"type": "exec_script", "script": script, "description": f"PROTECT:{name}", "intent": "SCENE_SETUP"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "exec_script", "script": script, "description": f"PROTECT:{name}", "intent": "SCENE_SETUP"}, is_mutation=True))
 
 @mcp.tool()
-def undo_last_operation() -> str:
+async def undo_last_operation() -> str:
     """Performs a global Blender Undo (Ctrl+Z equivalent). Use this to revert a mistake."""
-    return str(blender_request("POST", "/command", data={"type": "system_op", "action": "undo", "intent": "GENERAL"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "system_op", "action": "undo", "intent": "GENERAL"}, is_mutation=True))
 
 @mcp.tool()
-def create_safety_checkpoint(name: str) -> str:
+async def create_safety_checkpoint(name: str) -> str:
     """Saves a timestamped copy of the current .blend file to the 'checkpoints/' folder.
     Use BEFORE performing risky structural changes."""
-    return str(blender_request("POST", "/command", data={"type": "system_op", "action": "checkpoint", "name": name, "intent": "GENERAL"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "system_op", "action": "checkpoint", "name": name, "intent": "GENERAL"}, is_mutation=True))
 
 @mcp.tool()
-def manage_collection(name: str, action: str = "add", obj_name: str = None) -> str:
+async def manage_collection(name: str, action: str = "add", obj_name: str = None) -> str:
     """THE ORGANIZER: Creates collections or links objects to them. action: 'add' or 'link'."""
-    return str(blender_request("POST", "/command", data={"type": "collection_op", "name": name, "action": action, "obj_name": obj_name, "intent": "SCENE_SETUP"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "collection_op", "name": name, "action": action, "obj_name": obj_name, "intent": "SCENE_SETUP"}, is_mutation=True))
 
 @mcp.tool()
-def manage_material(name: str, obj_name: str = None) -> str:
+async def manage_material(name: str, obj_name: str = None) -> str:
     """THE SURFACER: Creates a new material and optionally assigns it to an object."""
-    return str(blender_request("POST", "/command", data={"type": "material_op", "name": name, "obj_name": obj_name, "intent": "SCENE_SETUP"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "material_op", "name": name, "obj_name": obj_name, "intent": "SCENE_SETUP"}, is_mutation=True))
 
 @mcp.tool()
-def trigger_bake(resolution: int = 1024) -> str:
+async def trigger_bake(resolution: int = 1024) -> str:
     """THE OVEN: Triggers a texture bake with a 2048px hardware safety cap."""
-    return str(blender_request("POST", "/command", data={"type": "bake_op", "resolution": resolution, "intent": "OPTIMIZE"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "bake_op", "resolution": resolution, "intent": "OPTIMIZE"}, is_mutation=True))
 
 @mcp.tool()
-def set_animation_keyframe(name: str, prop: str = "location", frame: int = 1) -> str:
+async def set_animation_keyframe(name: str, prop: str = "location", frame: int = 1) -> str:
     """THE ANIMATOR: Inserts a keyframe for a property at a specific frame."""
-    return str(blender_request("POST", "/command", data={"type": "animation_op", "name": name, "prop": prop, "frame": frame, "intent": "ANIMATE"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "animation_op", "name": name, "prop": prop, "frame": frame, "intent": "ANIMATE"}, is_mutation=True))
 
 @mcp.tool()
-def manage_camera(name: str, active: bool = True) -> str:
+async def manage_camera(name: str, active: bool = True) -> str:
     """THE CINEMATOGRAPHER: Spawns a camera and optionally makes it the active view."""
-    return str(blender_request("POST", "/command", data={"type": "camera_op", "name": name, "active": active, "intent": "SCENE_SETUP"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "camera_op", "name": name, "active": active, "intent": "SCENE_SETUP"}, is_mutation=True))
 
 @mcp.tool()
-def set_world_background(color: str = "(0.05, 0.05, 0.05, 1)") -> str:
+async def set_world_background(color: str = "(0.05, 0.05, 0.05, 1)") -> str:
     """THE STAGEHAND: Sets the global environment background color."""
-    return str(blender_request("POST", "/command", data={"type": "world_op", "color": color, "intent": "LIGHT"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "world_op", "color": color, "intent": "LIGHT"}, is_mutation=True))
 
 @mcp.tool()
-def create_procedural_curve(name: str, coords: str = "[(0,0,0), (1,1,1)]") -> str:
+async def create_procedural_curve(name: str, coords: str = "[(0,0,0), (1,1,1)]") -> str:
     """THE PATHFINDER: Creates a 3D Poly Curve from a list of (x,y,z) coordinate tuples."""
-    return str(blender_request("POST", "/command", data={"type": "curve_op", "name": name, "coords": coords, "intent": "SCENE_SETUP"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "curve_op", "name": name, "coords": coords, "intent": "SCENE_SETUP"}, is_mutation=True))
 
 @mcp.tool()
-def manage_object_locks(name: str, lock: bool = True) -> str:
+async def manage_object_locks(name: str, lock: bool = True) -> str:
     """THE JAILER: Locks or unlocks all transform axes (Loc/Rot/Scale) for an object."""
-    return str(blender_request("POST", "/command", data={"type": "lock_op", "name": name, "lock": lock, "intent": "SCENE_SETUP"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "lock_op", "name": name, "lock": lock, "intent": "SCENE_SETUP"}, is_mutation=True))
 
 @mcp.tool()
-def process_mesh(action: str) -> str:
+async def process_mesh(action: str) -> str:
     """THE BLACKSMITH: shade_smooth, shade_flat, or join selected objects."""
-    return str(blender_request("POST", "/command", data={"type": "mesh_op", "action": action, "intent": "OPTIMIZE"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "mesh_op", "action": action, "intent": "OPTIMIZE"}, is_mutation=True))
 
 @mcp.tool()
-def manage_vertex_groups(name: str, vg_name: str) -> str:
+async def manage_vertex_groups(name: str, vg_name: str) -> str:
     """THE WEIGHTER: Creates a new vertex group on a mesh object."""
-    return str(blender_request("POST", "/command", data={"type": "vg_op", "name": name, "vg_name": vg_name, "intent": "RIG"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "vg_op", "name": name, "vg_name": vg_name, "intent": "RIG"}, is_mutation=True))
 
 @mcp.tool()
-def setup_spatial_audio(name: str) -> str:
+async def setup_spatial_audio(name: str) -> str:
     """THE COMPOSER: Spawns a 3D Speaker object for spatialized sound."""
-    return str(blender_request("POST", "/command", data={"type": "audio_op", "name": name, "intent": "SCENE_SETUP"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "audio_op", "name": name, "intent": "SCENE_SETUP"}, is_mutation=True))
 
 @mcp.tool()
-def import_export_asset(action: str, filepath: str) -> str:
+async def import_export_asset(action: str, filepath: str) -> str:
     """THE GATEKEEPER: action: 'import_fbx' or 'export_fbx'."""
     if action == "import_fbx":
         violations = SecurityGate.check_asset(filepath)
         if violations:
             return f"❌ IMPORT BLOCKED: {violations[0]}"
-    return str(blender_request("POST", "/command", data={"type": "io_op", "action": action, "filepath": filepath, "intent": "SCENE_SETUP"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "io_op", "action": action, "filepath": filepath, "intent": "SCENE_SETUP"}, is_mutation=True))
 
 @mcp.tool()
-def create_3d_annotation(text: str) -> str:
+async def create_3d_annotation(text: str) -> str:
     """THE SCRIBBLE: Creates a Grease Pencil object for 3D notes and markup."""
-    return str(blender_request("POST", "/command", data={"type": "annotation_op", "text": text, "intent": "SCENE_SETUP"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "annotation_op", "text": text, "intent": "SCENE_SETUP"}, is_mutation=True))
 
 @mcp.tool()
-def save_as_new_copy(filename: str) -> str:
+async def save_as_new_copy(filename: str) -> str:
     """Saves the current blend file as a new copy with the specified filename.
     Useful for versioning (e.g., 'avatar_v3.blend')."""
-    return str(blender_request("POST", "/command", data={"type": "system_op", "action": "save_copy", "name": filename, "intent": "GENERAL"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "system_op", "action": "save_copy", "name": filename, "intent": "GENERAL"}, is_mutation=True))
 
 @mcp.tool()
-def reset_material_standard(material_name: str) -> str:
+async def reset_material_standard(material_name: str) -> str:
     """THE JANITOR: Wipes a material and resets it to a standard, clean Principled BSDF (Gray).
     Use this to fix broken shaders, pink textures, or corruption."""
-    return str(blender_request("POST", "/command", data={"type": "cleanup_op", "action": "reset_material", "target": material_name, "intent": "OPTIMIZE"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "cleanup_op", "action": "reset_material", "target": material_name, "intent": "OPTIMIZE"}, is_mutation=True))
 
 @mcp.tool()
-def scan_for_nan_inf() -> str:
+async def scan_for_nan_inf() -> str:
     """THE WATCHDOG: Scans all objects for NaN (Not a Number) or Infinite values in transforms and geometry.
     Run this if the physics explode or the viewport glitches."""
-    return str(blender_request("POST", "/query", data={"type": "cleanup_op", "action": "scan_nan"}, is_mutation=False))
+    return as_text(await run_audit({"type": "cleanup_op", "action": "scan_nan"}))
 
 @mcp.tool()
-def audit_external_dependencies() -> str:
+async def audit_external_dependencies() -> str:
     """THE AUDITOR: Checks all external file references (Images, Libraries) to ensure they exist on disk.
     Prevents missing textures and pink materials."""
-    return str(blender_request("POST", "/query", data={"type": "audit_op", "action": "check_deps"}, is_mutation=False))
+    return as_text(await blender_request_async("POST", "/query", data={"type": "audit_op", "action": "check_deps"}, is_mutation=False))
 
 @mcp.tool()
-def validate_export_contract() -> str:
+async def validate_export_contract() -> str:
     """THE GATEKEEPER: Checks scene validity before Export.
     Flags: Unapplied Scale, Non-Zero Rotation, N-Gons, Loose Geometry.
     Use this BEFORE exporting to external engines."""
-    return str(blender_request("POST", "/query", data={"type": "audit_op", "action": "validate_export"}, is_mutation=False))
+    return as_text(await run_audit({"type": "audit_op", "action": "validate_export"}))
 
 @mcp.tool()
-def audit_rig_integrity() -> str:
+async def audit_rig_integrity() -> str:
     """THE CHIROPRACTOR: Scans all bones and constraints for NaN values, roll corruption, or broken hierarchies.
     Essential for ensuring animations play correctly after export."""
-    return str(blender_request("POST", "/query", data={"type": "audit_op", "action": "audit_rig"}, is_mutation=False))
+    return as_text(await run_audit({"type": "audit_op", "action": "audit_rig"}))
 
 @mcp.tool()
-def audit_shape_key_integrity() -> str:
+async def audit_shape_key_integrity() -> str:
     """THE VISEME GUARD: Scans all meshes for broken or basis-mismatched shape keys.
     Prevents facial expressions from vanishing during asset import in other engines."""
-    return str(blender_request("POST", "/query", data={"type": "audit_op", "action": "audit_shape_keys"}, is_mutation=False))
+    return as_text(await run_audit({"type": "audit_op", "action": "audit_shape_keys"}))
 
 @mcp.tool()
-def audit_vertex_groups() -> str:
+async def audit_vertex_groups() -> str:
     """THE WEIGHTING GUARD: Scans for vertices that have NO weight assignments on rigged meshes.
     Prevents the 'Spiking Mesh' bug during deformation."""
-    return str(blender_request("POST", "/query", data={"type": "audit_op", "action": "audit_weights"}, is_mutation=False))
+    return as_text(await run_audit({"type": "audit_op", "action": "audit_weights"}))
 
 @mcp.tool()
-def audit_identity(target_name: str = None, depth: str = "SHALLOW") -> str:
+async def audit_identity(target_name: str = None, depth: str = "SHALLOW") -> str:
     """THE ARCHITECT'S SEAL: Generates a unique signature for an object or the whole scene.
     depth: 'SHALLOW' (fast), 'DEEP' (vertex-level), 'SCENE' (full scene layout).
     Use this to verify if things have moved or changed unexpectedly."""
-    return str(blender_request("POST", "/query", data={"type": "audit_op", "action": "identity", "target": target_name, "depth": depth.upper()}, is_mutation=False))
+    return as_text(await blender_request_async("POST", "/query", data={"type": "audit_op", "action": "identity", "target": target_name, "depth": depth.upper()}, is_mutation=False))
 
 @mcp.tool()
-def emergency_viewport_downgrade() -> str:
+async def emergency_viewport_downgrade() -> str:
     """THE PANIC BUTTON: Instantly saves a GPU/UI freeze by switching to Solid Mode and disabling all modifiers.
     Use this if Blender becomes unresponsive or laggy."""
-    return str(blender_request("POST", "/command", data={"type": "system_op", "action": "panic_downgrade"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "system_op", "action": "panic_downgrade"}, is_mutation=True))
 
 @mcp.tool()
-def generate_forensic_dump() -> str:
+async def generate_forensic_dump() -> str:
     """THE CASE STUDY: Bundles logs, telemetry, and a screenshot into a diagnostic folder.
     Run this after a major failure or before a human review."""
-    return str(blender_request("POST", "/command", data={"type": "audit_op", "action": "forensic_dump"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "audit_op", "action": "forensic_dump"}, is_mutation=True))
 
 @mcp.tool()
-def find_object_by_traits(vertex_count: int = None, material_name: str = None) -> str:
+async def find_object_by_traits(vertex_count: int = None, material_name: str = None, object_type: str = None) -> str:
     """THE TRACKER: Finds objects based on physical traits rather than names.
-    Use this if you think an object was renamed or to verify identity."""
-    return str(blender_request("POST", "/query", data={"type": "audit_op", "action": "find_by_traits", "v_count": vertex_count, "mat_name": material_name}, is_mutation=False))
+    Use this if you think an object was renamed or to verify identity.
+    All given traits must match; answered from an index, so cheap on any scene size."""
+    return as_text(await blender_request_async("POST", "/query", data={"type": "audit_op", "action": "find_by_traits", "v_count": vertex_count, "mat_name": material_name, "object_type": object_type}, is_mutation=False))
 
 @mcp.tool()
-def sandbox_modify_object(object_name: str, script: str) -> str:
+async def sandbox_modify_object(object_name: str, script: str) -> str:
     """THE SURGEON'S TABLE: Clones an object, runs a script on the clone, validates integrity, 
     and only swaps the data back if it passes. Use for risky mesh/rig edits."""
-    return str(blender_request("POST", "/command", data={"type": "exec_script", "description": f"SANDBOX:{object_name}", "script": script, "sandbox_target": object_name}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "exec_script", "description": f"SANDBOX:{object_name}", "script": script, "sandbox_target": object_name}, is_mutation=True))
 
 @mcp.tool()
-def purge_orphans() -> str:
+async def purge_orphans() -> str:
     """THE GARBAGE COLLECTOR: Recursively deletes unused meshes, materials, and textures.
     Run this to reduce file size and fix 'ghost' data."""
-    return str(blender_request("POST", "/command", data={"type": "cleanup_op", "action": "purge_orphans"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "cleanup_op", "action": "purge_orphans"}, is_mutation=True))
 
 @mcp.tool()
-def hard_refresh_depsgraph() -> str:
+async def hard_refresh_depsgraph() -> str:
     """THE DEFIBRILLATOR: Forces a full rebuild of Blender's Dependency Graph.
     Use this if modifiers are stuck, bones aren't moving, or the viewport is lying."""
-    return str(blender_request("POST", "/command", data={"type": "system_op", "action": "depsgraph_refresh"}, is_mutation=True))
+    return as_text(await blender_request_async("POST", "/command", data={"type": "system_op", "action": "depsgraph_refresh"}, is_mutation=True))
 
 @mcp.tool()
 def check_heartbeat() -> str:
@@ -699,7 +770,7 @@ def get_blender_errors() -> str:
     return "Log file missing."
 
 @mcp.tool()
-def get_blender_invariants(category: str = "scene") -> str:
+async def get_blender_invariants(category: str = "scene") -> str:
     """THE SENSOR: Returns deterministic engine facts from Blender.
     Categories: 'heartbeat', 'file', 'scene', 'context', 'datablock', 'error', 'entropy'.
     Use this to verify state before and after any mutation."""
@@ -711,7 +782,6 @@ def get_blender_invariants(category: str = "scene") -> str:
         })
     
     endpoints = {
-...
         "heartbeat": "/blender/heartbeat",
         "file": "/blender/file_state",
         "scene": "/blender/scene_state",
@@ -720,23 +790,75 @@ def get_blender_invariants(category: str = "scene") -> str:
         "error": "/blender/error_state"
     }
     path = endpoints.get(category.lower(), "/blender/scene_state")
-    return str(blender_request("GET", path))
+    return as_text(await blender_request_async("GET", path))
+
+@mcp.tool()
+async def list_objects(obj_type: str = None, prefix: str = None, uuid: str = None, cursor: str = None, limit: int = 100) -> str:
+    """Pages through all scene objects in name order. Filter by type or name prefix, or look up a uuid.
+    Pass the returned 'next_cursor' to get the next page."""
+    params = {k: v for k, v in {"type": obj_type, "prefix": prefix, "uuid": uuid, "cursor": cursor, "limit": limit}.items() if v is not None}
+    return as_text(await blender_request_async("GET", f"/blender/objects?{urlencode(params)}"))
+
+@mcp.tool()
+async def wait_for_scene_change(scene_hash: str = None, error_hash: str = None, timeout: float = 25.0) -> str:
+    """Blocks (one parked request, no polling) until the scene hash or error state differs from the
+    given values, or `timeout` seconds pass. Omitted values mean 'as of now'. Returns CHANGED or TIMEOUT."""
+    params = {"timeout": timeout}
+    if scene_hash:
+        params["hash"] = scene_hash
+    if error_hash:
+        params["error_hash"] = error_hash
+    if not scene_hash and not error_hash:
+        params["on"] = "scene,errors"
+    return as_text(await blender_request_async("GET", f"/blender/watch?{urlencode(params)}", timeout=timeout + 5))
 
 @mcp.tool()
-def get_state_hash() -> str:
+async def get_scene_delta(since_tick: int, session_hash: str = None) -> str:
+    """Objects added, removed or modified since a monotonic_tick, each with a session-stable "id". Cheaper than re-reading the scene;
+    answers RESYNC_REQUIRED when the history no longer reaches back that far."""
+    params = {"since_tick": since_tick}
+    if session_hash:
+        params["session"] = session_hash
+    return as_text(await blender_request_async("GET", f"/blender/scene_delta?{urlencode(params)}"))
+
+@mcp.tool()
+async def get_scene_diff(since_hash: str, to_hash: str = None) -> str:
+    """Lists objects added, removed or changed per collection between two scene hashes (Merkle diff)."""
+    path = f"/blender/scene_diff?from={since_hash}"
+    if to_hash:
+        path += f"&to={to_hash}"
+    return as_text(await blender_request_async("GET", path))
+
+@mcp.tool()
+def get_bridge_latency() -> str:
+    """Per-endpoint latency (avg/p50/p95/max ms), error and retry counts of reads against Blender."""
+    return json.dumps(BLENDER_CLIENT.stats(), indent=2)
+
+@mcp.tool()
+async def get_state_hash() -> str:
     """THE CALCULATOR: Returns a deterministic SHA256 hash of the current scene state."""
-    res = blender_request("GET", "/blender/scene_state")
+    res = await blender_request_async("GET", "/blender/scene_state")
     if isinstance(res, dict) and "scene_hash" in res:
         return res["scene_hash"]
     return "UNKNOWN"
 
 @mcp.tool()
 def get_wal_tail(lines: int = 20) -> str:
+    """Returns the last N entries of the hash-chained mutation WAL (the audit log)."""
+    if os.path.exists(AUDIT_LOG_PATH):
+        try:
+            with open(AUDIT_LOG_PATH, "r") as f:
+                return "".join(f.readlines()[-lines:])
+        except Exception as e:
+            return f"Error reading WAL: {str(e)}"
+    return "WAL missing."
 
 @mcp.tool()
-def force_restart_blender_bridge() -> str:
+async def force_restart_blender_bridge() -> str:
     """THE DEFIBS: Triggers an out-of-band restart of the Blender timer loop.
     Use this if Blender is online but not processing commands (stuck queue)."""
-    return str(blender_request("GET", "/restart", is_mutation=True))
+    return as_text(await blender_request_async("GET", "/restart", is_mutation=True))
 
-if __name__ == "__main__": mcp.run()
+if __name__ == "__main__":
+    OUTBOX_SWEEPER.start()
+    mcp.run()
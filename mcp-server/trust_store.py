@@ -0,0 +1,208 @@
+# BlenderVibeBridge: Dual-License & Maintenance Agreement (v1.2)
+# Copyright (C) 2026 B-A-M-N (The "Author")
+#
+# This software is distributed under a Dual-Licensing Model:
+# 1. THE OPEN-SOURCE PATH: GNU AGPLv3 (see LICENSE for details)
+# 2. THE COMMERCIAL PATH: "WORK-OR-PAY" MODEL
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+
+import os
+import json
+import time
+import datetime
+import threading
+
+try:
+    import fcntl
+except ImportError: # Windows: in-process locking only
+    fcntl = None
+
+# The files are re-checked (two stats) at most this often; lookups in between
+# are pure set membership tests
+RECHECK_INTERVAL = 1.0
+# Journal size that triggers a background compaction into the base file
+COMPACT_BYTES = 64 * 1024
+
+class TrustedSignatureStore:
+    """
+    Process-resident set of trusted content hashes backed by two files:
+
+      <path>          compacted base, {hash: {"timestamp", "reason"}} (the legacy format)
+      <path>.journal  append-only JSON lines, one approval each
+
+    The base is loaded once and reloaded only when its mtime or size changes.
+    Journal growth is applied by reading just the new tail. Approvals append one
+    line; a background compaction folds the journal into the base. Other
+    processes (the security_gate CLI) share the files under <path>.lock.
+    """
+
+    def __init__(self, path, recheck_interval=RECHECK_INTERVAL, compact_bytes=COMPACT_BYTES):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.lock_path = path + ".lock"
+        self.recheck_interval = recheck_interval
+        self.compact_bytes = compact_bytes
+        self._hashes = frozenset()
+        self._base_stamp = None
+        self._journal_ino = None
+        self._journal_offset = 0
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self._compacting = False
+        self.stats = {"reloads": 0, "tail_reads": 0, "appends": 0, "compactions": 0}
+
+    # --- READ PATH ---
+
+    def contains(self, content_hash):
+        if time.monotonic() >= self._next_check:
+            self._refresh()
+        return content_hash in self._hashes
+
+    @staticmethod
+    def _stamp(path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _refresh(self):
+        with self._lock:
+            self._next_check = time.monotonic() + self.recheck_interval
+            base_stamp = self._stamp(self.path)
+            journal_ino, _, journal_size = self._stamp(self.journal_path) or (None, 0, 0)
+            if base_stamp != self._base_stamp or journal_ino != self._journal_ino or journal_size < self._journal_offset:
+                # Compacted (here or by another process): start over from the new base
+                self._reload(base_stamp)
+            elif journal_size > self._journal_offset:
+                self._read_tail()
+
+    def _reload(self, base_stamp):
+        hashes = set()
+        try:
+            with open(self.path, "r") as f:
+                hashes.update(json.load(f))
+        except (OSError, ValueError, TypeError):
+            pass # Missing or unreadable base: nothing trusted from it
+        self._hashes = frozenset(hashes)
+        self._base_stamp = base_stamp
+        self._journal_ino = None
+        self._journal_offset = 0
+        self.stats["reloads"] += 1
+        self._read_tail()
+
+    def _read_tail(self):
+        """Applies complete journal lines past the last offset read."""
+        try:
+            with open(self.journal_path, "rb") as f:
+                self._journal_ino = os.fstat(f.fileno()).st_ino
+                f.seek(self._journal_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b"\n") + 1 # A half-written last line waits for the next read
+        added = set()
+        for line in data[:end].splitlines():
+            try:
+                added.add(json.loads(line)["hash"])
+            except (ValueError, KeyError, TypeError):
+                continue
+        if added:
+            self._hashes = self._hashes | added
+        self._journal_offset += end
+        self.stats["tail_reads"] += 1
+
+    # --- WRITE PATH ---
+
+    def _file_lock(self):
+        return _FileLock(self.lock_path)
+
+    def add(self, content_hash, reason):
+        entry = {
+            "hash": content_hash,
+            "timestamp": datetime.datetime.now().isoformat(),
+            "reason": reason
+        }
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+        with self._file_lock():
+            fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+                journal_size = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+        with self._lock:
+            self._hashes = self._hashes | {content_hash}
+            self.stats["appends"] += 1
+            compact = journal_size >= self.compact_bytes and not self._compacting
+            if compact:
+                self._compacting = True
+        if compact:
+            threading.Thread(target=self.compact, name="trust-compaction", daemon=True).start()
+
+    def compact(self):
+        """Folds the journal into the base file (atomic replace), then empties it."""
+        try:
+            with self._file_lock():
+                trusted = {}
+                try:
+                    with open(self.path, "r") as f:
+                        trusted = json.load(f)
+                except (OSError, ValueError):
+                    pass
+                try:
+                    with open(self.journal_path, "r") as f:
+                        for line in f:
+                            try:
+                                entry = json.loads(line)
+                                trusted[entry["hash"]] = {"timestamp": entry["timestamp"], "reason": entry["reason"]}
+                            except (ValueError, KeyError, TypeError):
+                                continue
+                except FileNotFoundError:
+                    return
+                tmp_path = os.path.join(os.path.dirname(self.path) or ".", f".{os.path.basename(self.path)}.tmp")
+                with open(tmp_path, "w") as f:
+                    json.dump(trusted, f, indent=2)
+                os.replace(tmp_path, self.path)
+                # Base now holds every entry; a crash before this only duplicates them.
+                # Removed rather than truncated: readers notice the new inode.
+                os.remove(self.journal_path)
+            with self._lock:
+                self._base_stamp = None # Reload from the new base on the next check
+                self._next_check = 0.0
+                self.stats["compactions"] += 1
+        finally:
+            with self._lock:
+                self._compacting = False
+
+class _FileLock:
+    """Exclusive advisory lock on a side file, shared with other processes."""
+
+    _local = threading.Lock() # Still serializes this process's threads without fcntl
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+
+    def __enter__(self):
+        self._local.acquire()
+        if fcntl is not None:
+            try:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            except OSError:
+                self._release_fd()
+        return self
+
+    def __exit__(self, *exc):
+        self._release_fd()
+        self._local.release()
+
+    def _release_fd(self):
+        if self._fd is not None:
+            os.close(self._fd) # Closing drops the flock
+            self._fd = None
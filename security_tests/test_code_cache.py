@@ -0,0 +1,80 @@
+# BlenderVibeBridge: Dual-License & Maintenance Agreement (v1.2)
+# Copyright (C) 2026 B-A-M-N (The "Author")
+#
+# This software is distributed under a Dual-Licensing Model:
+# 1. THE OPEN-SOURCE PATH: GNU AGPLv3 (see LICENSE for details)
+# 2. THE COMMERCIAL PATH: "WORK-OR-PAY" MODEL
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+
+
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'blender_addon', 'vibe_bridge')))
+from core.code_cache import CodeCache, content_hash, may_restructure
+
+class CodeCacheTests(unittest.TestCase):
+    def test_repeat_script_is_a_hit(self):
+        cache = CodeCache()
+        code = cache.get_or_compile("x = 1")
+        self.assertIs(cache.get_or_compile("x = 1\n"), code) # Keyed like SecurityGate: stripped source
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_key_matches_security_gate_hash(self):
+        sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'mcp-server')))
+        from security_gate import SecurityGate
+        source = "  bpy.ops.mesh.primitive_cube_add()\n"
+        self.assertEqual(content_hash(source), SecurityGate._get_content_hash(source))
+
+    def test_lru_eviction_by_count(self):
+        cache = CodeCache(max_entries=2)
+        cache.get_or_compile("a = 1")
+        cache.get_or_compile("b = 2")
+        cache.get_or_compile("a = 1") # Refreshes a
+        cache.get_or_compile("c = 3") # Evicts b
+        self.assertEqual(cache.evictions, 1)
+        cache.get_or_compile("a = 1")
+        self.assertEqual(cache.hits, 2)
+        cache.get_or_compile("b = 2")
+        self.assertEqual(cache.misses, 4)
+
+    def test_oversized_source_is_not_kept(self):
+        cache = CodeCache(max_source_bytes=16)
+        source = "value = " + "1" * 32
+        cache.get_or_compile(source)
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_compile_errors_propagate_uncached(self):
+        cache = CodeCache()
+        with self.assertRaises(SyntaxError):
+            cache.get_or_compile("def broken(:")
+        self.assertEqual(cache.stats()["entries"], 0)
+
+class MayRestructureTests(unittest.TestCase):
+    def check(self, source):
+        return may_restructure(compile(source, "<test>", "exec"))
+
+    def test_transform_only_scripts_are_not_structural(self):
+        self.assertFalse(self.check("bpy.data.objects['Cube'].location.x += 1"))
+        self.assertFalse(self.check("for o in bpy.data.objects:\n    o.hide_viewport = False"))
+
+    def test_renames_adds_removes_and_links_are_structural(self):
+        self.assertTrue(self.check("bpy.data.objects['Cube'].name = 'Box'"))
+        self.assertTrue(self.check("bpy.data.objects.new('E', None)"))
+        self.assertTrue(self.check("bpy.data.objects.remove(bpy.data.objects['Cube'])"))
+        self.assertTrue(self.check("bpy.context.scene.collection.objects.link(o)"))
+        self.assertTrue(self.check("bpy.ops.mesh.primitive_cube_add()"))
+
+    def test_nested_code_and_dotted_imports_are_checked(self):
+        self.assertTrue(self.check("def f(o):\n    o.name = 'x'\nf(o)"))
+        self.assertTrue(self.check("class C:\n    def m(self):\n        bpy.ops.object.delete()"))
+        self.assertTrue(self.check("import bpy.ops as o"))
+        self.assertTrue(self.check("setattr(o, 'na' + 'me', 'x')"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+# BlenderVibeBridge: Dual-License & Maintenance Agreement (v1.2)
+# Copyright (C) 2026 B-A-M-N (The "Author")
+#
+# This software is distributed under a Dual-Licensing Model:
+# 1. THE OPEN-SOURCE PATH: GNU AGPLv3 (see LICENSE for details)
+# 2. THE COMMERCIAL PATH: "WORK-OR-PAY" MODEL
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+
+
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'blender_addon', 'vibe_bridge')))
+from ipc.snapshot import SceneIndex
+from ipc.delta import DeltaRing, ADDED, REMOVED, MODIFIED
+
+class FakeObject(dict):
+    """Just enough of bpy.types.Object for SceneIndex; custom properties are the dict."""
+    _pointers = iter(range(0x1000, 1 << 48, 0x10))
+
+    def __init__(self, name, location=(0.0, 0.0, 0.0), **props):
+        super().__init__(props)
+        self.name = name
+        self.type = "EMPTY"
+        self.location = location
+        self.users_collection = ()
+        self._pointer = next(self._pointers)
+
+    def as_pointer(self):
+        return self._pointer
+
+class FakeObjects(list):
+    def get(self, name):
+        return next((obj for obj in self if obj.name == name), None)
+
+def net(index):
+    """This refresh's delta as {kind: sorted names}."""
+    result = {ADDED: [], REMOVED: [], MODIFIED: []}
+    for kind, info in index.take_delta().values():
+        result[kind].append(info["name"])
+    return {kind: sorted(names) for kind, names in result.items()}
+
+class SceneDeltaTests(unittest.TestCase):
+    def setUp(self):
+        # None of these carry a uuid property, like most objects in a real scene
+        self.objects = FakeObjects(FakeObject(name) for name in ("Cube", "Light", "Empty"))
+        self.index = SceneIndex()
+        self.index.rebuild(self.objects)
+        self.index.take_delta()
+
+    def test_initial_rebuild_adds_every_object(self):
+        index = SceneIndex()
+        index.rebuild(self.objects)
+        self.assertEqual(net(index)[ADDED], ["Cube", "Empty", "Light"])
+
+    def test_moving_objects_without_uuid_reports_each(self):
+        self.objects[0].location = (1.0, 0.0, 0.0)
+        self.objects[1].location = (0.0, 2.0, 0.0)
+        dirty = {obj.as_pointer(): obj.name for obj in self.objects[:2]}
+        self.index.refresh_dirty(self.objects, dirty)
+        self.assertEqual(net(self.index)[MODIFIED], ["Cube", "Light"])
+
+    def test_add_and_remove_do_not_cancel(self):
+        self.objects.pop(1)
+        self.objects.append(FakeObject("Sphere"))
+        self.index.sync_structure(self.objects)
+        delta = net(self.index)
+        self.assertEqual(delta[ADDED], ["Sphere"])
+        self.assertEqual(delta[REMOVED], ["Light"])
+        self.assertEqual(delta[MODIFIED], [])
+
+    def test_periodic_resync_of_unchanged_scene_is_empty(self):
+        self.index.resync(self.objects)
+        self.assertEqual(net(self.index), {ADDED: [], REMOVED: [], MODIFIED: []})
+
+    def test_periodic_resync_catches_missed_edits(self):
+        self.objects[2].location = (0.0, 0.0, 3.0)
+        self.objects.pop(0)
+        self.index.resync(self.objects)
+        self.assertEqual(net(self.index), {ADDED: [], REMOVED: ["Cube"], MODIFIED: ["Empty"]})
+
+    def test_reload_matches_objects_by_name(self):
+        # After load/undo every pointer is new
+        ids = {rec.name: rec.id for rec in self.index.records.values()}
+        self.objects = FakeObjects(FakeObject(obj.name, obj.location) for obj in self.objects)
+        self.index.rebuild(self.objects)
+        self.assertEqual(net(self.index), {ADDED: [], REMOVED: [], MODIFIED: []})
+        self.assertEqual({rec.name: rec.id for rec in self.index.records.values()}, ids)
+
+    def test_periodic_resync_keeps_revisions_and_tree(self):
+        self.index._rehash()
+        revisions = {rec.name: rec.revision for rec in self.index.records.values()}
+        commits = self.index.merkle.stats["commits"]
+        self.assertFalse(self.index.resync(self.objects))
+        self.assertEqual({rec.name: rec.revision for rec in self.index.records.values()}, revisions)
+        self.assertEqual(self.index.merkle.stats["commits"], commits)
+
+    def test_in_place_rebuild_hashes_like_a_fresh_index(self):
+        self.index._rehash()
+        self.objects = FakeObjects(FakeObject(obj.name, obj.location) for obj in self.objects)
+        self.objects[0].location = (5.0, 0.0, 0.0)
+        self.objects.pop(1)
+        self.objects.append(FakeObject("Sphere"))
+        self.index.rebuild(self.objects)
+        self.index._rehash()
+        fresh = SceneIndex()
+        fresh.rebuild(self.objects)
+        fresh._rehash()
+        self.assertEqual(self.index.hash, fresh.hash)
+        self.assertEqual(self.index.columns.names, fresh.columns.names)
+
+    def test_duplicated_uuid_is_a_separate_object(self):
+        self.objects[0]["uuid"] = "abc"
+        self.index.refresh_dirty(self.objects, {self.objects[0].as_pointer(): "Cube"})
+        self.index.take_delta()
+        self.objects.append(FakeObject("Cube.001", uuid="abc"))
+        self.index.sync_structure(self.objects)
+        self.assertEqual(net(self.index), {ADDED: ["Cube.001"], REMOVED: [], MODIFIED: []})
+
+class DeltaRingTests(unittest.TestCase):
+    def test_since_merges_ticks_by_id(self):
+        ring = DeltaRing(size=8)
+        ring.reset(0)
+        cube = {"id": 1, "name": "Cube", "type": "MESH", "uuid": "NO_UUID"}
+        light = {"id": 2, "name": "Light", "type": "LIGHT", "uuid": "NO_UUID"}
+        ring.record(1, {1: (ADDED, cube), 2: (MODIFIED, light)})
+        ring.record(2, {1: (MODIFIED, cube), 2: (REMOVED, light)})
+        delta = ring.since(0, 2)
+        self.assertEqual(delta[ADDED], [cube])
+        self.assertEqual(delta[REMOVED], [{"id": 2, "name": "Light", "uuid": "NO_UUID"}])
+        self.assertEqual(delta[MODIFIED], [])
+        # Added then removed within the window: nothing to report
+        ring.record(3, {1: (REMOVED, cube)})
+        self.assertEqual(ring.since(0, 3)[ADDED], [])
+
+    def test_since_before_floor_requires_resync(self):
+        ring = DeltaRing(size=2)
+        ring.reset(0)
+        for tick in (1, 2, 3):
+            ring.record(tick, {tick: (ADDED, {"id": tick, "name": str(tick), "type": "EMPTY", "uuid": "NO_UUID"})})
+        self.assertIsNone(ring.since(0, 3))
+        self.assertEqual(len(ring.since(1, 3)[ADDED]), 2)
+
+if __name__ == "__main__":
+    unittest.main()
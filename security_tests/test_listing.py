@@ -0,0 +1,96 @@
+# BlenderVibeBridge: Dual-License & Maintenance Agreement (v1.2)
+# Copyright (C) 2026 B-A-M-N (The "Author")
+#
+# This software is distributed under a Dual-Licensing Model:
+# 1. THE OPEN-SOURCE PATH: GNU AGPLv3 (see LICENSE for details)
+# 2. THE COMMERCIAL PATH: "WORK-OR-PAY" MODEL
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+
+
+import sys
+import os
+import unittest
+from array import array
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'blender_addon', 'vibe_bridge')))
+from ipc.listing import ObjectColumns, ObjectListing, ListingHistory, type_code, encode_cursor, decode_cursor
+
+def make_listing(objects, tick=1):
+    """objects: (name, type, uuid) tuples, name-sorted like SceneIndex keeps them."""
+    objects = sorted(objects)
+    columns = ObjectColumns(
+        [name for name, _, _ in objects],
+        array("B", [type_code(obj_type) for _, obj_type, _ in objects]),
+        [uuid for _, _, uuid in objects]
+    )
+    return ObjectListing(columns, tick)
+
+class ObjectListingTests(unittest.TestCase):
+    def setUp(self):
+        self.objects = [(f"Cube.{i:03d}", "MESH", f"u{i}") for i in range(25)]
+        self.objects += [(f"Lamp.{i:03d}", "LIGHT", f"l{i}") for i in range(5)]
+        self.objects.append(("Camera", "CAMERA", "NO_UUID"))
+        self.listing = make_listing(self.objects)
+
+    def walk(self, **filters):
+        """Every page of a cursor walk, concatenated."""
+        names, after = [], None
+        while True:
+            objects, total, last = self.listing.page(after=after, limit=7, **filters)
+            names.extend(obj["name"] for obj in objects)
+            if last is None:
+                return names, total
+            after = last
+
+    def test_cursor_walk_covers_every_object_once(self):
+        names, total = self.walk()
+        self.assertEqual(names, sorted(name for name, _, _ in self.objects))
+        self.assertEqual(total, len(self.objects))
+
+    def test_type_filter(self):
+        names, total = self.walk(obj_type="LIGHT")
+        self.assertEqual(names, [f"Lamp.{i:03d}" for i in range(5)])
+        self.assertEqual(total, 5)
+        self.assertEqual(self.listing.page(obj_type="ARMATURE"), ([], 0, None))
+
+    def test_prefix_filter_with_type(self):
+        names, total = self.walk(prefix="Cube.01", obj_type="MESH")
+        self.assertEqual(names, [f"Cube.{i:03d}" for i in range(10, 20)])
+        self.assertEqual(total, 10)
+
+    def test_limit_is_clamped(self):
+        objects, _, last = self.listing.page(limit=0)
+        self.assertEqual(len(objects), 1)
+        self.assertEqual(last, "Camera")
+
+    def test_lookup_uuid_returns_every_duplicate(self):
+        listing = make_listing([("A", "MESH", "dup"), ("B", "MESH", "x"), ("C", "EMPTY", "dup")])
+        self.assertEqual([obj["name"] for obj in listing.lookup_uuid("dup")], ["A", "C"])
+        self.assertEqual(listing.lookup_uuid("missing"), [])
+
+    def test_head_and_entry_shape(self):
+        self.assertEqual(self.listing.head(1), [{"name": "Camera", "type": "CAMERA", "uuid": "NO_UUID"}])
+        self.assertEqual(len(self.listing.head(1000)), len(self.objects))
+
+class CursorTests(unittest.TestCase):
+    def test_cursor_round_trip_keeps_colons_in_names(self):
+        listing = make_listing([("a:b", "EMPTY", "u")], tick=42)
+        self.assertEqual(decode_cursor(encode_cursor(listing, "a:b")), (42, "a:b"))
+
+    def test_malformed_cursor_raises(self):
+        with self.assertRaises(ValueError):
+            decode_cursor("not-a-tick:name")
+
+    def test_history_keeps_recent_listings(self):
+        history = ListingHistory(size=2)
+        for tick in (1, 2, 3):
+            history.add(make_listing([], tick))
+        self.assertIsNone(history.get(1))
+        self.assertEqual(history.get(3).tick, 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+# BlenderVibeBridge: Dual-License & Maintenance Agreement (v1.2)
+# Copyright (C) 2026 B-A-M-N (The "Author")
+#
+# This software is distributed under a Dual-Licensing Model:
+# 1. THE OPEN-SOURCE PATH: GNU AGPLv3 (see LICENSE for details)
+# 2. THE COMMERCIAL PATH: "WORK-OR-PAY" MODEL
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+
+
+import sys
+import os
+import unittest
+
+# Addon modules without bpy imports are loaded from the package directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'blender_addon', 'vibe_bridge')))
+from ipc.merkle import MerkleScene, UNLINKED, leaf_hash
+
+def build(objects):
+    """Full rebuild: {name: (collections, line)} -> committed tree."""
+    tree = MerkleScene()
+    for name, (collections, line) in objects.items():
+        tree.put(name, collections, leaf_hash(line))
+    tree.commit()
+    return tree
+
+class MerkleSceneTests(unittest.TestCase):
+    def setUp(self):
+        self.objects = {
+            "Cube": (("Scene",), b"Cube:1"),
+            "Light": (("Scene",), b"Light:2"),
+            "Empty": ((), b"Empty:3"),
+        }
+        self.tree = build(self.objects)
+
+    def assertMatchesRebuild(self, objects):
+        self.assertEqual(self.tree.root, build(objects).root)
+
+    def test_root_is_order_independent(self):
+        reordered = dict(reversed(list(self.objects.items())))
+        self.assertEqual(self.tree.root, build(reordered).root)
+
+    def test_commit_without_edits_keeps_root(self):
+        root = self.tree.root
+        self.assertEqual(self.tree.commit(), root)
+
+    def test_name_swap_matches_rebuild(self):
+        # Cube -> Light and Light -> Cube in the same tick, staged object by object
+        self.tree.remove("Cube", ("Scene",))
+        self.tree.put("Light", ("Scene",), leaf_hash(b"Light:1"))
+        self.tree.remove("Light", ("Scene",))
+        self.tree.put("Cube", ("Scene",), leaf_hash(b"Cube:2"))
+        self.tree.commit()
+        self.assertMatchesRebuild({
+            "Light": (("Scene",), b"Light:1"),
+            "Cube": (("Scene",), b"Cube:2"),
+            "Empty": ((), b"Empty:3"),
+        })
+
+    def test_rename_onto_freed_name_matches_rebuild(self):
+        # Cube -> Cube.old, then Light -> Cube, in either staging order
+        for first_light in (False, True):
+            self.tree = build(self.objects)
+            edits = [
+                lambda: (self.tree.remove("Cube", ("Scene",)), self.tree.put("Cube.old", ("Scene",), leaf_hash(b"Cube.old:1"))),
+                lambda: (self.tree.remove("Light", ("Scene",)), self.tree.put("Cube", ("Scene",), leaf_hash(b"Cube:2"))),
+            ]
+            for edit in (reversed(edits) if first_light else edits):
+                edit()
+            self.tree.commit()
+            self.assertMatchesRebuild({
+                "Cube.old": (("Scene",), b"Cube.old:1"),
+                "Cube": (("Scene",), b"Cube:2"),
+                "Empty": ((), b"Empty:3"),
+            })
+
+    def test_relink_matches_rebuild(self):
+        self.tree.remove("Empty", ())
+        self.tree.put("Empty", ("Props",), leaf_hash(b"Empty:3"))
+        self.tree.commit()
+        self.assertNotIn(UNLINKED, self.tree.subtree_hashes())
+        self.assertMatchesRebuild({
+            "Cube": (("Scene",), b"Cube:1"),
+            "Light": (("Scene",), b"Light:2"),
+            "Empty": (("Props",), b"Empty:3"),
+        })
+
+    def test_diff_reports_changes_between_roots(self):
+        old_root = self.tree.root
+        self.tree.put("Cube", ("Scene",), leaf_hash(b"Cube:moved"))
+        self.tree.remove("Light", ("Scene",))
+        self.tree.put("Sphere", ("Scene",), leaf_hash(b"Sphere:4"))
+        self.tree.commit()
+        diff = self.tree.diff(old_root)
+        self.assertEqual(list(diff["collections"]), ["Scene"])
+        scene = diff["collections"]["Scene"]
+        self.assertEqual(scene["added"], ["Sphere"])
+        self.assertEqual(scene["removed"], ["Light"])
+        self.assertEqual(scene["changed"], ["Cube"])
+
+    def test_diff_of_unknown_root_is_none(self):
+        self.assertIsNone(self.tree.diff("unknown"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+# BlenderVibeBridge: Dual-License & Maintenance Agreement (v1.2)
+# Copyright (C) 2026 B-A-M-N (The "Author")
+#
+# This software is distributed under a Dual-Licensing Model:
+# 1. THE OPEN-SOURCE PATH: GNU AGPLv3 (see LICENSE for details)
+# 2. THE COMMERCIAL PATH: "WORK-OR-PAY" MODEL
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+
+
+import sys
+import os
+import json
+import time
+import shutil
+import asyncio
+import tempfile
+import threading
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'mcp-server')))
+from airlock import SequencedInbox
+from outbox_waiter import OutboxWaiter
+from mutation_client import AsyncMutationClient
+
+class AirlockDeadlineTests(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+        self.inbox_path = os.path.join(self.base, "inbox")
+        self.outbox_path = os.path.join(self.base, "outbox")
+        os.makedirs(self.outbox_path)
+        # No socket listening: every command takes the file airlock
+        self.client = AsyncMutationClient(
+            os.path.join(self.base, "absent.sock"), SequencedInbox(self.inbox_path),
+            self.outbox_path, OutboxWaiter(self.outbox_path), max_in_flight=1
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.base, ignore_errors=True)
+
+    def published(self, seq):
+        with open(os.path.join(self.inbox_path, SequencedInbox.file_name(seq))) as f:
+            return json.load(f)
+
+    def test_deadline_starts_when_the_command_gets_a_slot(self):
+        async def scenario():
+            first = await self.client.submit({"id": "first", "type": "exec_script"}, timeout=5.0)
+            queued = asyncio.ensure_future(self.client.submit({"id": "second", "type": "exec_script"}, timeout=5.0))
+            await asyncio.sleep(0.3)
+            self.assertFalse(queued.done()) # Waiting for the only in-flight slot
+            released = time.time()
+            first.set_result({"status": "SUCCESS"})
+            second = await queued
+            second.cancel()
+            return released
+        released = asyncio.run(scenario())
+        self.assertGreaterEqual(self.published(2)["deadline"], released + 5.0)
+        self.assertLess(self.published(1)["deadline"], released + 5.0)
+
+    def test_submit_without_timeout_sets_no_deadline(self):
+        async def scenario():
+            future = await self.client.submit({"id": "plain", "type": "exec_script"})
+            future.cancel()
+        asyncio.run(scenario())
+        self.assertNotIn("deadline", self.published(1))
+
+    def test_enqueue_runs_off_the_event_loop(self):
+        threads = []
+        enqueue = self.client.inbox.enqueue
+        def recording(payload):
+            threads.append(threading.get_ident())
+            return enqueue(payload)
+        self.client.inbox.enqueue = recording
+        async def scenario():
+            future = await self.client.submit({"id": "off-loop", "type": "exec_script"})
+            future.cancel()
+            return threading.get_ident()
+        loop_thread = asyncio.run(scenario())
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], loop_thread)
+        self.assertEqual(self.published(1)["id"], "off-loop")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+# BlenderVibeBridge: Dual-License & Maintenance Agreement (v1.2)
+# Copyright (C) 2026 B-A-M-N (The "Author")
+#
+# This software is distributed under a Dual-Licensing Model:
+# 1. THE OPEN-SOURCE PATH: GNU AGPLv3 (see LICENSE for details)
+# 2. THE COMMERCIAL PATH: "WORK-OR-PAY" MODEL
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'mcp-server')))
+from airlock import SequencedInbox
+
+class SequencedInboxTests(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+        self.inbox_path = os.path.join(self.base, "inbox")
+
+    def tearDown(self):
+        shutil.rmtree(self.base, ignore_errors=True)
+
+    def published(self):
+        return sorted(os.listdir(self.inbox_path))
+
+    def test_sequence_numbers_start_at_one_and_are_contiguous(self):
+        inbox = SequencedInbox(self.inbox_path)
+        seqs = [inbox.enqueue({"id": f"cmd{i}"}) for i in range(3)]
+        self.assertEqual(seqs, [1, 2, 3])
+        self.assertEqual(self.published(), [SequencedInbox.file_name(s) for s in seqs])
+        with open(os.path.join(self.inbox_path, SequencedInbox.file_name(2))) as f:
+            self.assertEqual(json.load(f), {"id": "cmd1", "seq": 2})
+
+    def test_restart_continues_without_gap(self):
+        first = SequencedInbox(self.inbox_path)
+        for i in range(5):
+            first.enqueue({"id": f"a{i}"})
+        # A new MCP process on the same queue picks up at the next number
+        second = SequencedInbox(self.inbox_path)
+        self.assertEqual(second.enqueue({"id": "b0"}), 6)
+
+    def test_legacy_lease_state_is_honoured(self):
+        with open(os.path.join(self.base, "inbox.seq"), "w") as f:
+            json.dump({"high_water": 1024}, f)
+        inbox = SequencedInbox(self.inbox_path)
+        self.assertEqual(inbox.enqueue({"id": "x"}), 1025)
+
+    def test_concurrent_enqueues_get_unique_numbers(self):
+        inbox = SequencedInbox(self.inbox_path)
+        seqs = []
+        lock = threading.Lock()
+        def worker(n):
+            for i in range(25):
+                seq = inbox.enqueue({"id": f"{n}-{i}"})
+                with lock:
+                    seqs.append(seq)
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(sorted(seqs), list(range(1, 101)))
+
+    def test_cancel_removes_unclaimed_command_once(self):
+        inbox = SequencedInbox(self.inbox_path)
+        inbox.enqueue({"id": "keep"})
+        inbox.enqueue({"id": "drop"})
+        self.assertTrue(inbox.cancel("drop"))
+        self.assertFalse(inbox.cancel("drop"))
+        self.assertFalse(inbox.cancel("unknown"))
+        self.assertEqual(self.published(), [SequencedInbox.file_name(1)])
+
+    def test_cancel_after_claim_fails(self):
+        inbox = SequencedInbox(self.inbox_path)
+        inbox.enqueue({"id": "claimed"})
+        # The addon claims by renaming the file away
+        name = SequencedInbox.file_name(1)
+        os.replace(os.path.join(self.inbox_path, name), os.path.join(self.base, name + ".claimed"))
+        self.assertFalse(inbox.cancel("claimed"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+# BlenderVibeBridge: Dual-License & Maintenance Agreement (v1.2)
+# Copyright (C) 2026 B-A-M-N (The "Author")
+#
+# This software is distributed under a Dual-Licensing Model:
+# 1. THE OPEN-SOURCE PATH: GNU AGPLv3 (see LICENSE for details)
+# 2. THE COMMERCIAL PATH: "WORK-OR-PAY" MODEL
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+
+
+import sys
+import os
+import json
+import time
+import shutil
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'mcp-server')))
+from trust_store import TrustedSignatureStore
+from security_gate import SecurityGate
+
+class TrustStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+        self.path = os.path.join(self.base, "trusted_signatures.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.base, ignore_errors=True)
+
+    def store(self, **kwargs):
+        # No recheck delay: every lookup sees the files as they are now
+        return TrustedSignatureStore(self.path, recheck_interval=0.0, **kwargs)
+
+    def wait_for_compaction(self, store, count=1):
+        deadline = time.monotonic() + 5.0
+        while store.stats["compactions"] < count or store._compacting:
+            self.assertLess(time.monotonic(), deadline, "compaction did not finish")
+            time.sleep(0.01)
+
+    def write_base(self, trusted):
+        with open(self.path, "w") as f:
+            json.dump(trusted, f)
+
+    def test_miss_then_hit(self):
+        store = self.store()
+        self.assertFalse(store.contains("a" * 64))
+        store.add("a" * 64, "test")
+        self.assertTrue(store.contains("a" * 64))
+        self.assertFalse(store.contains("b" * 64))
+
+    def test_legacy_base_file_is_loaded(self):
+        self.write_base({"h1": {"timestamp": "2026-01-01T00:00:00", "reason": "legacy"}})
+        self.assertTrue(self.store().contains("h1"))
+
+    def test_journal_is_replayed_by_a_new_process(self):
+        self.store().add("h1", "first")
+        self.store().add("h2", "second")
+        store = self.store()
+        self.assertTrue(store.contains("h1"))
+        self.assertTrue(store.contains("h2"))
+
+    def test_append_by_another_process_is_picked_up(self):
+        self.store().add("h0", "earlier")
+        reader = self.store()
+        self.assertFalse(reader.contains("h1"))
+        reloads = reader.stats["reloads"]
+        self.store().add("h1", "cli approval") # e.g. the security_gate CLI
+        self.assertTrue(reader.contains("h1"))
+        self.assertTrue(reader.contains("h0"))
+        self.assertEqual(reader.stats["reloads"], reloads) # Only the new tail was read
+
+    def test_half_written_journal_line_waits(self):
+        reader = self.store()
+        reader.contains("h1")
+        with open(self.path + ".journal", "ab") as f:
+            f.write(b'{"hash": "h1", "timestamp": "t", "rea')
+        self.assertFalse(reader.contains("h1"))
+        with open(self.path + ".journal", "ab") as f:
+            f.write(b'son": "r"}\n')
+        self.assertTrue(reader.contains("h1"))
+
+    def test_corrupt_journal_lines_are_skipped(self):
+        with open(self.path + ".journal", "w") as f:
+            f.write('not json\n{"no_hash": 1}\n{"hash": "h1", "timestamp": "t", "reason": "r"}\n')
+        store = self.store()
+        self.assertTrue(store.contains("h1"))
+        self.assertFalse(store.contains("not json"))
+
+    def test_compaction_folds_journal_into_base(self):
+        writer = self.store(compact_bytes=256)
+        reader = self.store()
+        hashes = [f"{i:064x}" for i in range(8)]
+        for h in hashes:
+            writer.add(h, "bulk")
+        self.wait_for_compaction(writer)
+        with open(self.path) as f:
+            base = json.load(f)
+        self.assertTrue(set(hashes) <= set(base))
+        self.assertEqual(base[hashes[0]]["reason"], "bulk")
+        # Both the writer and an independent reader still trust everything
+        self.assertTrue(all(writer.contains(h) for h in hashes))
+        self.assertTrue(all(reader.contains(h) for h in hashes))
+
+    def test_compaction_without_journal_keeps_base(self):
+        self.write_base({"h1": {"timestamp": "t", "reason": "r"}})
+        store = self.store()
+        store.compact()
+        self.assertTrue(store.contains("h1"))
+
+    def test_hand_removed_entry_is_revoked(self):
+        writer = self.store()
+        writer.add("keep", "ok")
+        writer.add("revoke", "mistake")
+        writer.compact()
+        reader = self.store()
+        self.assertTrue(reader.contains("revoke"))
+        # An operator edits the base file by hand to withdraw an approval
+        with open(self.path) as f:
+            trusted = json.load(f)
+        del trusted["revoke"]
+        self.write_base(trusted)
+        for store in (reader, writer):
+            self.assertFalse(store.contains("revoke"))
+            self.assertTrue(store.contains("keep"))
+
+    def test_recheck_interval_defers_file_checks(self):
+        reader = TrustedSignatureStore(self.path, recheck_interval=3600.0)
+        self.assertFalse(reader.contains("h1"))
+        self.store().add("h1", "later")
+        self.assertFalse(reader.contains("h1")) # Not re-read until the interval passes
+        reader._next_check = 0.0
+        self.assertTrue(reader.contains("h1"))
+
+class SecurityGateTrustTests(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+        self.saved = (SecurityGate.TRUSTED_FILE, SecurityGate._trust_store)
+        SecurityGate.TRUSTED_FILE = os.path.join(self.base, "trusted_signatures.json")
+
+    def tearDown(self):
+        SecurityGate.TRUSTED_FILE, SecurityGate._trust_store = self.saved
+        shutil.rmtree(self.base, ignore_errors=True)
+
+    def test_trust_content_is_keyed_by_stripped_source(self):
+        script = "bpy.ops.mesh.primitive_cube_add()"
+        self.assertFalse(SecurityGate.is_trusted(script))
+        SecurityGate.trust_content(script, reason="test")
+        self.assertTrue(SecurityGate.is_trusted("  " + script + "\n"))
+        self.assertFalse(SecurityGate.is_trusted(script + "  # changed"))
+
+    def test_repointing_trusted_file_switches_store(self):
+        SecurityGate.trust_content("x = 1")
+        SecurityGate.TRUSTED_FILE = os.path.join(self.base, "other.json")
+        self.assertFalse(SecurityGate.is_trusted("x = 1"))
+
+if __name__ == "__main__":
+    unittest.main()